@@ -19,6 +19,10 @@ class Config:
     MIN_SYNC_INTERVAL_SECONDS: int = int(os.getenv("MIN_SYNC_INTERVAL_SECONDS", 300))
     FORCE_S3_SYNC: int = int(os.getenv("FORCE_S3_SYNC", 0))
 
+    # Concurrent object downloads per S3 sync
+    SYNC_WORKERS: int = int(os.getenv("SYNC_WORKERS", 16))
+
     # AWS
     S3_BUCKET: str = os.getenv("S3_BUCKET", "gk-performance-tracker-data")
     S3_PREFIX: str = os.getenv("S3_PREFIX", "latest")
+    S3_ENDPOINT_URL: str | None = os.getenv("S3_ENDPOINT_URL")  # S3-compatible stand-in, e.g. MinIO
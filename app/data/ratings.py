@@ -0,0 +1,153 @@
+import numpy as np
+import pandas as pd
+
+# In-app counterpart of mart_goalkeeper_league_ratings.sql: the same
+# z-scores, percent ranks, overall score and rank, computed with NumPy
+# from fct_goalkeeper_performance so weights and the cohort threshold can
+# be changed without a dbt rebuild. Keep the two in sync
+# (tests/test_ratings.py runs the mart's SQL on edge cases, and
+# scripts/check_rating_parity.py compares them on every build).
+
+METRICS = [
+    "save_pct",
+    "psxg_minus_ga",
+    "crosses_stopped_pct",
+    "pass_att_p90",
+    "long_kick_pass_completion_pct",
+    "def_actions_outside_pen_area_p90",
+]
+
+# Defaults match the mart
+DEFAULT_WEIGHTS = {
+    "save_pct": 0.20,
+    "psxg_minus_ga": 0.25,
+    "crosses_stopped_pct": 0.20,
+    "pass_att_p90": 0.10,
+    "long_kick_pass_completion_pct": 0.10,
+    "def_actions_outside_pen_area_p90": 0.15,
+}
+DEFAULT_MIN_MATCHES = 5
+
+REFERENCE_COLS = ["goalkeeper", "season", "competition", "team"]
+COHORT_COLS = ["season", "competition"]
+
+
+def percent_rank(x: np.ndarray) -> np.ndarray:
+    """
+    SQL percent_rank() over each column of `x`, ascending with nulls last:
+    (rank - 1) / (rows - 1), ties sharing their lowest rank.
+    """
+    n = x.shape[0]
+    if n <= 1:
+        return np.zeros_like(x)
+
+    out = np.empty_like(x)
+    for j in range(x.shape[1]):
+        col = x[:, j]
+        valid = ~np.isnan(col)
+        ordered = np.sort(col[valid])
+        # Rows ranked before a value: the smaller values (nulls: all values)
+        before = np.where(valid, np.searchsorted(ordered, col, side="left"), ordered.size)
+        out[:, j] = before / (n - 1)
+    return out
+
+
+def rank_desc(x: np.ndarray) -> np.ndarray:
+    """SQL rank() ordered by `x` descending with nulls last."""
+    valid = ~np.isnan(x)
+    ordered = np.sort(-x[valid])
+    before = np.where(valid, np.searchsorted(ordered, -x, side="left"), ordered.size)
+    return before + 1
+
+
+def rate_cohort(values: np.ndarray, weights: np.ndarray) -> tuple:
+    """
+    Rate one cohort (one season and competition) of keepers.
+
+    `values` is (keepers x METRICS) with NaN for nulls. Returns (z-scores,
+    percent ranks, overall score, overall rank), mirroring the mart's SQL
+    null handling: aggregates skip nulls, a zero spread gives null
+    z-scores and a null z-score gives a null overall score.
+    """
+    valid = ~np.isnan(values)
+    count = valid.sum(axis=0)
+    filled = np.where(valid, values, 0.0)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = filled.sum(axis=0) / count
+        std = np.sqrt((np.where(valid, values - mean, 0.0) ** 2).sum(axis=0) / count)
+        z = (values - mean) / np.where(std == 0, np.nan, std)
+
+    pct = percent_rank(values) * 100
+    score = z @ weights
+    return z, pct, score, rank_desc(score)
+
+
+def rate_goalkeepers(fct: pd.DataFrame,
+                     weights: dict | None = None,
+                     min_matches: int = DEFAULT_MIN_MATCHES) -> pd.DataFrame:
+    """
+    Rate keepers from fct_goalkeeper_performance rows, in the columns of
+    mart_goalkeeper_league_ratings.
+
+    Only keepers with at least `min_matches` matches are rated. Cohorts
+    are (season, competition) when those columns are present, otherwise
+    all rows form one cohort (e.g. a single partition read by a page).
+    """
+    weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+    w = np.array([weights[m] for m in METRICS], dtype=float)
+
+    keepers = fct.loc[fct["matches_played"] >= min_matches].reset_index(drop=True)
+    reference = keepers[[c for c in REFERENCE_COLS if c in keepers.columns]]
+    values = keepers[METRICS].to_numpy(dtype=float, na_value=np.nan)
+
+    cohort_cols = [c for c in COHORT_COLS if c in keepers.columns]
+    if cohort_cols:
+        cohorts = keepers.groupby(cohort_cols, sort=False).indices.values()
+    else:
+        cohorts = [np.arange(len(keepers))]
+
+    z = np.full_like(values, np.nan)
+    pct = np.full_like(values, np.nan)
+    score = np.full(len(keepers), np.nan)
+    rank = np.zeros(len(keepers), dtype=np.int64)
+    for idx in cohorts:
+        z[idx], pct[idx], score[idx], rank[idx] = rate_cohort(values[idx], w)
+
+    return pd.concat(
+        [
+            reference,
+            pd.DataFrame(values, columns=METRICS),
+            pd.DataFrame(z, columns=[f"z_{m}" for m in METRICS]),
+            pd.DataFrame(pct, columns=[f"pct_{m}" for m in METRICS]),
+            pd.DataFrame({"overall_score": score, "overall_rank": rank}),
+        ],
+        axis=1,
+    )
+
+
+def compare_ratings(expected: pd.DataFrame, actual: pd.DataFrame,
+                    rtol: float = 1e-9, atol: float = 1e-9) -> list[str]:
+    """
+    Compare two ratings tables keyed by goalkeeper, season and competition.
+    Returns human-readable mismatches; empty when they agree.
+    """
+    keys = [c for c in REFERENCE_COLS[:3] if c in expected.columns and c in actual.columns]
+    merged = expected.merge(actual, on=keys, how="outer", suffixes=("_expected", "_actual"), indicator=True)
+
+    problems = [
+        f"{dict(zip(keys, row))} only in {'expected' if side == 'left_only' else 'actual'}"
+        for *row, side in merged.loc[merged["_merge"] != "both", keys + ["_merge"]].itertuples(index=False)
+    ]
+
+    both = merged.loc[merged["_merge"] == "both"]
+    numeric = [c for c in expected.columns if c not in REFERENCE_COLS and c in actual.columns]
+    for col in numeric:
+        a = both[f"{col}_expected"].to_numpy(dtype=float, na_value=np.nan)
+        b = both[f"{col}_actual"].to_numpy(dtype=float, na_value=np.nan)
+        bad = ~np.isclose(a, b, rtol=rtol, atol=atol, equal_nan=True)
+        for i in np.flatnonzero(bad)[:5]:
+            row = both.iloc[i]
+            problems.append(f"{col} for {dict((k, row[k]) for k in keys)}: {a[i]} != {b[i]}")
+
+    return problems
@@ -1,22 +1,196 @@
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from functools import lru_cache
 from pathlib import Path
+from urllib.parse import unquote
 
 DATA_DIR = Path(__file__).resolve().parent / "raw"
 
 from .transforms import get_clean_label_mapping
 
+# Directory name of a NULL hive partition value
+HIVE_NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+
+
+def get_table_path(pq_table: str) -> Path:
+    """Return a table's hive-partitioned directory, or its single Parquet file."""
+    table_dir = DATA_DIR / pq_table
+    return table_dir if table_dir.is_dir() else DATA_DIR / f"{pq_table}.parquet"
+
+
+@lru_cache(maxsize=16)
+def open_arrow_table(path: str, mtime_ns: int) -> pa.Table:
+    """
+    Memory-map an uncompressed Arrow IPC file: the table's buffers point
+    into the mapped file, so nothing is decoded or copied up front.
+    Cached per file version (`mtime_ns`).
+    """
+    return pa.ipc.open_file(pa.memory_map(path)).read_all()
+
+
+def filter_columns(filters: list) -> set[str]:
+    """Columns referenced by pyarrow filters, flat or lists of AND-groups."""
+    groups = filters if filters and isinstance(filters[0], list) else [filters]
+    return {col for group in groups for col, _, _ in group}
+
+
+def read_partition_sidecars(sidecar_dir: Path, filters: list | None) -> pa.Table | None:
+    """
+    Read the per-partition Arrow sidecars under `sidecar_dir` whose
+    partition values pass `filters`, adding the partition columns back.
+    Only the matching partitions' files are mapped. Returns None when
+    Parquet should serve the read instead: filters on other columns, or
+    no matching partition.
+    """
+    files = sorted(sidecar_dir.rglob("*.arrow"))
+    partitions = [
+        {
+            col: None if value == HIVE_NULL_PARTITION else value
+            for col, value in (unquote(part).split("=", 1) for part in f.parent.relative_to(sidecar_dir).parts)
+        }
+        for f in files
+    ]
+    if not files or (filters and not filter_columns(filters) <= set(partitions[0])):
+        return None
+
+    if filters:
+        # Evaluate the filters on the partition values alone
+        schema = pa.schema([(col, pa.string()) for col in partitions[0]])
+        keys = pa.Table.from_pylist(partitions, schema).append_column("file", pa.array(range(len(files))))
+        selected = keys.filter(pq.filters_to_expression(filters))["file"].to_pylist()
+    else:
+        selected = range(len(files))
+
+    tables = []
+    for i in selected:
+        table = open_arrow_table(str(files[i]), files[i].stat().st_mtime_ns)
+        for col, value in partitions[i].items():
+            table = table.append_column(col, pa.array([value] * table.num_rows, pa.string()))
+        tables.append(table)
+
+    return pa.concat_tables(tables) if tables else None
+
+
+def read_table(pq_table: str, columns: list[str] | None = None, filters: list | None = None) -> pd.DataFrame:
+    """
+    Read a published table. `filters` are pyarrow filters, e.g.
+    [("season", "==", "2025_2026")].
+
+    Memory-mapped Arrow sidecars are used where they don't read more than
+    Parquet would: per-partition sidecars (`<table>.arrow/`) when filters
+    are on partition columns only, and a single sidecar (`<table>.arrow`)
+    for unfiltered reads. Other reads go to Parquet, whose partition
+    pruning and row-group statistics skip data the filters exclude.
+    """
+    arrow_path = DATA_DIR / f"{pq_table}.arrow"
+
+    table = None
+    if arrow_path.is_dir():
+        table = read_partition_sidecars(arrow_path, filters)
+    elif arrow_path.is_file() and not filters:
+        table = open_arrow_table(str(arrow_path), arrow_path.stat().st_mtime_ns)
+
+    if table is None:
+        return pd.read_parquet(get_table_path(pq_table), columns=columns, filters=filters)
+
+    if columns:
+        table = table.select(columns)
+    return table.to_pandas()
+
+
+def get_partitions(pq_table: str) -> list[dict]:
+    """
+    List a partitioned table's partitions, e.g. [{"season": "2025_2026",
+    "competition": "Premier League"}, ...], from directory names only.
+    """
+    table_dir = DATA_DIR / pq_table
+    if not table_dir.is_dir():
+        return []
+
+    partitions = []
+    for pq_file in table_dir.rglob("*.parquet"):
+        keys = dict(
+            unquote(part).split("=", 1)
+            for part in pq_file.parent.relative_to(table_dir).parts
+            if "=" in part
+        )
+        if keys and keys not in partitions:
+            partitions.append(keys)
+
+    return partitions
+
+
+def get_latest_season(pq_table: str, competition: str) -> str | None:
+    """Return the latest season partition holding `competition`."""
+    seasons = [
+        p["season"] for p in get_partitions(pq_table)
+        if p.get("competition") == competition and "season" in p
+    ]
+    return max(seasons) if seasons else None
+
+
+def apply_clean_labels(df: pd.DataFrame, pq_table: str) -> pd.DataFrame:
+    """
+    Rename headers to "nice" user-friendly labels; columns without a label
+    (e.g. build bookkeeping) are not for display.
+    """
+    label_mapping = get_clean_label_mapping(pq_table)
+    df = df.drop(columns=[c for c, label in label_mapping.items() if not label and c in df.columns])
+    return df.rename(columns=label_mapping)
+
 
 def get_parquet_table(pq_table: str, params: list, clean_labels: bool) -> pd.DataFrame:
-    """Get DataFrame for given Parquet table."""
+    """
+    Get DataFrame for given published table.
 
-    pq_path = DATA_DIR / f"{pq_table}.parquet"
+    `params` are pyarrow filters; on a hive-partitioned Parquet table,
+    filters on partition columns (season, competition) prune whole
+    directories, so only the partitions a page needs are read.
+    """
 
     # Read table & apply any filtering
-    df = pd.read_parquet(pq_path, filters=params)
+    df = read_table(pq_table, filters=params)
+
+    # Partition columns come back as categoricals; use plain strings
+    for col in df.select_dtypes("category").columns:
+        df[col] = df[col].astype(str)
+
+    if clean_labels:
+        df = apply_clean_labels(df, pq_table)
+
+    return df
+
+
+def get_latest_competition_table(pq_table: str, competition: str, clean_labels: bool) -> pd.DataFrame:
+    """
+    Get the latest season of one competition from a partitioned table,
+    reading only that partition and without the partition columns.
+    """
+    season = get_latest_season(pq_table, competition)
+    params = [("competition", "==", competition)]
+    if season is not None:
+        params.append(("season", "==", season))
+
+    df = get_parquet_table(pq_table, params, clean_labels=False)
+    df = df.drop(columns=["season", "competition"], errors="ignore")
+
+    if clean_labels:
+        df = apply_clean_labels(df, pq_table)
+
+    return df
 
-    # Rename headers to "nice" user-friendly labels
-    if clean_labels:        
-        label_mapping = get_clean_label_mapping(pq_table)
-        df.rename(columns=label_mapping, inplace=True)
 
-    return df
\ No newline at end of file
+def get_goalkeeper_form(goalkeeper: str, columns: list[str]) -> pd.DataFrame:
+    """
+    Get one goalkeeper's rolling form (match_date plus `columns`), oldest
+    match first. The table is sorted by goalkeeper, so from Parquet the
+    filter only reads the row groups holding that keeper and only the
+    named columns.
+    """
+    df = read_table(
+        "mart_goalkeeper_rolling_form",
+        columns=["match_date", *columns],
+        filters=[("goalkeeper", "==", goalkeeper)],
+    )
+    return df.sort_values("match_date")
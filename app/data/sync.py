@@ -1,10 +1,17 @@
 import os
 import json
+import time
+import uuid
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime, timezone, timedelta
 from typing import Mapping, Any
 
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config as BotoConfig
+from botocore.exceptions import ClientError
 from dotenv import load_dotenv
 
 from app.config import Config
@@ -13,6 +20,17 @@ from app.utils import ts
 REPO_ROOT = Path(__file__).resolve().parents[2]
 load_dotenv(REPO_ROOT / ".env")
 
+MANIFEST_NAME = "manifest.json"
+
+# Parts of large objects fetched concurrently, per object
+PART_CONCURRENCY = 4
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=PART_CONCURRENCY,
+    use_threads=True,
+)
+
 
 def normalize_prefix(prefix: str) -> str:
     prefix = (prefix or "").strip("/")
@@ -63,56 +81,187 @@ def is_download_needed(local_path: Path, s3_last_modified: datetime) -> bool:
     return s3_last_modified_utc > local_mtime_dt
 
 
-def download_object(s3, bucket: str, key: str, local_path: Path) -> None:
-    """Download a S3 object to a given local path."""
+def file_digest(path: Path, algorithm: str) -> str:
+    digest = hashlib.new(algorithm)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def etag_is_md5(s3, bucket: str, obj: dict) -> bool:
+    """
+    True if the object's ETag is the MD5 of its content: a single-part
+    upload that is not SSE-KMS or SSE-C encrypted (their ETags are not
+    MD5s). Objects whose headers can't be read (e.g. SSE-C without the
+    key) are treated as not MD5.
+    """
+    etag = obj.get("ETag", "").strip('"')
+    # Multipart ETags ("<md5 of part md5s>-<parts>") aren't a content MD5
+    if not etag or "-" in etag:
+        return False
+
+    try:
+        head = s3.head_object(Bucket=bucket, Key=obj["Key"])
+    except ClientError:
+        return False
+    return not (head.get("ServerSideEncryption", "").startswith("aws:kms") or "SSECustomerAlgorithm" in head)
+
+
+def download_object(s3, bucket: str, obj: dict, local_path: Path, sha256: str | None = None) -> int:
+    """
+    Download a S3 object (a list_objects_v2 entry) to a given local path,
+    atomically: it is fetched to a temp file in the same directory,
+    checked, then renamed into place. Readers never see a partial file.
+
+    The check is the object's size plus its manifest `sha256` when given,
+    else its ETag when that is a content MD5 (see `etag_is_md5`).
+    Returns the bytes downloaded.
+    """
     local_path.parent.mkdir(parents=True, exist_ok=True)
-    s3.download_file(bucket, key, str(local_path))
+    tmp_path = local_path.with_name(f".{local_path.name}.{uuid.uuid4().hex}.part")
+
+    try:
+        s3.download_file(bucket, obj["Key"], str(tmp_path), Config=TRANSFER_CONFIG)
+
+        size = tmp_path.stat().st_size
+        if size != obj["Size"]:
+            raise RuntimeError(f"{obj['Key']}: downloaded {size} bytes, expected {obj['Size']}")
 
+        if sha256 is not None:
+            if file_digest(tmp_path, "sha256") != sha256:
+                raise RuntimeError(f"{obj['Key']}: SHA-256 mismatch with manifest")
+        elif etag_is_md5(s3, bucket, obj) and file_digest(tmp_path, "md5") != obj["ETag"].strip('"'):
+            raise RuntimeError(f"{obj['Key']}: ETag mismatch")
 
-def sync_latest(bucket: str, prefix: str, local_dir: Path, state_path: Path) -> None:
+        os.replace(tmp_path, local_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+    return size
+
+
+def download_objects(s3, bucket: str, items: list[tuple[dict, Path, str | None]], workers: int) -> int:
+    """Download (object, local path, sha256) items on a bounded thread pool. Returns total bytes."""
+    if not items:
+        return 0
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        return sum(pool.map(lambda item: download_object(s3, bucket, *item), items))
+
+
+def read_manifest(path: Path) -> dict:
+    """Return the artefacts of a manifest.json (empty if missing)."""
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text()).get("artefacts", {})
+
+
+def remove_stale_artefacts(local_dir: Path, old: dict, new: dict) -> list[str]:
+    """Delete local artefacts of the old manifest that the new one dropped."""
+    removed = []
+    for rel in old:
+        if rel not in new:
+            (local_dir / rel).unlink(missing_ok=True)
+            removed.append(rel)
+    return removed
+
+
+def sync_latest(bucket: str, prefix: str, local_dir: Path, state_path: Path,
+                workers: int = 16, endpoint_url: str | None = None) -> None:
+    """
+    Download changed objects under s3://bucket/prefix to `local_dir`.
+
+    When the prefix holds a manifest.json (written by the pipeline's stage
+    step), an artefact is downloaded only if its content hash differs from
+    the local manifest, and artefacts the manifest dropped are deleted.
+    Other objects fall back to comparing S3 LastModified with local mtime.
+
+    Downloads run on `workers` threads and each lands atomically, so a
+    running app never reads a half-written file.
+    """
     if not bucket:
         raise ValueError("Missing S3 bucket (Config.S3_BUCKET)")
     prefix = normalize_prefix(prefix)
-    s3 = boto3.client("s3")
+    s3 = boto3.client(
+        "s3",
+        endpoint_url=endpoint_url or None,
+        config=BotoConfig(max_pool_connections=max(1, workers) * PART_CONCURRENCY),
+    )
+    t0 = time.perf_counter()
 
     objs = list_s3_objects(s3, bucket, prefix)
     if not objs:
         raise RuntimeError("No objects found under bucket/prefix")
 
+    manifest_key = f"{prefix}{MANIFEST_NAME}"
+    manifest_path = local_dir / MANIFEST_NAME
+    local_manifest = read_manifest(manifest_path)
+    remote_manifest = None
 
+    manifest_obj = next((obj for obj in objs if obj["Key"] == manifest_key), None)
+    if manifest_obj is not None:
+        # Fetched aside; replaces the local manifest once every artefact is in place
+        remote_manifest_path = local_dir / f".{MANIFEST_NAME}.remote"
+        download_object(s3, bucket, manifest_obj, remote_manifest_path)
+        remote_manifest = read_manifest(remote_manifest_path)
 
+    to_download = []
     downloaded = []
     skipped = []
 
     for obj in objs:
         key = obj["Key"]
+        if key == manifest_key:
+            continue
+
         s3_mlast = obj["LastModified"]
         s3_mlast_iso = s3_mlast.astimezone(timezone.utc).isoformat(timespec="seconds")
         
         local_path = local_path_for_key(local_dir, prefix, key)
-
-        if is_download_needed(local_path, s3_mlast):
-            download_object(s3, bucket, key, local_path)
-            downloaded.append({
-                "key": key,
-                "local_path": str(local_path),
-                "s3_last_modified_utc": s3_mlast_iso
-            })
+        rel = local_path.relative_to(local_dir).as_posix()
+
+        if remote_manifest is not None and rel in remote_manifest:
+            local_entry = local_manifest.get(rel)
+            needed = (
+                not local_path.exists()
+                or local_entry is None
+                or local_entry["sha256"] != remote_manifest[rel]["sha256"]
+            )
+        else:
+            needed = is_download_needed(local_path, s3_mlast)
+
+        item = {
+            "key": key,
+            "local_path": str(local_path),
+            "s3_last_modified_utc": s3_mlast_iso
+        }
+        if needed:
+            sha256 = remote_manifest[rel]["sha256"] if remote_manifest and rel in remote_manifest else None
+            to_download.append((obj, local_path, sha256))
+            downloaded.append(item)
         else:
-            skipped.append({
-                "key": key,
-                "local_path": str(local_path),
-                "s3_last_modified_utc": s3_mlast_iso
-            })
+            skipped.append(item)
+
+    downloaded_bytes = download_objects(s3, bucket, to_download, workers)
+
+    removed = []
+    if remote_manifest is not None:
+        removed = remove_stale_artefacts(local_dir, local_manifest, remote_manifest)
+        os.replace(remote_manifest_path, manifest_path)
 
     result = {
         "bucket": bucket,
         "prefix": prefix,
         "synced_at_utc": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "duration_s": round(time.perf_counter() - t0, 3),
+        "workers": workers,
+        "downloaded_bytes": downloaded_bytes,
         "downloaded_count": len(downloaded),
         "skipped_count": len(skipped),
+        "removed_count": len(removed),
         "downloaded": downloaded,
-        "skipped": skipped
+        "skipped": skipped,
+        "removed": removed,
     }
 
     state_path.parent.mkdir(parents=True, exist_ok=True)
@@ -149,7 +298,11 @@ def sync_data(config: Mapping[str, Any]) -> None:
         return
 
     print(f"[{ts()}] Syncing latest files from S3...")
-    sync_latest(bucket, prefix, local_dir, state_path)
+    sync_latest(
+        bucket, prefix, local_dir, state_path,
+        workers=int(config.get("SYNC_WORKERS", 16)),
+        endpoint_url=config.get("S3_ENDPOINT_URL"),
+    )
     print(f"[{ts()}] Synced latest files from S3...")
 
 
@@ -158,7 +311,9 @@ def main():
         "S3_BUCKET": Config.S3_BUCKET,
         "S3_PREFIX": Config.S3_PREFIX,
         "DATA_DIR": Config.DATA_DIR,
-        "FORCE_S3_SYNC": Config.FORCE_S3_SYNC
+        "FORCE_S3_SYNC": Config.FORCE_S3_SYNC,
+        "SYNC_WORKERS": Config.SYNC_WORKERS,
+        "S3_ENDPOINT_URL": Config.S3_ENDPOINT_URL,
     })
     
 
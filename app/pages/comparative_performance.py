@@ -1,7 +1,8 @@
 import dash
 from dash import html, dcc, Input, Output, callback
 
-from app.data.store import get_parquet_table
+from app.data.store import get_latest_competition_table, apply_clean_labels
+from app.data.ratings import METRICS, DEFAULT_WEIGHTS, DEFAULT_MIN_MATCHES, rate_goalkeepers
 from app.data.transforms import transform_df, get_valid_goalkeepers, get_n_highest_ranked_goalkeepers
 from app.components.aggrid import GridSpec, make_aggrid, reset_grid
 from app.components.radar import get_radar_chart
@@ -16,6 +17,8 @@ GRID_CONTAINER_ID = f"{PAGE}-grid-container"
 RESET_BTN_ID      = f"{PAGE}-reset-filters-btn"
 DROPDOWN_ID       = f"{PAGE}-goalkeeper-dropdown"
 PLOT_ID           = f"{PAGE}-dynamic-radar-plot"
+MIN_MATCHES_ID    = f"{PAGE}-min-matches-slider"
+WEIGHT_IDS        = {m: f"{PAGE}-weight-{m.replace('_', '-')}" for m in METRICS}
 
 dash.register_page(__name__, 
                    path="/comparative-performance-analysis", 
@@ -26,7 +29,18 @@ dash.register_page(__name__,
 # -----------------------------
 # Data loading
 # -----------------------------
-df = transform_df(get_parquet_table("mart_goalkeeper_league_ratings", None, True))
+# Ratings are computed in-app from the fact table (see app/data/ratings.py),
+# so weights and the minimum matches can be changed on the page
+fct = get_latest_competition_table("fct_goalkeeper_performance", "Premier League", False)
+
+
+def get_ratings_df(weights: dict, min_matches: int):
+    """Rate goalkeepers and shape them like the ratings mart shown in the grid."""
+    ratings = rate_goalkeepers(fct, weights, min_matches)
+    return transform_df(apply_clean_labels(ratings, "mart_goalkeeper_league_ratings"))
+
+
+df = get_ratings_df(DEFAULT_WEIGHTS, DEFAULT_MIN_MATCHES)
 
 REFERENCE_COLS = ["Goalkeeper", "Team"]
 
@@ -48,7 +62,6 @@ grid = make_aggrid(df, spec)
 # -----------------------------
 gk_values = get_valid_goalkeepers(df)
 gk_options = [{"label": gk, "value": gk} for gk in gk_values]
-valid_gks = set(gk_values)
 
 default_gks = get_n_highest_ranked_goalkeepers(df, n=3)
 initial_fig = get_radar_chart(default_gks, df)
@@ -56,12 +69,60 @@ initial_fig = get_radar_chart(default_gks, df)
 MAX_GKS = 5
 
 
+# -----------------------------
+# Rating controls
+# -----------------------------
+# Slider labels reuse the metric labels of the ratings mart
+metric_labels = apply_clean_labels(fct[METRICS].head(0), "mart_goalkeeper_league_ratings").columns
+
+weight_sliders = [
+    html.Div(
+        [
+            html.Label(label),
+            dcc.Slider(
+                id=WEIGHT_IDS[metric],
+                min=0,
+                max=0.5,
+                step=0.05,
+                value=DEFAULT_WEIGHTS[metric],
+                marks=None,
+                tooltip={"placement": "bottom"},
+            ),
+        ]
+    )
+    for metric, label in zip(METRICS, metric_labels)
+]
+
+WEIGHT_INPUTS = [Input(WEIGHT_IDS[m], "value") for m in METRICS]
+
+
+def read_controls(min_matches, weight_values) -> tuple[dict, int]:
+    """Map control values to (weights, min_matches) for the rating engine."""
+    weights = {m: w or 0.0 for m, w in zip(METRICS, weight_values)}
+    return weights, int(min_matches or 1)
+
+
 # -----------------------------
 # Layout
 # -----------------------------
 layout = html.Div(
     [
         html.H3("Standardised Performance & Ranking"),
+        html.Div(
+            [
+                html.H4("Overall Score Weights"),
+                *weight_sliders,
+                html.Label("Minimum matches played"),
+                dcc.Slider(
+                    id=MIN_MATCHES_ID,
+                    min=1,
+                    max=20,
+                    step=1,
+                    value=DEFAULT_MIN_MATCHES,
+                ),
+            ],
+            className="block",
+        ),
         html.Div(
             [
                 html.Div(id=GRID_CONTAINER_ID, children=grid),
@@ -101,13 +162,19 @@ layout = html.Div(
 # Callbacks
 # -----------------------------
 
+# Re-rate on any control change; also remounts the grid on reset
 @callback(
     Output(GRID_CONTAINER_ID, "children"),
+    Output(DROPDOWN_ID, "options"),
     Input(RESET_BTN_ID, "n_clicks"),
+    Input(MIN_MATCHES_ID, "value"),
+    *WEIGHT_INPUTS,
     prevent_initial_call=True,
 )
-def reset_filters(_):
-    return reset_grid(df, spec)
+def update_ratings(_, min_matches, *weight_values):
+    dff = get_ratings_df(*read_controls(min_matches, weight_values))
+    options = [{"label": gk, "value": gk} for gk in get_valid_goalkeepers(dff)]
+    return reset_grid(dff, spec), options
 
 
 @callback(
@@ -127,14 +194,19 @@ def limit_goalkeeper_selection(selected):
 @callback(
     Output(PLOT_ID, "figure"),
     Input(DROPDOWN_ID, "value"),
+    Input(MIN_MATCHES_ID, "value"),
+    *WEIGHT_INPUTS,
 )
-def update_graph(goalkeepers):
+def update_graph(goalkeepers, min_matches, *weight_values):
+    dff = get_ratings_df(*read_controls(min_matches, weight_values))
+
     if not goalkeepers:
-        return get_radar_chart([], df)
+        return get_radar_chart([], dff)
 
     if isinstance(goalkeepers, str):
         goalkeepers = [goalkeepers]
 
-    goalkeepers = [g for g in goalkeepers if g in valid_gks]
+    valid = set(get_valid_goalkeepers(dff))
+    goalkeepers = [g for g in goalkeepers if g in valid]
     
-    return get_radar_chart(goalkeepers, df)
+    return get_radar_chart(goalkeepers, dff)
@@ -2,7 +2,7 @@ import dash
 from dash import html, dcc, Input, Output, callback
 import plotly.express as px
 
-from app.data.store import get_parquet_table
+from app.data.store import get_latest_competition_table, get_goalkeeper_form
 from app.data.transforms import transform_df
 from app.components.aggrid import GridSpec, make_aggrid, reset_grid
 
@@ -17,6 +17,9 @@ GRID_CONTAINER_ID  = f"{PAGE}-grid-container"
 RESET_BTN_ID       = f"{PAGE}-reset-filters-btn"
 METRIC_DROPDOWN_ID = f"{PAGE}-metric-dropdown"
 PLOT_ID            = f"{PAGE}-dynamic-bar-plot"
+FORM_GK_ID         = f"{PAGE}-form-goalkeeper-dropdown"
+FORM_METRIC_ID     = f"{PAGE}-form-metric-dropdown"
+FORM_PLOT_ID       = f"{PAGE}-form-line-plot"
 
 dash.register_page(__name__, 
                    path="/performance-overview", 
@@ -27,11 +30,30 @@ dash.register_page(__name__,
 # -----------------------------
 # Data loading
 # -----------------------------
-df = transform_df(get_parquet_table("fct_goalkeeper_performance", None, True))
+# Both marts hold every season and competition; read only the latest
+# Premier League season's partition
+raw_df = get_latest_competition_table("fct_goalkeeper_performance", "Premier League", True)
+df = transform_df(raw_df.sort_values(["Matches Played", "Clean Sheets"], ascending=False))
 
 REFERENCE_COLS = ["Goalkeeper", "Team"]
 METRIC_COLS = [col for col in df.columns if col not in REFERENCE_COLS]
 
+# Rolling form metrics: {label: (5-match column, 10-match column)}
+FORM_METRICS = {
+    "Save %": ("save_pct_5", "save_pct_10"),
+    "PSxG − GA": ("psxg_minus_ga_5", "psxg_minus_ga_10"),
+    "Crosses Stopped %": ("crosses_stopped_pct_5", "crosses_stopped_pct_10"),
+    "Def Actions OPA (per 90)": ("def_actions_outside_pen_area_p90_5", "def_actions_outside_pen_area_p90_10"),
+}
+# Form is looked up by goalkeeper identifier; the dropdown shows display names
+FORM_GK_OPTIONS = sorted(
+    (
+        {"label": name, "value": gk}
+        for gk, name in zip(raw_df["Goalkeeper"], transform_df(raw_df)["Goalkeeper"])
+    ),
+    key=lambda option: option["label"],
+)
+
 
 # -----------------------------
 # Grid configuration
@@ -80,6 +102,30 @@ layout = html.Div(
             ],
             className="block",
         ),
+
+        html.Div(
+            [
+                html.H4("Recent Form"),
+                dcc.Dropdown(
+                    id=FORM_GK_ID,
+                    options=FORM_GK_OPTIONS,
+                    value=FORM_GK_OPTIONS[0]["value"] if FORM_GK_OPTIONS else None,
+                    clearable=False,
+                ),
+                dcc.Dropdown(
+                    id=FORM_METRIC_ID,
+                    options=[{"label": m, "value": m} for m in FORM_METRICS],
+                    value=next(iter(FORM_METRICS)),
+                    clearable=False,
+                ),
+                dcc.Graph(
+                    id=FORM_PLOT_ID,
+                    figure={},
+                    style={"height": "50vh"},
+                ),
+            ],
+            className="block",
+        ),
     ],
     className="page",
 )
@@ -112,3 +158,26 @@ def update_graph(metric):
         y=metric,
         title=f"{metric} by Goalkeeper",
     )
+
+
+# Rolling 5- and 10-match form for one goalkeeper
+@callback(
+    Output(FORM_PLOT_ID, "figure"),
+    Input(FORM_GK_ID, "value"),
+    Input(FORM_METRIC_ID, "value"),
+)
+def update_form_graph(goalkeeper, metric):
+    if not goalkeeper:
+        return {}
+
+    col_5, col_10 = FORM_METRICS[metric]
+    dff = get_goalkeeper_form(goalkeeper, [col_5, col_10]).rename(
+        columns={col_5: "Last 5", col_10: "Last 10"}
+    )
+    return px.line(
+        dff,
+        x="match_date",
+        y=["Last 5", "Last 10"],
+        labels={"match_date": "Match Date", "value": metric, "variable": "Window"},
+        title=f"Rolling {metric}",
+    )
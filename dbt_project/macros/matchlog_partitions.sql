@@ -0,0 +1,67 @@
+-- Helpers for models built incrementally per (goalkeeper, season, competition)
+-- partition of stg_matchlogs__parsed, watermarked by a `source_loaded_utc`
+-- column (the newest raw load feeding each partition).
+
+
+{% macro has_source_watermark() %}
+    {#- True for an incremental run on a table that has `source_loaded_utc`;
+        tables built before the column existed are rebuilt in full -#}
+    {%- if not is_incremental() -%}
+        {{ return(false) }}
+    {%- endif -%}
+    {%- set columns = adapter.get_columns_in_relation(this) | map(attribute='name') | map('lower') | list -%}
+    {{ return('source_loaded_utc' in columns) }}
+{% endmacro %}
+
+
+{% macro source_watermark() %}
+    (select coalesce(max(source_loaded_utc), timestamp '1900-01-01') from {{ this }})
+{% endmacro %}
+
+
+{% macro changed_matchlog_partitions() %}
+    {#- Partitions with raw rows loaded, or raw rows deleted by
+        scripts/load_duckdb.py, since the last build -#}
+    select goalkeeper, season, competition
+    from {{ ref('stg_matchlogs__parsed') }}
+    where loaded_utc > {{ source_watermark() }}
+
+    union
+
+    select goalkeeper, season, competition
+    from raw_matchlogs._deleted_partitions
+    where deleted_utc > {{ source_watermark() }}
+{% endmacro %}
+
+
+{% macro delete_stale_matchlog_partitions() %}
+    {#- Pre-hook. delete+insert only replaces partitions the new build
+        returns, matching keys with `=`. So changed partitions left without
+        played minutes (raw rows deleted, or all at 0 minutes) and those
+        with a null competition, which `=` never matches, are deleted here -#}
+    {%- if has_source_watermark() %}
+    delete from {{ this }} as t
+    where exists (
+        select 1
+        from (
+            select goalkeeper, season, competition from ({{ changed_matchlog_partitions() }}) c
+            except
+            select goalkeeper, season, competition from {{ ref('stg_matchlogs__parsed') }}
+            where minutes_played > 0 and competition is not null
+        ) s
+        where t.goalkeeper = s.goalkeeper
+            and t.season = s.season
+            and t.competition is not distinct from s.competition
+    )
+    {%- elif is_incremental() %}
+    delete from {{ this }}
+    {%- endif %}
+{% endmacro %}
+
+
+{% macro prune_deleted_matchlog_partitions() %}
+    {#- Post-hook. Deleted partitions at or below the new watermark have
+        been rebuilt, so no later build needs them -#}
+    delete from raw_matchlogs._deleted_partitions
+    where deleted_utc <= (select max(source_loaded_utc) from {{ this }})
+{% endmacro %}
@@ -1,15 +1,47 @@
-{{ config(materialized='table') }}
+{{
+    config(
+        materialized='incremental',
+        incremental_strategy='delete+insert',
+        unique_key=['goalkeeper', 'season', 'competition'],
+        on_schema_change='append_new_columns',
+        pre_hook="{{ delete_stale_matchlog_partitions() }}",
+        post_hook="{{ prune_deleted_matchlog_partitions() }}",
+    )
+}}
+
+-- Incremental at (goalkeeper, season, competition) grain: a build only
+-- re-aggregates partitions with raw rows loaded or deleted since the last
+-- build, and drops those left without played minutes (see
+-- macros/matchlog_partitions.sql). A table built before source_loaded_utc
+-- existed is rebuilt in full.
+
+with
+
+{% if has_source_watermark() %}
+changed_partitions as (
+
+    {{ changed_matchlog_partitions() }}
+
+),
+{% endif %}
 
-with base as (
+
+base as (
 
     select 
     
-    *
+    p.*
     
-    from {{ ref('stg_matchlogs__parsed') }}
+    from {{ ref('stg_matchlogs__parsed') }} p
+
+    {% if has_source_watermark() %}
+    inner join changed_partitions c
+        on p.goalkeeper = c.goalkeeper
+        and p.season = c.season
+        and p.competition is not distinct from c.competition
+    {% endif %}
     
-    where minutes_played > 0
-      and competition = 'Premier League'
+    where p.minutes_played > 0
 
 ),
 
@@ -21,6 +53,8 @@ latest_team as (
     select
         
         goalkeeper,
+        season,
+        competition,
         team
     
     from (
@@ -29,8 +63,10 @@ latest_team as (
           
             goalkeeper,
             team,
+            season,
+            competition,
             row_number() over (
-                partition by goalkeeper
+                partition by goalkeeper, season, competition
                 order by match_date desc
             ) as rn
         
@@ -47,6 +83,8 @@ agg as (
     select
 
         goalkeeper,
+        season,
+        competition,
 
         -- Performance
         count(*) as matches_played,
@@ -73,10 +111,13 @@ agg as (
             as def_actions_outside_pen_area_p90,
         sum(gk_def_actions_outside_pen_area * gk_avg_distance_def_actions)
             / nullif(sum(gk_def_actions_outside_pen_area), 0)
-            as avg_distance_def_actions
+            as avg_distance_def_actions,
+
+        -- Newest raw load feeding this partition; drives incremental builds
+        max(loaded_utc) as source_loaded_utc
 
     from base
-    group by goalkeeper
+    group by goalkeeper, season, competition
 
 ),
 
@@ -86,17 +127,18 @@ final as (
     select
 
         a.goalkeeper,
+        a.season,
+        a.competition,
         t.team,
-        a.* exclude (goalkeeper)
+        a.* exclude (goalkeeper, season, competition)
 
     from agg a
     left join latest_team t
         on a.goalkeeper = t.goalkeeper
+        and a.season = t.season
+        and a.competition is not distinct from t.competition
 
 )
 
 
 select * from final
-order by
-    matches_played desc,
-    clean_sheets desc
@@ -5,6 +5,8 @@ with keepers as (
   select
 
       goalkeeper,
+      season,
+      competition,
       team,
 
       -- Core metrics
@@ -21,9 +23,15 @@ with keepers as (
 ),
 
 
+-- League-level standardisation is per season and competition, computed
+-- from the small aggregate table only
 league_stats as (
 
   select
+
+      season,
+      competition,
+
       -- League metric means
       avg(save_pct) as mean_save_pct,
       avg(psxg_minus_ga) as mean_psxg_minus_ga,
@@ -41,6 +49,7 @@ league_stats as (
       stddev_pop(def_actions_outside_pen_area_p90) as stddev_def_actions_outside_pen_area_p90
 
   from keepers
+  group by season, competition
 ),
 
 
@@ -49,6 +58,8 @@ keepers_normalised as (
   select
 
       k.goalkeeper,
+      k.season,
+      k.competition,
       k.team,
 
       -- Raw metrics
@@ -67,16 +78,18 @@ keepers_normalised as (
       (k.long_kick_pass_completion_pct - l.mean_long_kick_pass_completion_pct) / nullif(l.stddev_long_kick_pass_completion_pct, 0) as z_long_kick_pass_completion_pct,
       (k.def_actions_outside_pen_area_p90 - l.mean_def_actions_outside_pen_area_p90) / nullif(l.stddev_def_actions_outside_pen_area_p90, 0) as z_def_actions_outside_pen_area_p90,
 
-      -- Percentiles (league-relative)
-      percent_rank() over (order by k.save_pct) * 100 as pct_save_pct,
-      percent_rank() over (order by k.psxg_minus_ga) * 100 as pct_psxg_minus_ga,
-      percent_rank() over (order by k.crosses_stopped_pct) * 100 as pct_crosses_stopped_pct,
-      percent_rank() over (order by k.pass_att_p90) * 100 as pct_pass_att_p90,
-      percent_rank() over (order by k.long_kick_pass_completion_pct) * 100 as pct_long_kick_pass_completion_pct,
-      percent_rank() over (order by k.def_actions_outside_pen_area_p90) * 100 as pct_def_actions_outside_pen_area_p90
+      -- Percentiles (league-relative, within season and competition)
+      percent_rank() over (partition by k.season, k.competition order by k.save_pct) * 100 as pct_save_pct,
+      percent_rank() over (partition by k.season, k.competition order by k.psxg_minus_ga) * 100 as pct_psxg_minus_ga,
+      percent_rank() over (partition by k.season, k.competition order by k.crosses_stopped_pct) * 100 as pct_crosses_stopped_pct,
+      percent_rank() over (partition by k.season, k.competition order by k.pass_att_p90) * 100 as pct_pass_att_p90,
+      percent_rank() over (partition by k.season, k.competition order by k.long_kick_pass_completion_pct) * 100 as pct_long_kick_pass_completion_pct,
+      percent_rank() over (partition by k.season, k.competition order by k.def_actions_outside_pen_area_p90) * 100 as pct_def_actions_outside_pen_area_p90
 
   from keepers k
-  cross join league_stats l
+  inner join league_stats l
+      on k.season = l.season
+      and k.competition = l.competition
 ),
 
 
@@ -108,7 +121,10 @@ final as (
       *,
 
       -- Rank goalkeepers based on overall performance metric
-      rank() over (order by overall_score desc) as overall_rank
+      rank() over (
+          partition by season, competition
+          order by overall_score desc
+      ) as overall_rank
 
   from keepers_scored
 )
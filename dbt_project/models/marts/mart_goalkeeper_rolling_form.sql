@@ -0,0 +1,83 @@
+-- Match-level rolling form: each row is one match a keeper played, with
+-- metrics over that match and the keeper's previous 4 / 9 matches (across
+-- seasons and competitions). Ordered by goalkeeper and match date so a
+-- keeper's rows sit together in the exported Parquet.
+
+with
+
+base as (
+
+    select
+
+        goalkeeper,
+        season,
+        competition,
+        team,
+        opponent,
+        match_date,
+        minutes_played,
+        gk_saves,
+        gk_shots_on_target_against,
+        gk_psxg,
+        gk_goals_against,
+        gk_crosses,
+        gk_crosses_stopped,
+        gk_def_actions_outside_pen_area
+
+    from {{ ref('stg_matchlogs__parsed') }}
+
+    where minutes_played > 0
+
+),
+
+
+rolling as (
+
+    select
+
+        goalkeeper,
+        season,
+        competition,
+        match_date,
+        team,
+        opponent,
+
+        -- Last 5 matches
+        count(*) over last_5 as matches_in_window_5,
+        round(sum(gk_saves) over last_5
+            / nullif(sum(gk_shots_on_target_against) over last_5, 0), 3) * 100 as save_pct_5,
+        round(sum(gk_psxg) over last_5 - sum(gk_goals_against) over last_5, 2) as psxg_minus_ga_5,
+        round(sum(gk_crosses_stopped) over last_5
+            / nullif(sum(gk_crosses) over last_5, 0), 3) * 100 as crosses_stopped_pct_5,
+        round(sum(gk_def_actions_outside_pen_area) over last_5
+            / nullif(sum(minutes_played) over last_5, 0), 3) * 90 as def_actions_outside_pen_area_p90_5,
+
+        -- Last 10 matches
+        count(*) over last_10 as matches_in_window_10,
+        round(sum(gk_saves) over last_10
+            / nullif(sum(gk_shots_on_target_against) over last_10, 0), 3) * 100 as save_pct_10,
+        round(sum(gk_psxg) over last_10 - sum(gk_goals_against) over last_10, 2) as psxg_minus_ga_10,
+        round(sum(gk_crosses_stopped) over last_10
+            / nullif(sum(gk_crosses) over last_10, 0), 3) * 100 as crosses_stopped_pct_10,
+        round(sum(gk_def_actions_outside_pen_area) over last_10
+            / nullif(sum(minutes_played) over last_10, 0), 3) * 90 as def_actions_outside_pen_area_p90_10
+
+    from base
+
+    window
+        last_5 as (
+            partition by goalkeeper
+            order by match_date
+            rows between 4 preceding and current row
+        ),
+        last_10 as (
+            partition by goalkeeper
+            order by match_date
+            rows between 9 preceding and current row
+        )
+
+)
+
+
+select * from rolling
+order by goalkeeper, match_date
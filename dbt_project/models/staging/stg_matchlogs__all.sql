@@ -1,11 +1,10 @@
 {{ config(materialized='view') }}
 
-{% set tables = get_table_names('raw_matchlogs') %}
-
-{% for t in tables %}
+-- One bulk-loaded table holds every matchlog file (see scripts/load_duckdb.py)
 select
-  '{{ t }}' as source_table,
-  *
-from raw_matchlogs.{{ t }}
-{% if not loop.last %} union all {% endif %}
-{% endfor %}
\ No newline at end of file
+  source_table,
+  source_file,
+  goalkeeper,
+  season,
+  * exclude (source_table, source_file, goalkeeper, season)
+from raw_matchlogs.matchlogs
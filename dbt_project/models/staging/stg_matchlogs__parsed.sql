@@ -6,11 +6,9 @@ with base AS (
 
         *,
 
-        -- Clean minutes played column
-        case 
-            when minutes = 'Match Report' then 0
-            else cast(minutes as integer)
-        end as minutes_played
+        -- Raw minutes are a typed integer, null when the keeper did not play
+        -- (the loader maps legacy 'Match Report' values to null)
+        coalesce(minutes, 0) as minutes_played
 
     from {{ ref('stg_matchlogs__all') }}
 ),
@@ -20,10 +18,8 @@ final AS (
 
     select
         source_table,
-        
-        -- Extract goalkeeper and season fields from source_table 
-        regexp_replace(source_table, '_[0-9]{4}_[0-9]{4}$', '') AS goalkeeper,
-        regexp_extract(source_table, '([0-9]{4}_[0-9]{4})$', 1) AS season,
+        goalkeeper,
+        season,
         
         date as match_date,
         comp as competition,    
@@ -64,7 +60,9 @@ final AS (
         gk_crosses,
         gk_crosses_stopped,
         gk_def_actions_outside_pen_area,
-        gk_avg_distance_def_actions
+        gk_avg_distance_def_actions,
+
+        loaded_utc
 
     from base
 )
@@ -0,0 +1,92 @@
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+from utils.logging import ts
+
+
+def sha256_text(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def write_atomic(path: Path, text: str) -> None:
+    """Write via a temp file + rename so readers never see a partial file."""
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp_path.write_text(text, encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+class HTMLCache:
+    """
+    Content-addressed store of raw page HTML.
+
+    Bodies live once under `blobs/<sha256>.html`; a small JSON entry per URL
+    under `urls/` points at the current blob and keeps the validators
+    (ETag / Last-Modified) needed for conditional re-fetches.
+    """
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+        self.blobs_dir = self.root / "blobs"
+        self.urls_dir = self.root / "urls"
+        self.blobs_dir.mkdir(parents=True, exist_ok=True)
+        self.urls_dir.mkdir(parents=True, exist_ok=True)
+
+
+    def entry_path(self, url: str) -> Path:
+        return self.urls_dir / f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}.json"
+
+
+    def lookup(self, url: str) -> dict | None:
+        """Return the cache entry for `url`, or None if never stored."""
+        path = self.entry_path(url)
+        if not path.exists():
+            return None
+        return json.loads(path.read_text())
+
+
+    def read(self, url: str) -> str | None:
+        """Return the cached HTML for `url`, or None."""
+        entry = self.lookup(url)
+        if entry is None:
+            return None
+
+        blob_path = self.blobs_dir / f"{entry['sha256']}.html"
+        if not blob_path.exists():
+            return None
+        return blob_path.read_text(encoding="utf-8")
+
+
+    def conditional_headers(self, url: str) -> dict:
+        """Return If-None-Match / If-Modified-Since headers for `url`."""
+        entry = self.lookup(url) or {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+
+    def store(self, url: str, html: str, etag: str | None = None,
+              last_modified: str | None = None) -> bool:
+        """Store `html` for `url`. Returns True if the content changed."""
+        digest = sha256_text(html)
+        previous = self.lookup(url)
+
+        blob_path = self.blobs_dir / f"{digest}.html"
+        if not blob_path.exists():
+            write_atomic(blob_path, html)
+
+        entry = {
+            "url": url,
+            "sha256": digest,
+            "etag": etag,
+            "last_modified": last_modified,
+            "fetched_utc": ts(),
+        }
+        write_atomic(self.entry_path(url), json.dumps(entry, indent=2))
+
+        return previous is None or previous["sha256"] != digest
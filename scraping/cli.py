@@ -1,94 +1,524 @@
 import argparse
-import json
+import itertools
+import os
+import queue
+import threading
 import time
 from pathlib import Path
 
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+from .cache import HTMLCache
+from .state import ScrapeState, merge_competitions
+from .telemetry import EventLog, summarise_events
 from .scraper import FBRefScraper, load_config
-from utils.logging import ts, write_manifest, update_status_json, make_status_patch
-from utils.scraping import is_stale
+from .http_scraper import FBRefHTTPScraper, parse_matchlogs_table
+from utils.logging import ts, update_status_json, make_status_patch
+from utils.scraping import (
+    TokenBucket,
+    is_season_closed,
+    is_season_stale,
+    latest_match_date,
+)
 
 
-def make_scraper(scrape_cfg):
-    """Return FBRefScraper object."""
-    return FBRefScraper(
-        headless=scrape_cfg.get("headless", False),
+def make_rate_limiter(scrape_cfg):
+    """Return a TokenBucket shared by every scraper in this run (or None)."""
+    rate = scrape_cfg.get("requests_per_minute")
+    if not rate:
+        return None
+    return TokenBucket(rate, burst=scrape_cfg.get("burst", 1))
+
+
+def make_cache(scrape_cfg):
+    """Return the raw HTML cache (or None if `cache_dir` is not set)."""
+    cache_dir = scrape_cfg.get("cache_dir")
+    return HTMLCache(cache_dir) if cache_dir else None
+
+
+def browser_mode(scrape_cfg) -> str:
+    """Return "http", "lean" or "standard" for run summaries."""
+    if scrape_cfg.get("backend", "selenium") == "http":
+        return "http"
+    return "lean" if (scrape_cfg.get("lean") or {}).get("enabled") else "standard"
+
+
+def make_scraper(scrape_cfg, rate_limiter=None, cache=None, worker_id=0):
+    """Return a scraper for the configured backend ("selenium" or "http")."""
+    backend = scrape_cfg.get("backend", "selenium")
+
+    common = dict(
         wait_seconds=scrape_cfg.get("wait_seconds", 5),
         retries=scrape_cfg.get("retries", 5),
         success_delay_seconds=scrape_cfg.get("success_delay_seconds", 0),
+        rate_limiter=rate_limiter,
+        cache=cache,
+    )
+
+    if backend == "http":
+        return FBRefHTTPScraper(
+            pool_size=scrape_cfg.get("concurrency", 1),
+            **common,
+        )
+
+    if backend != "selenium":
+        raise ValueError(f"Unknown scraping backend: {backend!r}")
+
+    # Each worker needs its own warm Chrome profile directory
+    lean = dict(scrape_cfg.get("lean") or {})
+    if lean.get("profile_dir"):
+        lean["profile_dir"] = str(Path(lean["profile_dir"]) / f"worker-{worker_id}")
+
+    return FBRefScraper(
+        headless=scrape_cfg.get("headless", False),
         chromedriver_path=scrape_cfg.get("chromedriver_path"),
+        lean=lean,
+        **common,
     )
 
 
-def cmd_scrape_player_matchlogs_urls(config):
-    """Scrape player matchlog URLs from FBRef and write a players manifest."""
-    scrape_cfg = config["scraping"]
+def run_jobs(scrape_cfg, jobs, run_job):
+    """
+    Run jobs across a pool of `concurrency` scrapers and yield each finished job.
+
+    Every worker thread owns one scraper and pulls jobs from a shared queue;
+    all scrapers share a single rate limiter so the request rate is global.
+    Yields (job, result) pairs, where result is whatever `run_job` returned.
+    The first failing job stops the pool and its exception is re-raised.
+    """
+    concurrency = max(1, int(scrape_cfg.get("concurrency", 1)))
+    rate_limiter = make_rate_limiter(scrape_cfg)
+    cache = make_cache(scrape_cfg)
+
+    job_queue = queue.Queue()
+    for job in jobs:
+        job_queue.put(job)
+
+    done_queue = queue.Queue()
+    stop = threading.Event()
+
+    def worker(worker_id):
+        try:
+            scraper = make_scraper(scrape_cfg, rate_limiter, cache, worker_id)
+        except BaseException as e:
+            done_queue.put((None, e))
+            return
+
+        try:
+            while not stop.is_set():
+                try:
+                    job = job_queue.get_nowait()
+                except queue.Empty:
+                    return
+                try:
+                    done_queue.put((job, run_job(scraper, job)))
+                except BaseException as e:
+                    # Hand any failure to the main thread so it never waits forever
+                    done_queue.put((job, e))
+                    return
+        finally:
+            scraper.close()
+
+    n_workers = min(concurrency, len(jobs))
+    threads = [
+        threading.Thread(target=worker, args=(i,), daemon=True)
+        for i in range(n_workers)
+    ]
+    for t in threads:
+        t.start()
+
+    try:
+        for _ in range(len(jobs)):
+            job, result = done_queue.get()
+            if isinstance(result, BaseException):
+                raise result
+            yield job, result
+    finally:
+        stop.set()
+        for t in threads:
+            t.join()
+
+
+def serialize_matchlogs(table: pa.Table, file_format: str) -> bytes:
+    """Encode a matchlogs table as Parquet or, for compatibility, CSV."""
+    sink = pa.BufferOutputStream()
+
+    if file_format == "parquet":
+        pq.write_table(table, sink)
+    elif file_format == "csv":
+        pa_csv.write_csv(table, sink)
+    else:
+        raise ValueError(f"Unknown matchlogs file format: {file_format!r}")
+
+    return sink.getvalue().to_pybytes()
+
+
+def write_matchlogs_if_changed(table: pa.Table, out_path: Path, file_format: str) -> bool:
+    """
+    Write `table` unless `out_path` already holds identical content. The
+    file is written beside the target and renamed into place, so a crash
+    or a concurrent worker never leaves a truncated file for the loader.
+    """
+    data = serialize_matchlogs(table, file_format)
+
+    if out_path.exists() and out_path.read_bytes() == data:
+        return False
+
+    tmp_path = out_path.with_name(f".{out_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, out_path)
+    return True
+
+
+def open_state(config):
+    """
+    Open the scrape-state store, seeding it from a legacy players manifest
+    the first time it is created.
+    """
     output_cfg = config["output"]
+    state = ScrapeState(output_cfg.get("state_path", "data/scrape_state.sqlite"))
+
+    manifest_path = Path(output_cfg["public_dir"]) / "players_manifest.json"
+    if state.is_empty() and manifest_path.exists():
+        print(f"[{ts()}] Seeding scrape state from {manifest_path}")
+        state.import_manifest(manifest_path)
+
+    return state
+
+
+def discovery_competitions(discovery_cfg) -> list[dict]:
+    """
+    Return the configured competitions as dicts of {name, base_url,
+    fixtures_url, seasons}.
+
+    A competition without its own `seasons` uses `discovery.seasons`. The
+    single top-level `base_url` / `fixtures_url` form is still accepted.
+    """
+    default_seasons = discovery_cfg.get("seasons") or []
+    competitions = discovery_cfg.get("competitions")
+
+    if not competitions:
+        competitions = [{
+            "name": discovery_cfg.get("name", "default"),
+            "base_url": discovery_cfg["base_url"],
+            "fixtures_url": discovery_cfg.get("fixtures_url"),
+        }]
+
+    return [
+        {**competition, "seasons": competition.get("seasons") or default_seasons}
+        for competition in competitions
+    ]
+
+
+def discovery_seasons(discovery_cfg) -> list[str]:
+    """Return every season scraped for any configured competition."""
+    seasons = []
+    for competition in discovery_competitions(discovery_cfg):
+        seasons += [s for s in competition["seasons"] if s not in seasons]
+    return seasons
+
+
+def player_seasons(player, seasons) -> list[str]:
+    """
+    Return the seasons to scrape for a player: those it was discovered in,
+    or every configured season for players without recorded competitions.
+    """
+    discovered = {s for comp_seasons in player.get("competitions", {}).values() for s in comp_seasons}
+    if not discovered:
+        return seasons
+    return [s for s in seasons if s in discovered]
+
+
+def player_latest_fixture_date(player, latest_fixture_dates) -> str | None:
+    """Return the latest played fixture across a player's competitions."""
+    dates = [
+        latest_fixture_dates[name]
+        for name in player.get("competitions") or latest_fixture_dates
+        if latest_fixture_dates.get(name)
+    ]
+    return max(dates) if dates else None
+
+
+def cmd_scrape_player_matchlogs_urls(config, state):
+    """
+    Scrape player matchlog URLs for every configured competition into the
+    scrape-state store.
+
+    Discovery pages (one per competition, or one per competition-season if
+    `base_url` contains "{season}") and fixture pages are fetched
+    concurrently. Players are de-duplicated across competitions by
+    `player_id` and keep a {competition: [seasons]} membership map.
+
+    Returns {competition: latest played league fixture date} for
+    competitions with a `fixtures_url`.
+    """
+    scrape_cfg = config["scraping"]
+    competitions = discovery_competitions(config["discovery"])
 
-    public_dir = Path(output_cfg["public_dir"])
-    public_dir.mkdir(parents=True, exist_ok=True)
+    jobs = []
+    for competition in competitions:
+        if "{season}" in competition["base_url"]:
+            jobs += [("players", competition, season) for season in competition["seasons"]]
+        else:
+            jobs.append(("players", competition, None))
 
-    manifest_path = public_dir / "players_manifest.json"
-    base_url = config["discovery"].get("base_url")
+        if competition.get("fixtures_url"):
+            jobs.append(("fixtures", competition, None))
 
-    scraper = make_scraper(scrape_cfg)
+    def discovery_job(scraper, job):
+        kind, competition, season = job
 
-    try:
-        print(f"[{ts()}] Scraping player URLs from: {base_url}")
-        players = scraper.scrape_player_matchlogs_urls(base_url)
-        write_manifest(manifest_path, players)
-        print(f"[{ts()}] Saved manifest -> {manifest_path} ({len(players)} players)")
+        if kind == "fixtures":
+            return scraper.scrape_latest_fixture_date(competition["fixtures_url"])
 
-    finally:
-        scraper.close()
+        url = competition["base_url"].format(season = season)
+        print(f"[{ts()}] Scraping player URLs from: {url}")
+        return scraper.scrape_player_matchlogs_urls(url)
+
+    players_by_id = {}
+    latest_fixture_dates = {}
+
+    for (kind, competition, season), result in run_jobs(scrape_cfg, jobs, discovery_job):
+        name = competition["name"]
+
+        if kind == "fixtures":
+            latest_fixture_dates[name] = result
+            print(f"[{ts()}] Latest {name} fixture: {result}")
+            continue
+
+        seasons = [season] if season else competition["seasons"]
+        for player in result:
+            known = players_by_id.setdefault(player["player_id"], {**player, "competitions": {}})
+            known["competitions"] = merge_competitions(known["competitions"], {name: seasons})
 
+        print(f"[{ts()}] Found {len(result)} players in {name} {season or ''}".rstrip())
 
-def cmd_scrape_player_matchlogs_data(config):
-    """Scrape player matchlog data from FBRef and write CSV files."""
+    state.upsert_players(list(players_by_id.values()))
+    print(
+        f"[{ts()}] Saved {len(players_by_id)} players from "
+        f"{len(competitions)} competitions to scrape state"
+    )
+
+    return latest_fixture_dates
+
+
+def summarise_page_times(state, mode, events):
+    """
+    Summarise per-page load time (fetch + render wait) for this run and
+    compare it with the latest run in standard browser mode, so lean-mode
+    savings are visible.
+    """
+    page_times = [
+        e["fetch_s"] + e["wait_s"] for e in events
+        if e["status"] == "done" and e.get("fetch_s") is not None
+    ]
+    summary = {"mode": mode, "pages": len(page_times)}
+    if not page_times:
+        return summary
+
+    mean_s = sum(page_times) / len(page_times)
+    summary["page_s_mean"] = round(mean_s, 3)
+    state.set_meta(f"page_s_mean:{mode}", str(mean_s))
+
+    baseline = state.get_meta("page_s_mean:standard")
+    if mode != "standard" and baseline is not None:
+        summary["baseline_page_s_mean"] = round(float(baseline), 3)
+        summary["page_s_saved"] = round(float(baseline) - mean_s, 3)
+
+    return summary
+
+
+def select_jobs(players, seasons, latest_fixture_dates=None):
+    """Return (player_id, season) pairs that need scraping this run."""
+    jobs = []
+    for player in players:
+        latest_fixture_date = player_latest_fixture_date(player, latest_fixture_dates or {})
+
+        for season in player_seasons(player, seasons):
+            item = player["seasons"].get(season) or {}
+
+            # Dead-lettered jobs wait until revived with --retry-dead
+            if item.get("status") == "dead":
+                continue
+
+            if item.get("status") in ("pending", "failed") or is_season_stale(
+                item, season, latest_fixture_date=latest_fixture_date
+            ):
+                jobs.append((player["player_id"], season))
+    return jobs
+
+
+def cmd_scrape_player_matchlogs_data(config, state, latest_fixture_dates=None):
+    """
+    Scrape player matchlog data from FBRef and write typed matchlog files
+    (Parquet, or CSV when `output.file_format` is "csv").
+
+    Freshness is tracked per (player, season) in the scrape-state store, so
+    only seasons that can have changed are fetched (see `is_season_stale`).
+
+    Each run checkpoints its jobs as pending before starting; an interrupted
+    run is resumed on the next invocation, with any newly stale jobs added.
+    A failing job never aborts the run: it is re-queued for another pass,
+    passes backing off from `retry_pass_delay_seconds`, and after
+    `max_job_failures` consecutive failures in the run it is moved to the
+    dead-letter list.
+
+    Every job attempt is written as one event (timings, retries, bytes,
+    rows) to `output.events_path`; the run summary carries p50/p95/max/total
+    of each metric.
+
+    Returns a summary dict for status logging.
+    """
     scrape_cfg = config["scraping"]
     discovery_cfg = config["discovery"]
     output_cfg = config["output"]
 
-    public_dir = Path(output_cfg["public_dir"])
-    manifest_path = public_dir / "players_manifest.json"
-
     matchlogs_dir = Path(output_cfg["matchlogs_dir"])
     matchlogs_dir.mkdir(parents=True, exist_ok=True)
 
-    players = json.loads(manifest_path.read_text())
-    seasons = discovery_cfg.get("seasons")
+    seasons = discovery_seasons(discovery_cfg)
     file_format = output_cfg.get("file_format")
+    max_failures = scrape_cfg.get("max_job_failures", 3)
+    retry_pass_delay = scrape_cfg.get("retry_pass_delay_seconds", 60)
 
-    scraper = make_scraper(scrape_cfg)
+    players_by_id = {p["player_id"]: p for p in state.players()}
 
-    players_to_scrape = [p for p in players if is_stale(p)]
+    run_id, resumed = state.start_or_resume_run()
+    if resumed:
+        print(f"[{ts()}] Resuming run {run_id}")
 
-    try:
-        for player in players_to_scrape:
-            matchlogs_url = player["matchlogs_url"]
-            slug = player["player_slug"]
+    # On resume this only adds jobs that became stale since the run started
+    state.enqueue_jobs(
+        run_id,
+        select_jobs(players_by_id.values(), seasons, latest_fixture_dates),
+    )
 
-            for season in seasons:
-                url = matchlogs_url.format(season = season)
+    events = EventLog(output_cfg.get("events_path"))
+
+    def scrape_job(scraper, job):
+        player, season = job
+        url = player["matchlogs_url"].format(season = season)
+        t0 = time.perf_counter()
+
+        def emit(status, error=None):
+            events.emit(
+                run_id = run_id,
+                player_id = player["player_id"],
+                season = season,
+                url = url,
+                status = status,
+                error = error,
+                duration_s = round(time.perf_counter() - t0, 3),
+                **{k: round(v, 3) if isinstance(v, float) else v
+                   for k, v in scraper.last_stats.items()},
+            )
+
+        try:
+            print(f"[{ts()}] Scraping {url} ...")
+            table = scraper.scrape_player_matchlogs_data(url)
+
+            out_name = f"{player['player_slug']}_{season}.{file_format}"
+            out_path = matchlogs_dir / out_name
+            if write_matchlogs_if_changed(table, out_path, file_format):
+                print(f"[{ts()}] Saved -> {out_path}")
+            else:
+                print(f"[{ts()}] Unchanged -> {out_path}")
+
+        except Exception as e:
+            duration_s = round(time.perf_counter() - t0, 3)
+            status = state.record_failure(
+                player["player_id"], season, repr(e), duration_s, max_failures
+            )
+            print(f"[{ts()}] Failed {url} ({type(e).__name__}) -> {status}")
+            emit(status, repr(e))
+            return status
+
+        state.record_success(
+            player["player_id"],
+            season,
+            latest_match_date = latest_match_date(table),
+            frozen = is_season_closed(season),
+            duration_s = round(time.perf_counter() - t0, 3),
+        )
+        emit("done")
+        return "done"
+
+    # Retry queue: each pass re-runs whatever failed in the previous one,
+    # until every job is done or dead-lettered. Passes back off
+    # exponentially, so an outage isn't retried straight into dead-letters.
+    for retry_pass in itertools.count():
+        open_jobs = [
+            (players_by_id[player_id], season)
+            for player_id, season in state.open_jobs(run_id)
+            if player_id in players_by_id
+        ]
+        if not open_jobs:
+            break
+
+        if retry_pass:
+            sleep_s = retry_pass_delay * 2 ** (retry_pass - 1)
+            print(f"[{ts()}] Retry pass {retry_pass}: sleeping {sleep_s}s")
+            time.sleep(sleep_s)
+
+        print(f"[{ts()}] {len(open_jobs)} player-seasons to scrape (run {run_id})")
+        for _ in run_jobs(scrape_cfg, open_jobs, scrape_job):
+            pass
+
+    state.finish_run(run_id)
+
+    return {
+        "run_id": run_id,
+        "resumed": resumed,
+        "jobs": state.job_counts(run_id),
+        "page_timing": summarise_page_times(state, browser_mode(scrape_cfg), events.events),
+        "telemetry": summarise_events(events.events),
+        "dead_letter": state.dead_letter(),
+    }
+
+
+def cmd_replay_player_matchlogs_data(config, state):
+    """Rebuild matchlog files from the raw HTML cache, without network."""
+    scrape_cfg = config["scraping"]
+    discovery_cfg = config["discovery"]
+    output_cfg = config["output"]
 
-                print(f"[{ts()}] Scraping {url} ...")
-                df = scraper.scrape_player_matchlogs_data(url)
+    cache = make_cache(scrape_cfg)
+    if cache is None:
+        raise ValueError("Replay needs `scraping.cache_dir` to be set")
 
-                out_name = f"{slug}_{season}.{file_format}"
-                out_path = matchlogs_dir / out_name
-                df.to_csv(out_path, index=False)
-                print(f"[{ts()}] Saved -> {out_path}")
+    matchlogs_dir = Path(output_cfg["matchlogs_dir"])
+    matchlogs_dir.mkdir(parents=True, exist_ok=True)
 
-            player["last_scraped_date"] = ts()
-            write_manifest(manifest_path, players)
+    players = state.players()
+    seasons = discovery_seasons(discovery_cfg)
+    file_format = output_cfg.get("file_format")
 
-    finally:
-        scraper.close()
+    for player in players:
+        for season in player_seasons(player, seasons):
+            url = player["matchlogs_url"].format(season = season)
+
+            html = cache.read(url)
+            if html is None:
+                print(f"[{ts()}] Not cached, skipping {url}")
+                continue
+
+            table = parse_matchlogs_table(html)
+
+            out_path = matchlogs_dir / f"{player['player_slug']}_{season}.{file_format}"
+            if write_matchlogs_if_changed(table, out_path, file_format):
+                print(f"[{ts()}] Replayed -> {out_path}")
 
 
 def main():
     # Config
     parser = argparse.ArgumentParser()
     parser.add_argument("--config", default="config.yml")
+    parser.add_argument("--replay", action="store_true",
+                        help="Rebuild matchlog files from the HTML cache only.")
+    parser.add_argument("--retry-dead", action="store_true",
+                        help="Move dead-lettered jobs back into the retry queue.")
     args = parser.parse_args()
     config = load_config(args.config) # Scraping params
     public_dir = Path("public")
@@ -97,11 +527,28 @@ def main():
     started_utc = ts()
     t0 = time.perf_counter()
 
-    # Scrape players manifest
-    cmd_scrape_player_matchlogs_urls(config)
+    state = open_state(config)
+    manifest_path = Path(config["output"]["public_dir"]) / "players_manifest.json"
+    summary = {}
 
-    # Reads players manifest and scrape matchlogs
-    cmd_scrape_player_matchlogs_data(config)
+    try:
+        if args.retry_dead:
+            print(f"[{ts()}] Revived {state.revive_dead()} dead-lettered jobs")
+
+        if args.replay:
+            cmd_replay_player_matchlogs_data(config, state)
+        else:
+            # Scrape players into the state store
+            latest_fixture_dates = cmd_scrape_player_matchlogs_urls(config, state)
+
+            # Scrape matchlogs for stale player-seasons
+            summary = cmd_scrape_player_matchlogs_data(config, state, latest_fixture_dates)
+
+    finally:
+        # The manifest is an export of the state store, written once per run
+        state.export_manifest(manifest_path)
+        print(f"[{ts()}] Saved manifest -> {manifest_path}")
+        state.close()
 
     duration_s = round(time.perf_counter() - t0, 3)
     finished_utc = ts()
@@ -112,6 +559,7 @@ def main():
         started_utc = started_utc,
         finished_utc = finished_utc,
         duration_s = duration_s,
+        **summary,
     )
     update_status_json(public_dir / "status.json", status_patch)
 
@@ -0,0 +1,294 @@
+import time
+from urllib.parse import urljoin
+
+import lxml.etree
+import lxml.html
+import pyarrow as pa
+import requests
+from requests.adapters import HTTPAdapter
+
+from .cache import HTMLCache
+from .scraper import FBRefScraper, PLAYER_RE
+from .telemetry import new_fetch_stats
+from utils.logging import ts
+from utils.matchlogs_schema import matchlogs_table_from_records
+from utils.scraping import TokenBucket
+
+
+USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+)
+
+# Body rows FBRef inserts to repeat the header or separate months
+SKIP_ROW_CLASSES = {"thead", "over_header", "spacer", "partial_table"}
+
+
+def parse_html(html: str):
+    """
+    Parse an HTML document or fragment. lxml's ParserError on empty or
+    truncated responses becomes a RuntimeError, which scrapes retry.
+    """
+    try:
+        return lxml.html.fromstring(html)
+    except lxml.etree.ParserError as e:
+        raise RuntimeError(f"Unparseable HTML: {e}") from e
+
+
+def iter_fragments(html: str):
+    """
+    Yield the parsed page plus every HTML comment that contains a table.
+
+    FBRef ships many of its stats tables inside HTML comments and
+    un-comments them client-side, so a browser-free parser has to look
+    inside comments as well as the live document.
+    """
+    root = parse_html(html)
+    yield root
+
+    for comment in root.iter(lxml.etree.Comment):
+        text = comment.text or ""
+        if "<table" in text:
+            yield parse_html(text)
+
+
+def find_table(html: str, table_id: str):
+    """Return the <table> element with `table_id`, or None."""
+    for fragment in iter_fragments(html):
+        tables = fragment.xpath(f'//table[@id="{table_id}"]')
+        if tables:
+            return tables[0]
+    return None
+
+
+def cell_text(cell) -> str:
+    return cell.text_content().strip()
+
+
+def parse_matchlogs_records(html: str, table_id: str = "matchlogs_all") -> tuple[list[str], list[dict]]:
+    """
+    Extract (columns, records) from an FBRef matchlogs table in HTML.
+
+    The <thead> has two rows: stat-group labels spanning several columns,
+    then one cell per stat. Only the last row names real columns, so the
+    header is taken from it alone and body cells are matched to columns by
+    their `data-stat` attribute rather than by position.
+    """
+    table = find_table(html, table_id)
+    if table is None:
+        raise RuntimeError("Matchlogs table not found")
+
+    header_rows = table.xpath("./thead/tr")
+    if not header_rows:
+        raise RuntimeError("Matchlogs table has no header")
+
+    columns = [
+        th.get("data-stat") or cell_text(th)
+        for th in header_rows[-1].xpath("./th|./td")
+    ]
+
+    records = []
+    for tr in table.xpath("./tbody/tr"):
+        if SKIP_ROW_CLASSES & set((tr.get("class") or "").split()):
+            continue
+
+        record = {}
+        for cell in tr.xpath("./th|./td"):
+            stat = cell.get("data-stat")
+            text = cell_text(cell)
+            if stat in columns and text:
+                record[stat] = text
+
+        if record:
+            records.append(record)
+
+    return columns, records
+
+
+def parse_matchlogs_table(html: str, table_id: str = "matchlogs_all") -> pa.Table:
+    """Parse an FBRef matchlogs table into a typed, schema-checked Arrow table."""
+    columns, records = parse_matchlogs_records(html, table_id)
+    return matchlogs_table_from_records(records, columns)
+
+
+def parse_player_links(html: str) -> list[dict]:
+    """Return de-duplicated player records from a league keepers page."""
+    players_by_id: dict[str, dict] = {}
+
+    for fragment in iter_fragments(html):
+        for a in fragment.xpath('//td[@data-stat="player"]//a[@href]'):
+            path = a.get("href").replace("https://fbref.com", "")
+
+            match = PLAYER_RE.match(path)
+            if not match:
+                continue
+
+            player_id, player_slug = match.group(1), match.group(2)
+
+            players_by_id[player_id] = {
+                "player_id": player_id,
+                "player_slug": player_slug,
+                "player_url": urljoin("https://fbref.com", path),
+                "matchlogs_url": FBRefScraper.build_matchlogs_url(player_id, player_slug),
+            }
+
+    return list(players_by_id.values())
+
+
+def parse_latest_fixture_date(html: str) -> str | None:
+    """Return the date (YYYY-MM-DD) of the latest played fixture on a schedule page."""
+    latest = None
+
+    for fragment in iter_fragments(html):
+        for tr in fragment.xpath('//table[starts-with(@id, "sched")]/tbody/tr'):
+            score = tr.xpath('./*[@data-stat="score"]')
+            date = tr.xpath('./*[@data-stat="date"]')
+            if not score or not date or not cell_text(score[0]):
+                continue
+
+            d = cell_text(date[0])
+            if d and (latest is None or d > latest):
+                latest = d
+
+    return latest
+
+
+class FBRefHTTPScraper:
+    """
+    Browser-free drop-in for FBRefScraper.
+
+    Fetches pages over a pooled keep-alive HTTP session and parses tables
+    with lxml, exposing the same scrape methods as the Selenium scraper.
+    """
+
+    def __init__(self,
+                 wait_seconds: int = 5,
+                 retries: int = 5,
+                 success_delay_seconds: int = 2,
+                 rate_limiter: TokenBucket | None = None,
+                 pool_size: int = 1,
+                 cache: HTMLCache | None = None,
+                 ):
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, pool_size))
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"User-Agent": USER_AGENT})
+
+        self.wait_seconds = wait_seconds
+        self.retries = retries
+        self.success_delay_seconds = success_delay_seconds
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self.last_stats = new_fetch_stats()  # timings/sizes of the last scrape call
+
+
+    def close(self):
+        self.session.close()
+
+
+    def get(self, url: str) -> str:
+        """
+        Return page HTML, waiting for a token from the shared rate limiter.
+
+        With a cache, the request is conditional on the stored ETag /
+        Last-Modified and a 304 is answered from the cached body.
+        """
+        t0 = time.perf_counter()
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        self.last_stats["throttle_s"] += time.perf_counter() - t0
+
+        headers = self.cache.conditional_headers(url) if self.cache else {}
+        t0 = time.perf_counter()
+        response = self.session.get(url, headers=headers, timeout=self.wait_seconds)
+        self.last_stats["fetch_s"] += time.perf_counter() - t0
+        self.last_stats["bytes"] = len(response.content)
+
+        if response.status_code == 304 and self.cache:
+            html = self.cache.read(url)
+            if html is not None:
+                return html
+            # Blob went missing; fetch unconditionally
+            response = self.session.get(url, timeout=self.wait_seconds)
+
+        response.raise_for_status()
+
+        if self.cache:
+            self.cache.store(
+                url,
+                response.text,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
+
+        return response.text
+
+
+    def retry_delay(self, attempt: int, url: str, e: Exception) -> None:
+        """Sleep with exponential backoff, honouring Retry-After on 429s."""
+        sleep_s = 2 ** attempt
+
+        response = getattr(e, "response", None)
+        if response is not None and response.status_code == 429:
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                sleep_s = max(sleep_s, int(retry_after))
+
+        print(
+            f"[{ts()}] Retry {attempt+1}/{self.retries} scraping {url} "
+            f"({type(e).__name__}) – sleeping {sleep_s}s"
+        )
+        time.sleep(sleep_s)
+
+
+    def scrape_player_matchlogs_urls(self, base_url: str) -> list[dict]:
+
+        for attempt in range(self.retries):
+            try:
+                return parse_player_links(self.get(base_url))
+
+            except (requests.RequestException, RuntimeError) as e:
+                if attempt == self.retries - 1:
+                    raise
+                self.retry_delay(attempt, base_url, e)
+
+
+    def scrape_latest_fixture_date(self, fixtures_url: str) -> str | None:
+
+        for attempt in range(self.retries):
+            try:
+                return parse_latest_fixture_date(self.get(fixtures_url))
+
+            except (requests.RequestException, RuntimeError) as e:
+                if attempt == self.retries - 1:
+                    raise
+                self.retry_delay(attempt, fixtures_url, e)
+
+
+    def scrape_player_matchlogs_data(self, url: str) -> pa.Table:
+        stats = self.last_stats = new_fetch_stats()
+
+        for attempt in range(self.retries):
+            stats["retries"] = attempt
+            try:
+                html = self.get(url)
+
+                t0 = time.perf_counter()
+                table = parse_matchlogs_table(html)
+                stats["extract_s"] += time.perf_counter() - t0
+
+                if table.num_rows == 0:
+                    raise RuntimeError("Matchlogs table empty")
+
+                stats["rows"] = table.num_rows
+
+                time.sleep(self.success_delay_seconds)
+
+                return table
+
+            except (requests.RequestException, RuntimeError) as e:
+                if attempt == self.retries - 1:
+                    raise
+                self.retry_delay(attempt, url, e)
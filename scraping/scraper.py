@@ -1,10 +1,9 @@
 import re
 import time
-from io import StringIO
 from pathlib import Path
 from urllib.parse import urljoin
 
-import pandas as pd
+import pyarrow as pa
 import yaml
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
@@ -15,33 +14,69 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException
 
 from utils.logging import ts
+from utils.matchlogs_schema import matchlogs_table_from_records
+from utils.scraping import TokenBucket
+from .cache import HTMLCache
+from .telemetry import new_fetch_stats
 
 
-JS_EXTRACT_TABLE = """
+JS_EXTRACT_ROWS = """
 const table = document.getElementById("matchlogs_all");
-if (!table) return "NO_TABLE";
+if (!table) return null;
 
-const rows = [];
-const headerCells = table.querySelectorAll("thead tr th");
-const headers = Array.from(headerCells).map(th => th.dataset.stat || th.textContent.trim());
-rows.push(headers.join(","));
+// Two-row <thead>: only the last row names the real stat columns
+const headerRows = table.querySelectorAll("thead tr");
+const headerCells = headerRows[headerRows.length - 1].querySelectorAll("th, td");
+const columns = Array.from(headerCells).map(th => th.dataset.stat || th.textContent.trim());
 
+const records = [];
 table.querySelectorAll("tbody tr").forEach(tr => {
-  if (tr.classList.contains("thead") || tr.classList.contains("spacer")) return;
+  if (["thead", "over_header", "spacer", "partial_table"].some(c => tr.classList.contains(c))) return;
 
-  const cells = tr.querySelectorAll("th, td");
-  const values = Array.from(cells).map(td =>
-    (td.textContent || "").trim().replace(/,/g, "")
-  );
+  const record = {};
+  tr.querySelectorAll("th, td").forEach(cell => {
+    const stat = cell.dataset.stat;
+    const text = (cell.textContent || "").trim();
+    if (stat && columns.includes(stat) && text !== "") record[stat] = text;
+  });
 
-  if (values.some(v => v !== "")) {
-    rows.push(values.join(","));
-  }
+  if (Object.keys(record).length) records.push(record);
 });
 
-return rows.join("\\n");
+return {columns: columns, records: records};
 """
 
+JS_TABLE_HTML = """
+const table = document.getElementById("matchlogs_all");
+return table ? table.outerHTML : null;
+"""
+
+JS_RESPONSE_BYTES = """
+const nav = performance.getEntriesByType("navigation")[0];
+return nav ? (nav.encodedBodySize || nav.transferSize || null) : null;
+"""
+
+JS_LATEST_FIXTURE_DATE = """
+let latest = null;
+document.querySelectorAll('table[id^="sched"] tbody tr').forEach(tr => {
+  const score = tr.querySelector('[data-stat="score"]');
+  const date = tr.querySelector('[data-stat="date"]');
+  if (!score || !date || !score.textContent.trim()) return;
+
+  const d = date.textContent.trim();
+  if (d && (latest === null || d > latest)) latest = d;
+});
+return latest;
+"""
+
+# URL patterns blocked through Chrome DevTools for each "lean" resource type
+RESOURCE_TYPE_PATTERNS = {
+    "image": ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico"],
+    "font": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"],
+    "media": ["*.mp4", "*.webm", "*.mp3", "*.m3u8"],
+    "stylesheet": ["*.css"],
+}
+
 # Matches: /en/players/<player_id>/<player_slug>
 PLAYER_RE = re.compile(r"^/en/players/([^/]+)/([^/]+)$")
 
@@ -53,6 +88,9 @@ class FBRefScraper:
                  retries: int = 5,
                  success_delay_seconds: int = 2,
                  chromedriver_path: str | None = None,
+                 rate_limiter: TokenBucket | None = None,
+                 cache: HTMLCache | None = None,
+                 lean: dict | None = None,
                  ):
 
         options = Options()
@@ -60,6 +98,22 @@ class FBRefScraper:
         if headless:
             options.add_argument("--headless=new")
 
+        # Lean mode: return once the DOM is ready, reuse a warm profile and
+        # skip non-essential resources (see `block_resources`)
+        self.lean = bool(lean and lean.get("enabled"))
+        if self.lean:
+            options.page_load_strategy = "eager"
+
+            if lean.get("profile_dir"):
+                profile_dir = Path(lean["profile_dir"]).resolve()
+                profile_dir.mkdir(parents=True, exist_ok=True)
+                options.add_argument(f"--user-data-dir={profile_dir}")
+
+            if "image" in lean.get("blocked_resource_types", []):
+                options.add_experimental_option(
+                    "prefs", {"profile.managed_default_content_settings.images": 2}
+                )
+
         # Use explicit path if provided, otherwise let Selenium resolve from PATH
         service = Service(chromedriver_path) if chromedriver_path else Service()
 
@@ -67,15 +121,52 @@ class FBRefScraper:
             service=service,
             options=options
         )
+
+        if self.lean:
+            self.block_resources(
+                lean.get("blocked_resource_types", []),
+                lean.get("blocked_domains", []),
+            )
+
         self.wait_seconds = wait_seconds
         self.retries = retries
         self.success_delay_seconds = success_delay_seconds
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self.last_stats = new_fetch_stats()  # timings/sizes of the last scrape call
 
     
     def close(self):
         self.driver.quit()
 
 
+    def block_resources(self, resource_types: list[str], domains: list[str]) -> None:
+        """Block resource types and third-party domains via Chrome DevTools."""
+        patterns = [
+            pattern
+            for resource_type in resource_types
+            for pattern in RESOURCE_TYPE_PATTERNS.get(resource_type, [])
+        ]
+        patterns += [f"*{domain}*" for domain in domains]
+
+        if patterns:
+            self.driver.execute_cdp_cmd("Network.enable", {})
+            self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+
+
+    def get(self, url: str) -> None:
+        """Load a page, waiting for a token from the shared rate limiter."""
+        t0 = time.perf_counter()
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+
+        t1 = time.perf_counter()
+        self.driver.get(url)
+
+        self.last_stats["throttle_s"] += t1 - t0
+        self.last_stats["fetch_s"] += time.perf_counter() - t1
+
+
     @staticmethod
     def build_matchlogs_url(player_id: str, player_slug: str) -> str:
         return (
@@ -86,7 +177,7 @@ class FBRefScraper:
 
     def scrape_player_matchlogs_urls(self, base_url: str) -> list[dict]:
 
-        self.driver.get(base_url)
+        self.get(base_url)
         time.sleep(self.wait_seconds)
 
         els = self.driver.find_elements(
@@ -116,29 +207,52 @@ class FBRefScraper:
         return list(players_by_id.values())
     
 
-    def scrape_player_matchlogs_data(self, url: str) -> pd.DataFrame:
+    def scrape_latest_fixture_date(self, fixtures_url: str) -> str | None:
+        """Return the date (YYYY-MM-DD) of the latest played league fixture."""
+        self.get(fixtures_url)
+        time.sleep(self.wait_seconds)
+        return self.driver.execute_script(JS_LATEST_FIXTURE_DATE)
+
+
+    def scrape_player_matchlogs_data(self, url: str) -> pa.Table:
+        stats = self.last_stats = new_fetch_stats()
 
         for attempt in range(self.retries):
+            stats["retries"] = attempt
             try:
-                self.driver.get(url)
+                self.get(url)
 
+                t0 = time.perf_counter()
                 targ_elt = "matchlogs_all"
                 wait = WebDriverWait(self.driver, self.wait_seconds)
                 wait.until(EC.presence_of_element_located((By.ID, targ_elt)))
+                stats["wait_s"] += time.perf_counter() - t0
 
-                csv_text = self.driver.execute_script(JS_EXTRACT_TABLE)
+                t0 = time.perf_counter()
+                extracted = self.driver.execute_script(JS_EXTRACT_ROWS)
 
-                if not csv_text or str(csv_text).startswith("NO_TABLE"):
+                if not extracted:
                     raise RuntimeError("Matchlogs table not found")
 
-                df = pd.read_csv(StringIO(csv_text))
+                table = matchlogs_table_from_records(
+                    extracted["records"], extracted["columns"]
+                )
 
-                if df.empty:
+                stats["extract_s"] += time.perf_counter() - t0
+
+                if table.num_rows == 0:
                     raise RuntimeError("Matchlogs table empty")
 
+                stats["rows"] = table.num_rows
+                stats["bytes"] = self.driver.execute_script(JS_RESPONSE_BYTES)
+
+                # Keep the rendered table so CSVs can be rebuilt offline
+                if self.cache is not None:
+                    self.cache.store(url, self.driver.execute_script(JS_TABLE_HTML))
+
                 time.sleep(self.success_delay_seconds)
 
-                return df
+                return table
 
             except (TimeoutException, WebDriverException, RuntimeError) as e:
                 if attempt == self.retries - 1:
@@ -0,0 +1,372 @@
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+
+from utils.logging import ts
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS players (
+    player_id       TEXT PRIMARY KEY,
+    player_slug     TEXT NOT NULL,
+    player_url      TEXT,
+    matchlogs_url   TEXT NOT NULL,
+    discovered_utc  TEXT
+);
+
+CREATE TABLE IF NOT EXISTS player_seasons (
+    player_id           TEXT NOT NULL REFERENCES players (player_id),
+    season              TEXT NOT NULL,
+    status              TEXT NOT NULL,
+    attempts            INTEGER NOT NULL DEFAULT 0,
+    last_error          TEXT,
+    last_scraped_date   TEXT,
+    latest_match_date   TEXT,
+    frozen              INTEGER NOT NULL DEFAULT 0,
+    duration_s          REAL,
+    updated_utc         TEXT,
+    PRIMARY KEY (player_id, season)
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key     TEXT PRIMARY KEY,
+    value   TEXT
+);
+
+CREATE TABLE IF NOT EXISTS runs (
+    run_id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_utc     TEXT NOT NULL,
+    finished_utc    TEXT
+);
+"""
+
+# Columns added after the first release of the store: (table, column, DDL)
+MIGRATIONS = [
+    ("player_seasons", "run_id", "INTEGER"),
+    ("player_seasons", "consecutive_failures", "INTEGER NOT NULL DEFAULT 0"),
+    ("players", "competitions", "TEXT"),
+]
+
+
+def merge_competitions(*memberships: dict | None) -> dict:
+    """Union {competition: [seasons]} membership maps."""
+    merged = {}
+    for membership in memberships:
+        for name, seasons in (membership or {}).items():
+            merged[name] = sorted(set(merged.get(name, [])) | set(seasons))
+    return dict(sorted(merged.items()))
+
+
+class ScrapeState:
+    """
+    Transactional scrape state held in SQLite.
+
+    Holds discovered players and the fetch status of every (player, season)
+    pair. Each update touches a single row inside its own transaction, so a
+    crash can never leave the state half-written. `players_manifest.json`
+    is exported from here at the end of a run.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.con = sqlite3.connect(self.path, check_same_thread=False)
+        self.con.row_factory = sqlite3.Row
+        self.lock = threading.Lock()
+
+        with self.lock, self.con:
+            self.con.execute("PRAGMA journal_mode = WAL")
+            self.con.executescript(SCHEMA)
+
+            for table, column, ddl in MIGRATIONS:
+                existing = {r["name"] for r in self.con.execute(f"PRAGMA table_info({table})")}
+                if column not in existing:
+                    self.con.execute(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}")
+
+
+    def close(self):
+        self.con.close()
+
+
+    def is_empty(self) -> bool:
+        with self.lock:
+            return self.con.execute("SELECT COUNT(*) FROM players").fetchone()[0] == 0
+
+
+    def upsert_players(self, players: list[dict]) -> None:
+        """
+        Insert newly discovered players and refresh URLs of known ones.
+
+        A player's `competitions` ({competition: [seasons]}) is merged into
+        what is already stored, so a keeper who changes league keeps the
+        memberships of earlier seasons.
+        """
+        with self.lock, self.con:
+            for p in players:
+                row = self.con.execute(
+                    "SELECT competitions FROM players WHERE player_id = ?", (p["player_id"],)
+                ).fetchone()
+                stored = json.loads(row["competitions"]) if row and row["competitions"] else None
+                competitions = merge_competitions(stored, p.get("competitions"))
+
+                self.con.execute(
+                    """
+                    INSERT INTO players (player_id, player_slug, player_url, matchlogs_url,
+                        discovered_utc, competitions)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (player_id) DO UPDATE SET
+                        player_slug = excluded.player_slug,
+                        player_url = excluded.player_url,
+                        matchlogs_url = excluded.matchlogs_url,
+                        competitions = excluded.competitions
+                    """,
+                    (p["player_id"], p["player_slug"], p.get("player_url"), p["matchlogs_url"],
+                     ts(), json.dumps(competitions) if competitions else None),
+                )
+
+
+    def record_success(self, player_id: str, season: str, latest_match_date: str | None,
+                       frozen: bool, duration_s: float) -> None:
+        now = ts()
+        with self.lock, self.con:
+            self.con.execute(
+                """
+                INSERT INTO player_seasons (player_id, season, status, attempts, last_error,
+                    last_scraped_date, latest_match_date, frozen, duration_s, updated_utc)
+                VALUES (?, ?, 'done', 1, NULL, ?, ?, ?, ?, ?)
+                ON CONFLICT (player_id, season) DO UPDATE SET
+                    status = 'done',
+                    attempts = attempts + 1,
+                    consecutive_failures = 0,
+                    last_error = NULL,
+                    last_scraped_date = excluded.last_scraped_date,
+                    latest_match_date = excluded.latest_match_date,
+                    frozen = excluded.frozen,
+                    duration_s = excluded.duration_s,
+                    updated_utc = excluded.updated_utc
+                """,
+                (player_id, season, now, latest_match_date, int(frozen), duration_s, now),
+            )
+
+
+    def record_failure(self, player_id: str, season: str, error: str,
+                       duration_s: float, max_failures: int) -> str:
+        """
+        Record a failed attempt. After `max_failures` consecutive failures
+        the job moves to the dead-letter list (status 'dead'). Returns the
+        job's new status.
+        """
+        now = ts()
+        with self.lock, self.con:
+            self.con.execute(
+                """
+                INSERT INTO player_seasons (player_id, season, status, attempts,
+                    consecutive_failures, last_error, duration_s, updated_utc)
+                VALUES (?, ?, 'failed', 1, 1, ?, ?, ?)
+                ON CONFLICT (player_id, season) DO UPDATE SET
+                    status = 'failed',
+                    attempts = attempts + 1,
+                    consecutive_failures = consecutive_failures + 1,
+                    last_error = excluded.last_error,
+                    duration_s = excluded.duration_s,
+                    updated_utc = excluded.updated_utc
+                """,
+                (player_id, season, error, duration_s, now),
+            )
+            self.con.execute(
+                """
+                UPDATE player_seasons SET status = 'dead'
+                WHERE player_id = ? AND season = ? AND consecutive_failures >= ?
+                """,
+                (player_id, season, max_failures),
+            )
+            return self.con.execute(
+                "SELECT status FROM player_seasons WHERE player_id = ? AND season = ?",
+                (player_id, season),
+            ).fetchone()["status"]
+
+
+    def start_or_resume_run(self) -> tuple[int, bool]:
+        """
+        Return (run_id, resumed). An unfinished run is resumed so its
+        checkpointed jobs are picked up where they stopped.
+        """
+        with self.lock, self.con:
+            row = self.con.execute(
+                "SELECT run_id FROM runs WHERE finished_utc IS NULL "
+                "ORDER BY run_id DESC LIMIT 1"
+            ).fetchone()
+            if row is not None:
+                return row["run_id"], True
+
+            cursor = self.con.execute("INSERT INTO runs (started_utc) VALUES (?)", (ts(),))
+            return cursor.lastrowid, False
+
+
+    def finish_run(self, run_id: int) -> None:
+        with self.lock, self.con:
+            self.con.execute(
+                "UPDATE runs SET finished_utc = ? WHERE run_id = ?", (ts(), run_id)
+            )
+
+
+    def enqueue_jobs(self, run_id: int, jobs: list[tuple[str, str]]) -> None:
+        """
+        Checkpoint the (player_id, season) jobs of a run as pending, with
+        their failure count reset: dead-lettering counts failures within
+        one run. Jobs already in the run (e.g. when it is resumed) are left
+        as they are.
+        """
+        with self.lock, self.con:
+            self.con.executemany(
+                """
+                INSERT INTO player_seasons (player_id, season, status, run_id, updated_utc)
+                VALUES (?, ?, 'pending', ?, ?)
+                ON CONFLICT (player_id, season) DO UPDATE SET
+                    status = 'pending',
+                    consecutive_failures = 0,
+                    run_id = excluded.run_id,
+                    updated_utc = excluded.updated_utc
+                WHERE run_id IS NOT excluded.run_id
+                """,
+                [(player_id, season, run_id, ts()) for player_id, season in jobs],
+            )
+
+
+    def open_jobs(self, run_id: int) -> list[tuple[str, str]]:
+        """Return the run's jobs still to do: pending ones and retryable failures."""
+        with self.lock:
+            rows = self.con.execute(
+                """
+                SELECT player_id, season FROM player_seasons
+                WHERE run_id = ? AND status IN ('pending', 'failed')
+                ORDER BY player_id, season
+                """,
+                (run_id,),
+            ).fetchall()
+        return [(r["player_id"], r["season"]) for r in rows]
+
+
+    def job_counts(self, run_id: int) -> dict:
+        with self.lock:
+            rows = self.con.execute(
+                "SELECT status, COUNT(*) AS n FROM player_seasons WHERE run_id = ? GROUP BY status",
+                (run_id,),
+            ).fetchall()
+        return {r["status"]: r["n"] for r in rows}
+
+
+    def dead_letter(self) -> list[dict]:
+        """Return every job currently in the dead-letter list."""
+        with self.lock:
+            rows = self.con.execute(
+                """
+                SELECT s.player_id, p.player_slug, s.season, s.attempts,
+                       s.consecutive_failures, s.last_error, s.updated_utc
+                FROM player_seasons s
+                JOIN players p USING (player_id)
+                WHERE s.status = 'dead'
+                ORDER BY s.player_id, s.season
+                """
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+
+    def revive_dead(self) -> int:
+        """Move dead-lettered jobs back to the retry queue. Returns the count."""
+        with self.lock, self.con:
+            return self.con.execute(
+                """
+                UPDATE player_seasons SET status = 'failed', consecutive_failures = 0
+                WHERE status = 'dead'
+                """
+            ).rowcount
+
+
+    def players(self) -> list[dict]:
+        """
+        Return players in manifest shape: one dict per player, with the
+        competitions it was discovered in, a `seasons` map of per-season
+        state and the player's most recent `last_scraped_date`.
+        """
+        with self.lock:
+            player_rows = self.con.execute(
+                "SELECT player_id, player_slug, player_url, matchlogs_url, competitions "
+                "FROM players ORDER BY player_id"
+            ).fetchall()
+            season_rows = self.con.execute(
+                "SELECT * FROM player_seasons ORDER BY player_id, season"
+            ).fetchall()
+
+        players = {
+            row["player_id"]: {
+                **dict(row),
+                "competitions": json.loads(row["competitions"] or "{}"),
+                "seasons": {},
+            }
+            for row in player_rows
+        }
+
+        for row in season_rows:
+            player = players.get(row["player_id"])
+            if player is None:
+                continue
+
+            item = dict(row)
+            for key in ("player_id", "run_id"):
+                item.pop(key)
+            season = item.pop("season")
+            item["frozen"] = bool(item["frozen"])
+            player["seasons"][season] = item
+
+            if item["last_scraped_date"]:
+                player["last_scraped_date"] = max(
+                    player.get("last_scraped_date") or "", item["last_scraped_date"]
+                )
+
+        return list(players.values())
+
+
+    def import_manifest(self, manifest_path: Path) -> None:
+        """Seed an empty store from a legacy `players_manifest.json`."""
+        players = json.loads(manifest_path.read_text())
+        self.upsert_players(players)
+
+        with self.lock, self.con:
+            for player in players:
+                for season, item in (player.get("seasons") or {}).items():
+                    self.con.execute(
+                        """
+                        INSERT OR IGNORE INTO player_seasons (player_id, season, status,
+                            last_scraped_date, latest_match_date, frozen, updated_utc)
+                        VALUES (?, ?, 'done', ?, ?, ?, ?)
+                        """,
+                        (player["player_id"], season, item.get("last_scraped_date"),
+                         item.get("latest_match_date"), int(bool(item.get("frozen"))), ts()),
+                    )
+
+
+    def get_meta(self, key: str) -> str | None:
+        with self.lock:
+            row = self.con.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else None
+
+
+    def set_meta(self, key: str, value: str) -> None:
+        with self.lock, self.con:
+            self.con.execute(
+                "INSERT INTO meta (key, value) VALUES (?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+                (key, value),
+            )
+
+
+    def export_manifest(self, manifest_path: Path) -> None:
+        """Write `players_manifest.json` atomically from the current state."""
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = manifest_path.with_name(f".{manifest_path.name}.tmp")
+        tmp_path.write_text(json.dumps(self.players(), indent=2))
+        os.replace(tmp_path, manifest_path)
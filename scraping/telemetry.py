@@ -0,0 +1,79 @@
+import json
+import math
+import threading
+from pathlib import Path
+
+from utils.logging import ts
+
+
+# Per-job numeric metrics aggregated into status.json
+METRICS = [
+    "duration_s",   # whole job, including retries and success delay
+    "throttle_s",   # blocked on the shared rate limiter
+    "fetch_s",      # page request / navigation
+    "wait_s",       # waiting for the matchlogs table to render
+    "extract_s",    # extracting and typing the table
+    "retries",
+    "bytes",
+    "rows",
+]
+
+
+def new_fetch_stats() -> dict:
+    """Return zeroed counters a scraper fills in for one scrape call."""
+    return {
+        "throttle_s": 0.0,
+        "fetch_s": 0.0,
+        "wait_s": 0.0,
+        "extract_s": 0.0,
+        "retries": 0,
+        "bytes": None,
+        "rows": None,
+    }
+
+
+class EventLog:
+    """Thread-safe JSONL event stream, one line per scrape job."""
+
+    def __init__(self, path: str | Path | None):
+        self.path = Path(path) if path else None
+        self.lock = threading.Lock()
+        self.events = []
+
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+
+
+    def emit(self, **event) -> None:
+        event = {"ts": ts(), **event}
+
+        with self.lock:
+            self.events.append(event)
+            if self.path is not None:
+                with open(self.path, "a") as f:
+                    f.write(json.dumps(event) + "\n")
+
+
+def percentile(sorted_values: list, q: float):
+    """Nearest-rank percentile of an already sorted list."""
+    rank = math.ceil(q * len(sorted_values))
+    return sorted_values[max(0, rank - 1)]
+
+
+def summarise_events(events: list[dict]) -> dict:
+    """Return {metric: {p50, p95, max, total}} over the given job events."""
+    summary = {}
+
+    for metric in METRICS:
+        values = sorted(e[metric] for e in events if e.get(metric) is not None)
+        if not values:
+            continue
+
+        summary[metric] = {
+            "p50": round(percentile(values, 0.50), 3),
+            "p95": round(percentile(values, 0.95), 3),
+            "max": round(values[-1], 3),
+            "total": round(sum(values), 3),
+        }
+
+    return summary
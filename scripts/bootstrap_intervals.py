@@ -0,0 +1,256 @@
+import argparse
+import os
+import time
+import warnings
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import duckdb
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+from utils.logging import ts, update_status_json, make_status_patch
+from utils.duckdb_io import load_df_as_table, get_rows_from_table
+
+
+KEYS = ["goalkeeper", "season", "competition"]
+
+# Match-level columns the fct_goalkeeper_performance metrics are built from
+MATCH_COLUMNS = [
+    "minutes_played",
+    "gk_clean_sheets",
+    "gk_goals_against",
+    "gk_saves",
+    "gk_shots_on_target_against",
+    "gk_psxg",
+    "gk_crosses",
+    "gk_crosses_stopped",
+    "gk_passes",
+    "gk_passes_launched",
+    "gk_passes_completed_launched",
+    "gk_def_actions_outside_pen_area",
+    "gk_avg_distance_def_actions",
+]
+
+SAMPLES = 1000
+CONFIDENCE = 0.95
+SEED = 42
+
+INTERVALS_TABLE = "fct_goalkeeper_performance_intervals"
+
+
+def sample_metrics(columns: dict, idx: np.ndarray) -> dict:
+    """
+    Compute every fct_goalkeeper_performance metric for each bootstrap
+    sample of matches. `columns` maps MATCH_COLUMNS to 1-d arrays (NaN for
+    nulls) and `idx` is (samples x matches) row indices. Sums skip nulls
+    and a sum over only nulls is null, as in SQL.
+    """
+    def total(col):
+        values = columns[col][idx]
+        valid = ~np.isnan(values)
+        return np.where(valid.any(axis=1), np.where(valid, values, 0.0).sum(axis=1), np.nan)
+
+    def ratio(num, den):
+        return num / np.where(den == 0, np.nan, den)
+
+    minutes = total("minutes_played")
+    def_actions = total("gk_def_actions_outside_pen_area")
+    columns = {
+        **columns,
+        "def_distance": columns["gk_def_actions_outside_pen_area"] * columns["gk_avg_distance_def_actions"],
+    }
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return {
+            "clean_sheets": total("gk_clean_sheets"),
+            "ga": total("gk_goals_against"),
+            "saves": total("gk_saves"),
+            "shots_on_target_against": total("gk_shots_on_target_against"),
+            "save_pct": ratio(total("gk_saves"), total("gk_shots_on_target_against")) * 100,
+            "psxg_minus_ga": total("gk_psxg") - total("gk_goals_against"),
+            "crosses_faced_p90": ratio(total("gk_crosses"), minutes) * 90,
+            "crosses_stopped_pct": ratio(total("gk_crosses_stopped"), total("gk_crosses")) * 100,
+            "pass_att_p90": ratio(total("gk_passes"), minutes) * 90,
+            "long_kick_pass_completion_pct": ratio(
+                total("gk_passes_completed_launched"), total("gk_passes_launched")
+            ) * 100,
+            "def_actions_outside_pen_area_p90": ratio(def_actions, minutes) * 90,
+            "avg_distance_def_actions": ratio(total("def_distance"), def_actions),
+        }
+
+
+def keeper_seed(key: tuple) -> list[int]:
+    """Stable per-keeper seed, so results don't depend on worker scheduling."""
+    return [SEED, zlib.crc32("|".join(key).encode())]
+
+
+def bootstrap_keeper(item) -> dict:
+    """
+    Percentile bootstrap intervals for one (goalkeeper, season, competition):
+    resample its matches with replacement SAMPLES times, all at once.
+    """
+    key, columns = item
+    n = len(columns["minutes_played"])
+
+    rng = np.random.default_rng(keeper_seed(key))
+    idx = rng.integers(0, n, size=(SAMPLES, n))
+
+    alpha = (1 - CONFIDENCE) / 2
+    row = dict(zip(KEYS, key), matches_played=n)
+    with warnings.catch_warnings():
+        # A metric null in every sample (e.g. no crosses faced) has no interval
+        warnings.simplefilter("ignore", RuntimeWarning)
+        for metric, samples in sample_metrics(columns, idx).items():
+            low, high = np.nanquantile(samples, [alpha, 1 - alpha])
+            row[f"{metric}_ci_low"] = round(float(low), 3)
+            row[f"{metric}_ci_high"] = round(float(high), 3)
+
+    return row
+
+
+def iter_keepers(matches: pd.DataFrame):
+    """Yield (key, {column: array}) per goalkeeper, season and competition."""
+    values = matches[MATCH_COLUMNS].to_numpy(dtype=float, na_value=np.nan)
+    for key, rows in matches.groupby(KEYS, sort=True).indices.items():
+        yield key, {col: values[rows, i] for i, col in enumerate(MATCH_COLUMNS)}
+
+
+def bootstrap_intervals(matches: pd.DataFrame, workers: int = 0) -> pd.DataFrame:
+    """
+    Bootstrap confidence intervals for each keeper's fct metrics from
+    match-level rows, across `workers` processes if > 0.
+    """
+    keepers = iter_keepers(matches)
+
+    if workers:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            rows = list(pool.map(bootstrap_keeper, keepers, chunksize=32))
+    else:
+        rows = [bootstrap_keeper(k) for k in keepers]
+
+    return pd.DataFrame(rows)
+
+
+def synthetic_matches(seasons: int = 10, leagues: int = 5, keepers: int = 25,
+                      matches: int = 38, seed: int = SEED) -> pd.DataFrame:
+    """Random match-level rows shaped like stg_matchlogs__parsed, for benchmarks."""
+    rng = np.random.default_rng(seed)
+    n = seasons * leagues * keepers * matches
+
+    df = pd.DataFrame({
+        "goalkeeper": np.repeat([f"keeper_{i}" for i in range(keepers)], matches).tolist() * seasons * leagues,
+        "season": np.repeat([f"{2016 + s}_{2017 + s}" for s in range(seasons)], leagues * keepers * matches),
+        "competition": np.tile(np.repeat([f"league_{l}" for l in range(leagues)], keepers * matches), seasons),
+    })
+    sota = rng.poisson(4, n)
+    crosses = rng.poisson(10, n)
+    launched = rng.poisson(12, n)
+    def_actions = rng.poisson(1, n)
+    df["minutes_played"] = 90
+    df["gk_goals_against"] = rng.binomial(sota, 0.3)
+    df["gk_clean_sheets"] = (df["gk_goals_against"] == 0).astype(int)
+    df["gk_saves"] = sota - df["gk_goals_against"]
+    df["gk_shots_on_target_against"] = sota
+    df["gk_psxg"] = rng.gamma(2, 0.6, n).round(1)
+    df["gk_crosses"] = crosses
+    df["gk_crosses_stopped"] = rng.binomial(crosses, 0.08)
+    df["gk_passes"] = rng.poisson(30, n)
+    df["gk_passes_launched"] = launched
+    df["gk_passes_completed_launched"] = rng.binomial(launched, 0.4)
+    df["gk_def_actions_outside_pen_area"] = def_actions
+    df["gk_avg_distance_def_actions"] = np.where(def_actions > 0, rng.normal(16, 3, n).round(1), np.nan)
+    return df
+
+
+def benchmark_bootstrap(worker_counts):
+    """
+    Time a 10 seasons x 5 leagues run for each worker count. Returns
+    [{workers, keepers, matches, seconds, keepers_per_s}].
+    """
+    matches = synthetic_matches()
+    n_keepers = matches.groupby(KEYS).ngroups
+
+    results = []
+    for workers in worker_counts:
+        t0 = time.perf_counter()
+        bootstrap_intervals(matches, workers)
+        seconds = time.perf_counter() - t0
+
+        results.append({
+            "workers": workers,
+            "keepers": n_keepers,
+            "matches": len(matches),
+            "seconds": round(seconds, 3),
+            "keepers_per_s": round(n_keepers / seconds, 1),
+        })
+        print(
+            f"[{ts()}] Benchmark workers={workers}: {n_keepers} keepers, "
+            f"{len(matches)} matches in {results[-1]['seconds']}s"
+        )
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int,
+                        default=int(os.environ.get("BOOTSTRAP_WORKERS", os.cpu_count() or 0)),
+                        help="Resampling processes; 0 runs in-process.")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="Time a synthetic 10 seasons x 5 leagues run per worker count, then exit.")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        cpus = os.cpu_count() or 1
+        benchmark_bootstrap([0] + [n for n in (1, 2, 4, 8, 16, 32) if n <= cpus])
+        return
+
+    # Config
+    db_path = REPO_ROOT / "dbt_project" / "dev.duckdb"
+    public_dir = REPO_ROOT / "public"
+
+    # Duration tracking
+    started_utc = ts()
+    t0 = time.perf_counter()
+
+    with duckdb.connect(db_path) as con:
+        # Same rows fct_goalkeeper_performance aggregates
+        matches = con.execute(
+            f"SELECT {', '.join(KEYS + MATCH_COLUMNS)} FROM stg_matchlogs__parsed "
+            f"WHERE minutes_played > 0"
+        ).df()
+
+        print(f"[{ts()}] Bootstrapping {len(matches)} matches with {args.workers} workers...")
+        intervals = bootstrap_intervals(matches, args.workers)
+
+        con.register("intervals", intervals)
+        load_df_as_table(con, "intervals", INTERVALS_TABLE)
+        con.unregister("intervals")
+        tables = {INTERVALS_TABLE: f"{get_rows_from_table(con, INTERVALS_TABLE)} rows"}
+
+    duration_s = round(time.perf_counter() - t0, 3)
+    finished_utc = ts()
+
+    status_patch = make_status_patch(
+        step_name = "bootstrap_intervals.py",
+        info = "Bootstrap confidence intervals for goalkeeper metrics.",
+        started_utc = started_utc,
+        finished_utc = finished_utc,
+        duration_s = duration_s,
+        tables = tables,
+        bootstrap = {
+            "samples": SAMPLES,
+            "confidence": CONFIDENCE,
+            "seed": SEED,
+            "workers": args.workers,
+        },
+    )
+    update_status_json(public_dir / "status.json", status_patch)
+
+
+if __name__ == "__main__":
+    main()
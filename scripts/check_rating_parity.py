@@ -0,0 +1,56 @@
+import time
+from pathlib import Path
+import duckdb
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+from utils.logging import ts, update_status_json, make_status_patch
+from app.data.ratings import rate_goalkeepers, compare_ratings
+
+
+def main():
+    # Config
+    db_path = REPO_ROOT / "dbt_project" / "dev.duckdb"
+    public_dir = REPO_ROOT / "public"
+
+    # Duration tracking
+    started_utc = ts()
+    t0 = time.perf_counter()
+
+    # The app's rating engine, with default weights and threshold, must
+    # reproduce the dbt mart it stands in for
+    with duckdb.connect(db_path, read_only=True) as con:
+        fct = con.execute("SELECT * FROM fct_goalkeeper_performance").df()
+        mart = con.execute("SELECT * FROM mart_goalkeeper_league_ratings").df()
+
+    t1 = time.perf_counter()
+    ratings = rate_goalkeepers(fct)
+    engine_ms = round((time.perf_counter() - t1) * 1000, 3)
+
+    problems = compare_ratings(mart, ratings)
+    for problem in problems:
+        print(f"[{ts()}] Rating mismatch: {problem}")
+
+    duration_s = round(time.perf_counter() - t0, 3)
+    finished_utc = ts()
+
+    status_patch = make_status_patch(
+        step_name = "check_rating_parity.py",
+        info = "Check the in-app rating engine reproduces mart_goalkeeper_league_ratings.",
+        started_utc = started_utc,
+        finished_utc = finished_utc,
+        duration_s = duration_s,
+        rows = len(mart),
+        engine_ms = engine_ms,
+        mismatches = len(problems),
+    )
+    update_status_json(public_dir / "status.json", status_patch)
+
+    if problems:
+        raise RuntimeError(f"{len(problems)} rating mismatches between app engine and dbt mart")
+
+    print(f"[{ts()}] Rating engine matches dbt mart ({len(mart)} rows, {engine_ms} ms)")
+
+
+if __name__ == "__main__":
+    main()
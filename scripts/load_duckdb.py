@@ -1,21 +1,40 @@
+import argparse
+import json
+import os
+import shutil
 import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 import duckdb
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 
 from utils.logging import ts, update_status_json, make_status_patch
-from utils.duckdb_io import load_df_as_table, get_rows_from_table
+from utils.duckdb_io import get_rows_from_table, duckdb_type
+from utils.manifest import sha256_file
+from utils.matchlogs_schema import MATCHLOGS_COLUMNS, MATCHLOGS_SCHEMA, conform_matchlogs_table
 
 
 def build_csv_manifest(data_raw_dir, datasets):
-    """Return {dataset: [csv_paths...]}"""
-    return {
-        dataset: sorted((data_raw_dir / dataset).glob("*.csv"))
-        for dataset in datasets
-    }
+    """
+    Return {dataset: [file_paths...]} covering Parquet and CSV files.
+    Where both exist for the same stem, the typed Parquet file wins.
+    """
+    manifest = {}
+    for dataset in datasets:
+        parquet_files = sorted((data_raw_dir / dataset).glob("*.parquet"))
+        parquet_stems = {p.stem for p in parquet_files}
+        csv_files = [
+            p for p in sorted((data_raw_dir / dataset).glob("*.csv"))
+            if p.stem not in parquet_stems
+        ]
+        manifest[dataset] = sorted(parquet_files + csv_files)
+    return manifest
 
 
 def clean_matchlogs_df(df):
@@ -32,58 +51,501 @@ def clean_matchlogs_df(df):
 
     This function shifts the column names back by 9, then drops the
     resulting trailing None columns which have no corresponding data.
+    Files from the HTTP backend already have correct headers and are
+    returned unchanged.
     """
+    if df.columns[0] == "date":
+        return df
+
     df.columns = df.columns[9:].tolist() + [None] * 9
     return df.loc[:, df.columns.notna()]
 
 
-def load_csvs_to_duckdb(con, schema, tables_manifest):
+def is_legacy_matchlogs_csv(path):
+    """Return True for CSVs written with the shifted two-row header."""
+    with open(path) as f:
+        return not f.readline().lstrip('"').startswith("date")
+
+
+def drop_per_file_tables(con, schema, keep):
+    """Drop tables left in `schema` by the old one-table-per-file loader."""
+    stale = [
+        r[0] for r in con.execute(
+            "SELECT table_name FROM information_schema.tables "
+            "WHERE table_schema = ? AND table_type = 'BASE TABLE'",
+            [schema],
+        ).fetchall()
+        if r[0] not in keep
+    ]
+    for table_name in stale:
+        con.execute(f"DROP TABLE {schema}.{table_name}")
+
+    if stale:
+        print(f"[{ts()}] Dropped {len(stale)} per-file tables from {schema}")
+
+
+LEDGER_TABLE = "_load_ledger"
+
+LEDGER_DDL = """
+CREATE TABLE IF NOT EXISTS {schema}.{ledger} (
+    dataset     VARCHAR NOT NULL,
+    path        VARCHAR PRIMARY KEY,
+    size        BIGINT NOT NULL,
+    mtime_ns    BIGINT NOT NULL,
+    sha256      VARCHAR NOT NULL,
+    rows        BIGINT,
+    loaded_utc  TIMESTAMP
+)
+"""
+
+
+# Partitions that lost rows, so incremental dbt models can drop or
+# re-aggregate them; the models prune entries they have consumed (see
+# dbt_project/macros/matchlog_partitions.sql)
+DELETED_PARTITIONS_TABLE = "_deleted_partitions"
+
+DELETED_PARTITIONS_DDL = """
+CREATE TABLE IF NOT EXISTS {schema}.{table} (
+    goalkeeper   VARCHAR NOT NULL,
+    season       VARCHAR NOT NULL,
+    competition  VARCHAR,
+    deleted_utc  TIMESTAMP NOT NULL
+)
+"""
+
+
+def plan_load(con, schema, dataset, files):
+    """
+    Compare files on disk with the load ledger.
+
+    Returns (changed, skipped, removed): fingerprints of new or changed
+    files, the number of unchanged files, and ledger paths whose file is
+    gone. Files whose size and mtime match the ledger are not re-hashed; a
+    touched file with the same content is skipped and its mtime refreshed.
+    """
+    ledger = {
+        r[0]: r[1:] for r in con.execute(
+            f"SELECT path, size, mtime_ns, sha256 FROM {schema}.{LEDGER_TABLE} WHERE dataset = ?",
+            [dataset],
+        ).fetchall()
+    }
+
+    changed, skipped = [], 0
+    for path in files:
+        stat = path.stat()
+        known = ledger.get(str(path))
+
+        if known and known[:2] == (stat.st_size, stat.st_mtime_ns):
+            skipped += 1
+            continue
+
+        sha256 = sha256_file(path)
+        if known and known[2] == sha256:
+            con.execute(
+                f"UPDATE {schema}.{LEDGER_TABLE} SET mtime_ns = ? WHERE path = ?",
+                [stat.st_mtime_ns, str(path)],
+            )
+            skipped += 1
+            continue
+
+        changed.append({
+            "path": path,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": sha256,
+        })
+
+    on_disk = {str(p) for p in files}
+    removed = [path for path in ledger if path not in on_disk]
+
+    return changed, skipped, removed
+
+
+def legacy_matchlogs_df(path):
+    """
+    Read a legacy shifted-header CSV. 'Match Report' in `minutes` (the
+    keeper did not play) becomes null, as in the typed scraper output.
+    """
+    df = clean_matchlogs_df(pd.read_csv(path, dtype=str))
+    df["minutes"] = df["minutes"].where(df["minutes"] != "Match Report")
+    return df
+
+
+def decode_matchlogs_file(path):
+    """Decode one matchlogs file (Parquet, CSV or legacy CSV) into Arrow."""
+    if path.suffix == ".parquet":
+        return pq.read_table(path)
+
+    if is_legacy_matchlogs_csv(path):
+        return pa.Table.from_pandas(legacy_matchlogs_df(path), preserve_index=False)
+
+    # Declared types, so all-empty stat columns aren't read as strings
+    return pa_csv.read_csv(
+        path,
+        convert_options=pa_csv.ConvertOptions(
+            column_types={name: dtype for name, dtype, _ in MATCHLOGS_COLUMNS}
+        ),
+    )
+
+
+def read_matchlogs_file(path):
+    """
+    Decode one file and enforce the matchlogs contract.
+
+    Returns (path, table, error): the conforming table with a `filename`
+    column, or None and the reason it was rejected. Runs in worker
+    processes of the parallel parse stage, so it never touches DuckDB.
+    """
+    try:
+        table = conform_matchlogs_table(decode_matchlogs_file(path))
+    except (ValueError, KeyError, pa.ArrowException) as e:
+        return path, None, f"{type(e).__name__}: {e}"
+
+    filename = pa.array([str(path)] * table.num_rows, pa.string())
+    return path, table.append_column("filename", filename), None
+
+
+def parquet_conforms(path):
+    """True if a Parquet file's schema already is the declared contract."""
+    return pq.read_schema(path).remove_metadata().equals(MATCHLOGS_SCHEMA)
+
+
+def iter_conformed_batches(files, workers, batch_files=64):
+    """
+    Decode and check `files`, across `workers` processes if > 0. Yields
+    ("batch", Arrow table of up to `batch_files` files) and
+    ("rejected", (path, error)) items.
+    """
+    if workers:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        results = pool.map(read_matchlogs_file, files, chunksize=8)
+    else:
+        pool = None
+        results = map(read_matchlogs_file, files)
+
+    try:
+        batch = []
+        for path, table, error in results:
+            if error:
+                yield "rejected", (path, error)
+                continue
+
+            batch.append(table)
+            if len(batch) == batch_files:
+                yield "batch", pa.concat_tables(batch)
+                batch = []
+        if batch:
+            yield "batch", pa.concat_tables(batch)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+
+def matchlogs_ddl(fq_table_name):
+    """CREATE TABLE statement for the typed raw matchlogs table."""
+    columns = [
+        f"{name} {duckdb_type(dtype)}{'' if nullable else ' NOT NULL'}"
+        for name, dtype, nullable in MATCHLOGS_COLUMNS
+    ] + [
+        "source_file VARCHAR NOT NULL",
+        "source_table VARCHAR NOT NULL",
+        "goalkeeper VARCHAR NOT NULL",
+        "season VARCHAR NOT NULL",
+        "loaded_utc TIMESTAMP NOT NULL",
+    ]
+    return f"CREATE TABLE IF NOT EXISTS {fq_table_name} (\n    " + ",\n    ".join(columns) + "\n)"
+
+
+def matches_contract(con, schema, table_name):
+    """True if an existing raw table has the declared column names and types."""
+    existing = con.execute(
+        "SELECT column_name, data_type FROM information_schema.columns "
+        "WHERE table_schema = ? AND table_name = ? ORDER BY ordinal_position",
+        [schema, table_name],
+    ).fetchall()
+    declared = [(name, duckdb_type(dtype)) for name, dtype, _ in MATCHLOGS_COLUMNS]
+    return existing[:len(declared)] == declared
+
+
+def insert_matchlogs(con, fq_table_name, files_sql, params, loaded_utc):
+    """Append rows from `files_sql` to `fq_table_name`, adding derived columns."""
+    con.execute(
+        f"""
+        INSERT INTO {fq_table_name} BY NAME
+        WITH files AS (
+            {files_sql}
+        ),
+        named AS (
+            SELECT
+                * EXCLUDE (filename),
+                filename AS source_file,
+                replace(lower(parse_filename(filename, true)), '-', '_') AS source_table
+            FROM files
+        )
+        SELECT
+            *,
+            regexp_replace(source_table, '_[0-9]{{4}}_[0-9]{{4}}$', '') AS goalkeeper,
+            regexp_extract(source_table, '([0-9]{{4}}_[0-9]{{4}})$', 1) AS season,
+            CAST($loaded_utc AS TIMESTAMP) AS loaded_utc
+        FROM named
+        """,
+        {**params, "loaded_utc": loaded_utc},
+    )
+
+
+def delete_file_rows(con, schema, fq_table_name, paths, loaded_utc):
+    """
+    Delete the rows and ledger entries loaded from `paths`, recording the
+    (goalkeeper, season, competition) partitions the rows belonged to.
+    """
+    if not paths:
+        return
+
+    con.execute(
+        f"""
+        INSERT INTO {schema}.{DELETED_PARTITIONS_TABLE}
+        SELECT DISTINCT goalkeeper, season, comp, CAST($loaded_utc AS TIMESTAMP)
+        FROM {fq_table_name}
+        WHERE source_file IN (SELECT unnest($paths))
+        """,
+        {"paths": paths, "loaded_utc": loaded_utc},
+    )
+    con.execute(
+        f"DELETE FROM {fq_table_name} WHERE source_file IN (SELECT unnest($paths))",
+        {"paths": paths},
+    )
+    con.execute(
+        f"DELETE FROM {schema}.{LEDGER_TABLE} WHERE path IN (SELECT unnest($paths))",
+        {"paths": paths},
+    )
+
+
+def quarantine_files(rejected, quarantine_dir):
+    """
+    Copy rejected files to `quarantine_dir` and merge them into its
+    `report.json`, keyed by path with the newest rejection winning, so a
+    clean run leaves earlier reports in place. Returns this run's entries.
+    """
+    report = [
+        {"path": str(path), "error": error, "quarantined_utc": ts()}
+        for path, error in rejected
+    ]
+    for entry in report:
+        print(f"[{ts()}] Quarantined {entry['path']}: {entry['error']}")
+
+    if quarantine_dir is None or not report:
+        return report
+
+    quarantine_dir.mkdir(parents=True, exist_ok=True)
+    for path, _ in rejected:
+        shutil.copy2(path, quarantine_dir / path.name)
+
+    report_path = quarantine_dir / "report.json"
+    existing = json.loads(report_path.read_text()) if report_path.exists() else []
+    merged = {entry["path"]: entry for entry in [*existing, *report]}
+    report_path.write_text(json.dumps(list(merged.values()), indent=2))
+
+    return report
+
+
+def load_csvs_to_duckdb(con, schema, tables_manifest, workers=0, quarantine_dir=None):
     """
-    Load CSVs into DuckDB schema.
-    Returns dict like {"table_name": "123 rows"} for status logging.
+    Incrementally load each dataset's files (CSV or Parquet) into one typed
+    `<schema>.<dataset>` table.
+
+    A ledger of every loaded file (path, size, mtime, sha256, rows) decides
+    what to do: new or changed files are (re)loaded, rows of deleted files
+    are removed and unchanged files are skipped, all in one transaction. A
+    changed file's previous rows are only replaced once its new version
+    passes the contract. The partitions of every deleted row are recorded
+    in `<schema>._deleted_partitions` for incremental dbt models.
+    Every row carries `source_file`, `source_table` (<player_slug>_<season>),
+    `goalkeeper`, `season` and `loaded_utc`.
+
+    Files must conform to the declared matchlogs schema
+    (utils/matchlogs_schema.py); those that don't are quarantined with a
+    report instead of loaded, and retried on the next run. Parquet files
+    whose schema already is the contract are bulk-read by DuckDB; everything
+    else is decoded and checked in Python, across `workers` processes if
+    > 0, with this thread as the single writer.
+
+    Returns ({"table_name": "123 rows"}, {"loaded": n, "skipped": n,
+    "removed": n, "quarantined": n, "rows_loaded": n}) for status logging.
     """
     con.execute(f"CREATE SCHEMA IF NOT EXISTS {schema};")
+    con.execute(LEDGER_DDL.format(schema=schema, ledger=LEDGER_TABLE))
+    con.execute(DELETED_PARTITIONS_DDL.format(schema=schema, table=DELETED_PARTITIONS_TABLE))
+    drop_per_file_tables(con, schema, keep=set(tables_manifest) | {LEDGER_TABLE, DELETED_PARTITIONS_TABLE})
 
     tables = {}
-    for dataset, csv_files in tables_manifest.items():
-        for csv_path in csv_files:
-            table_name = csv_path.stem.lower().replace("-", "_")
-            fq_table_name = f"{schema}.{table_name}"
+    counts = {"loaded": 0, "skipped": 0, "removed": 0, "quarantined": 0, "rows_loaded": 0}
+    rejected = []
+
+    for dataset, files in tables_manifest.items():
+        fq_table_name = f"{schema}.{dataset}"
+        loaded_utc = ts()
+
+        con.execute("BEGIN TRANSACTION")
+        try:
+            table_exists = con.execute(
+                "SELECT COUNT(*) FROM information_schema.tables "
+                "WHERE table_schema = ? AND table_name = ?",
+                [schema, dataset],
+            ).fetchone()[0] > 0
+
+            if table_exists and not matches_contract(con, schema, dataset):
+                print(f"[{ts()}] {fq_table_name} predates the typed contract, rebuilding")
+                con.execute(f"DROP TABLE {fq_table_name}")
+                table_exists = False
+
+            if not table_exists:
+                # Table was (re)created: the ledger no longer describes it
+                con.execute(matchlogs_ddl(fq_table_name))
+                con.execute(
+                    f"DELETE FROM {schema}.{LEDGER_TABLE} WHERE dataset = ?", [dataset]
+                )
+
+            changed, skipped, removed = plan_load(con, schema, dataset, files)
+            delete_file_rows(con, schema, fq_table_name, removed, loaded_utc)
+
+            dataset_rejected = []
+            rows_by_file = {}
+            if changed:
+                print(f"[{ts()}] Loading {len(changed)} changed files into {fq_table_name}...")
+                changed_paths = [c["path"] for c in changed]
+
+                # Contract-conforming Parquet goes straight to DuckDB's reader
+                native = [p for p in changed_paths if p.suffix == ".parquet" and parquet_conforms(p)]
+                if native:
+                    delete_file_rows(con, schema, fq_table_name, [str(p) for p in native], loaded_utc)
+                    insert_matchlogs(
+                        con, fq_table_name,
+                        "SELECT * FROM read_parquet($files, filename = true)",
+                        {"files": [str(p) for p in native]},
+                        loaded_utc,
+                    )
+
+                native_set = set(native)
+                decoded = [p for p in changed_paths if p not in native_set]
+                for kind, item in iter_conformed_batches(decoded, workers):
+                    if kind == "rejected":
+                        dataset_rejected.append(item)
+                        continue
 
-            df = pd.read_csv(csv_path)
+                    # A changed file's old rows go only once its new version conforms
+                    delete_file_rows(
+                        con, schema, fq_table_name, item["filename"].unique().to_pylist(), loaded_utc
+                    )
+                    con.register("batch", item)
+                    insert_matchlogs(con, fq_table_name, "SELECT * FROM batch", {}, loaded_utc)
+                    con.unregister("batch")
 
-            # Dataset-specific cleaning
-            if dataset == "matchlogs":
-                df = clean_matchlogs_df(df)
+                # Quarantined files keep their previous rows and ledger entry,
+                # so they are retried until a conforming version arrives
+                rejected_paths = {str(path) for path, _ in dataset_rejected}
+                rows_by_file = dict(con.execute(
+                    f"SELECT source_file, COUNT(*) FROM {fq_table_name} "
+                    f"WHERE source_file IN (SELECT unnest($paths)) GROUP BY source_file",
+                    {"paths": [str(p) for p in changed_paths if str(p) not in rejected_paths]},
+                ).fetchall())
 
-            print(f"[{ts()}] Loading {fq_table_name}...")
-            tmp_df = "tmp_df"
-            con.register(tmp_df, df)
-            load_df_as_table(con, tmp_df, fq_table_name)
-            rows = get_rows_from_table(con, tmp_df)
-            con.unregister(tmp_df)
-            tables[table_name] = f"{rows} rows"
+                ledger_rows = [
+                    (dataset, str(c["path"]), c["size"], c["mtime_ns"], c["sha256"],
+                     rows_by_file.get(str(c["path"]), 0), loaded_utc)
+                    for c in changed
+                    if str(c["path"]) not in rejected_paths
+                ]
+                if ledger_rows:
+                    con.executemany(
+                        f"INSERT INTO {schema}.{LEDGER_TABLE} VALUES (?, ?, ?, ?, ?, ?, CAST(? AS TIMESTAMP))",
+                        ledger_rows,
+                    )
 
-            print(f"[{ts()}] Loaded {fq_table_name}")
+            con.execute("COMMIT")
+        except BaseException:
+            con.execute("ROLLBACK")
+            raise
 
-    return tables
+        loaded = len(changed) - len(dataset_rejected)
+        rejected += dataset_rejected
+        counts["loaded"] += loaded
+        counts["skipped"] += skipped
+        counts["removed"] += len(removed)
+        counts["quarantined"] += len(dataset_rejected)
+        counts["rows_loaded"] += sum(rows_by_file.values())
+
+        print(
+            f"[{ts()}] {fq_table_name}: {loaded} loaded, {skipped} skipped, "
+            f"{len(removed)} removed, {len(dataset_rejected)} quarantined"
+        )
+
+        tables[dataset] = f"{get_rows_from_table(con, fq_table_name)} rows"
+
+    quarantine_files(rejected, quarantine_dir)
+
+    return tables, counts
+
+
+def benchmark_load(schema, tables_manifest, worker_counts):
+    """
+    Full-reload throughput for each worker count, into a throwaway
+    in-memory database. Returns [{workers, files, rows, seconds,
+    files_per_s, rows_per_s}].
+    """
+    results = []
+    for workers in worker_counts:
+        with duckdb.connect() as con:
+            t0 = time.perf_counter()
+            _, counts = load_csvs_to_duckdb(con, schema, tables_manifest, workers=workers)
+            seconds = time.perf_counter() - t0
+
+        results.append({
+            "workers": workers,
+            "files": counts["loaded"],
+            "rows": counts["rows_loaded"],
+            "seconds": round(seconds, 3),
+            "files_per_s": round(counts["loaded"] / seconds, 1),
+            "rows_per_s": round(counts["rows_loaded"] / seconds, 1),
+        })
+        print(
+            f"[{ts()}] Benchmark workers={workers}: {results[-1]['files_per_s']} files/s, "
+            f"{results[-1]['rows_per_s']} rows/s"
+        )
+
+    return results
 
 
 def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("LOAD_WORKERS", 0)),
+                        help="Parse processes for files not bulk-read by DuckDB; 0 parses in-process.")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="Report full-reload files/s and rows/s per worker count, then exit.")
+    args = parser.parse_args()
+
     # Config
     db_path = REPO_ROOT / "dbt_project" / "dev.duckdb"
     data_raw_dir = REPO_ROOT / "data" / "raw" / "fbref"
     public_dir = REPO_ROOT / "public"
+    quarantine_dir = REPO_ROOT / "data" / "quarantine" / "matchlogs"
     schema = "raw_matchlogs"
     datasets = ["matchlogs"]
     tables_manifest = build_csv_manifest(data_raw_dir, datasets)
 
+    if args.benchmark:
+        cpus = os.cpu_count() or 1
+        worker_counts = [0] + [n for n in (1, 2, 4, 8, 16, 32) if n <= cpus]
+        benchmark_load(schema, tables_manifest, worker_counts)
+        return
+
     # Duration tracking
     started_utc = ts()
     t0 = time.perf_counter()
 
     with duckdb.connect(db_path) as con:
-        tables = load_csvs_to_duckdb(con, schema, tables_manifest)
+        tables, load_counts = load_csvs_to_duckdb(
+            con, schema, tables_manifest, args.workers, quarantine_dir
+        )
 
     duration_s = round(time.perf_counter() - t0, 3)
     finished_utc = ts()
@@ -96,6 +558,12 @@ def main():
         finished_utc = finished_utc,
         duration_s = duration_s,
         tables = tables,
+        files = load_counts,
+        throughput = {
+            "workers": args.workers,
+            "files_per_s": round(load_counts["loaded"] / duration_s, 1) if duration_s else None,
+            "rows_per_s": round(load_counts["rows_loaded"] / duration_s, 1) if duration_s else None,
+        },
     )
     update_status_json(public_dir / "status.json", status_patch)
 
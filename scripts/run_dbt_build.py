@@ -1,14 +1,22 @@
+import argparse
 import time
 from pathlib import Path
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 
 from utils.logging import ts, update_status_json, make_status_patch
-from utils.shell import run_cmd
-from utils.dbt_outputs import write_table_metadata
+from utils.shell import run_dbt
+from utils.dbt_outputs import write_table_metadata, summarise_run_results
 
 
 def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--debug", action="store_true",
+                        help="Run `dbt debug` before the build.")
+    parser.add_argument("--full-refresh", action="store_true",
+                        help="Rebuild incremental models from all raw data.")
+    args = parser.parse_args()
+
     # Config
     dbt_dir = REPO_ROOT / "dbt_project"
     public_dir = REPO_ROOT / "public"
@@ -17,10 +25,12 @@ def main():
     started_utc = ts()
     t0 = time.perf_counter()
 
-    run_cmd(["dbt", "debug"], cwd = dbt_dir)
-    run_cmd(["dbt", "build"], cwd = dbt_dir)
-    
+    if args.debug:
+        run_dbt(["debug"], cwd = dbt_dir)
+    run_dbt(["build", "--full-refresh"] if args.full_refresh else ["build"], cwd = dbt_dir)
+
     write_table_metadata(dbt_dir, public_dir)
+    nodes = summarise_run_results(dbt_dir)
 
     duration_s = round(time.perf_counter() - t0, 3)
     finished_utc = ts()
@@ -30,7 +40,8 @@ def main():
         info = "Transform loaded data into final tables using dbt.",
         started_utc = started_utc,
         finished_utc = finished_utc,
-        duration_s = duration_s
+        duration_s = duration_s,
+        nodes = nodes,
     )
     update_status_json(public_dir / "status.json", status_patch)
 
@@ -0,0 +1,48 @@
+import argparse
+import os
+
+from utils.logging import ts
+from utils.s3_io import make_s3_client
+from utils.history import list_runs, read_run, rollback, garbage_collect
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect, roll back and prune S3 history runs.")
+    parser.add_argument("--bucket", default=os.environ.get("S3_BUCKET", "gk-performance-tracker-data"))
+    parser.add_argument("--endpoint-url", default=os.environ.get("S3_ENDPOINT_URL"),
+                        help="S3-compatible endpoint, e.g. a local MinIO for testing.")
+    parser.add_argument("--latest-prefix", default="latest/")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent copies.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("list", help="List history runs, oldest first.")
+
+    rollback_parser = commands.add_parser("rollback", help="Repoint latest/ to an earlier run.")
+    rollback_parser.add_argument("run_id", help="Run id as shown by `list`.")
+
+    gc_parser = commands.add_parser("gc", help="Delete runs outside the retention policy and unreferenced blobs.")
+    gc_parser.add_argument("--keep-last", type=int, default=30, help="Always keep the newest N runs.")
+    gc_parser.add_argument("--keep-days", type=int, default=90, help="Always keep runs of the last N days.")
+    gc_parser.add_argument("--dry-run", action="store_true")
+
+    args = parser.parse_args()
+    s3 = make_s3_client(args.endpoint_url, max_pool_connections=args.workers * 2)
+
+    if args.command == "list":
+        for run_id in list_runs(s3, args.bucket):
+            manifest = read_run(s3, args.bucket, run_id)
+            size = sum(a["bytes"] for a in manifest["artefacts"].values())
+            print(f"{run_id}  data_version={manifest['data_version']}  "
+                  f"{len(manifest['artefacts'])} artefacts  {size} bytes")
+
+    elif args.command == "rollback":
+        rollback(s3, args.bucket, args.run_id, args.latest_prefix, args.workers)
+
+    elif args.command == "gc":
+        result = garbage_collect(s3, args.bucket, args.latest_prefix,
+                                 args.keep_last, args.keep_days, args.dry_run)
+        print(f"[{ts()}] GC result: {result}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,5 @@
+import argparse
+import shutil
 import time
 from pathlib import Path
 import duckdb
@@ -5,42 +7,129 @@ import duckdb
 REPO_ROOT = Path(__file__).resolve().parents[1]
 
 from utils.logging import ts, update_status_json, make_status_patch
-from utils.duckdb_io import export_table_to_parquet, get_rows_from_table
-
-
-def export_tables_to_public(con, exports, out_dir):
+from utils.duckdb_io import export_table_to_parquet, export_table_to_arrow
+from utils.manifest import (
+    read_manifest, write_manifest, build_manifest, publish_staged, describe_public_dir,
+)
+
+
+# Parquet writer settings, chosen per table by its access pattern
+EXPORT_PROFILES = {
+    # Whole partitions read by app pages: DuckDB's default row groups
+    "scan": {"compression": "zstd", "compression_level": 3, "row_group_size": 122880},
+    # Filtered reads on the sort key: DuckDB's smallest row groups (2048
+    # rows), so min/max statistics skip all but one or two of them
+    "lookup": {"compression": "zstd", "compression_level": 3, "row_group_size": 2048},
+    # Smallest files, for long-term copies; slower to write
+    "archive": {"compression": "zstd", "compression_level": 19, "row_group_size": 122880},
+}
+
+# {table: profile, partition columns and sort keys}. Sort keys cover each
+# table's full grain: ties would come out in any order, changing the
+# exported bytes (and so the manifest hashes) on every rebuild.
+GRAIN = ["goalkeeper", "season", "competition"]
+
+EXPORTS = {
+    "fct_goalkeeper_performance": {
+        "profile": "scan",
+        "partition_by": ["season", "competition"],
+        "order_by": GRAIN,
+    },
+    "mart_goalkeeper_league_ratings": {
+        "profile": "scan",
+        "partition_by": ["season", "competition"],
+        "order_by": GRAIN,
+    },
+    # Written by scripts/bootstrap_intervals.py, not dbt
+    "fct_goalkeeper_performance_intervals": {
+        "profile": "scan",
+        "partition_by": ["season", "competition"],
+        "order_by": GRAIN,
+    },
+    # One file sorted by keeper, so one keeper's form is a narrow read
+    "mart_goalkeeper_rolling_form": {
+        "profile": "lookup",
+        "order_by": [*GRAIN, "match_date", "team", "opponent"],
+    },
+}
+
+
+def export_tables_to_public(con, exports, out_dir, profile=None):
     """
-    Export each table in `exports` to `out_dir` as parquet.
-    Returns dict like {"table": "123 rows"} for status logging.
+    Export each table in `exports` to `out_dir` as parquet, using its
+    export profile (or `profile` for every table): a hive-partitioned
+    `out_dir/<table>/` directory when `partition_by` is given, else
+    `out_dir/<table>.parquet`. Each table also gets uncompressed Arrow
+    IPC sidecars for memory-mapped app loads: `out_dir/<table>.arrow`, or
+    one file per partition under the `out_dir/<table>.arrow/` directory.
+
+    Row counts come from the writes themselves. Returns dict like
+    {"table": "123 rows"} for status logging.
     """
     tables = {}
+    out_dir.mkdir(parents=True, exist_ok=True)
 
-    for table in exports:
-        out_path = out_dir / f"{table}.parquet"
+    for table, spec in exports.items():
         print(f"[{ts()}] Exporting {table}...")
 
-        export_table_to_parquet(con, table, out_path)
+        options = {
+            **EXPORT_PROFILES[profile or spec["profile"]],
+            "partition_by": spec.get("partition_by"),
+            "order_by": spec.get("order_by"),
+        }
+
+        if options["partition_by"]:
+            out_path = out_dir / table
+        else:
+            out_path = out_dir / f"{table}.parquet"
+
+        rows = export_table_to_parquet(con, table, out_path, **options)
+        arrow_rows = export_table_to_arrow(
+            con, table, out_dir / f"{table}.arrow", spec.get("order_by"), spec.get("partition_by")
+        )
+
+        if arrow_rows != rows:
+            raise RuntimeError(f"{table}: {rows} Parquet rows but {arrow_rows} Arrow rows")
 
-        rows = get_rows_from_table(con, table)
         tables[table] = f"{rows} rows"
 
-        print(f"[{ts()}] Exported {table}")
+        print(f"[{ts()}] Exported {table} ({rows} rows)")
 
     return tables
 
 
 def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--profile", choices=sorted(EXPORT_PROFILES),
+                        help="Use this export profile for every table.")
+    args = parser.parse_args()
+
     # Config
     db_path = REPO_ROOT / "dbt_project" / "dev.duckdb"
     public_dir = REPO_ROOT / "public"
-    exports = ["fct_goalkeeper_performance", "mart_goalkeeper_league_ratings"]
     
     # Duration tracking
     started_utc = ts()
     t0 = time.perf_counter()
 
+    # Export to a staging directory, then publish only files whose content
+    # changed, so unchanged artefacts keep their bytes and mtime
+    previous = read_manifest(public_dir)
+    staging_dir = public_dir / ".staging"
+    shutil.rmtree(staging_dir, ignore_errors=True)
+
     with duckdb.connect(db_path) as con:
-        tables = export_tables_to_public(con, exports, public_dir)
+        tables = export_tables_to_public(con, EXPORTS, staging_dir, args.profile)
+
+    owned = [name for table in EXPORTS for name in (table, f"{table}.parquet", f"{table}.arrow")]
+    artefacts, files = publish_staged(staging_dir, public_dir, previous, owned)
+
+    manifest = build_manifest(describe_public_dir(public_dir, artefacts), previous)
+    write_manifest(public_dir, manifest)
+    print(
+        f"[{ts()}] Published data version {manifest['data_version']}: {files['written']} written, "
+        f"{files['unchanged']} unchanged, {files['deleted']} deleted"
+    )
 
     duration_s = round(time.perf_counter() - t0, 3)
     finished_utc = ts()
@@ -53,6 +142,9 @@ def main():
         finished_utc = finished_utc,
         duration_s = duration_s,
         tables = tables,
+        profile = args.profile,
+        files = files,
+        data_version = manifest["data_version"],
     )
     update_status_json(public_dir / "status.json", status_patch)
 
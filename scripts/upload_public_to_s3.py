@@ -1,25 +1,56 @@
+import argparse
+import os
 import time
 from pathlib import Path
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 
 from utils.logging import ts, update_status_json, make_status_patch
-from utils.shell import run_cmd
+from utils.manifest import MANIFEST_NAME, read_manifest, diff_manifests
+from utils.s3_io import make_s3_client, read_json_object, upload_files, delete_objects
+from utils.history import snapshot_run
 
 
 def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bucket", default=os.environ.get("S3_BUCKET", "gk-performance-tracker-data"))
+    parser.add_argument("--endpoint-url", default=os.environ.get("S3_ENDPOINT_URL"),
+                        help="S3-compatible endpoint, e.g. a local MinIO for testing.")
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("UPLOAD_WORKERS", 8)),
+                        help="Concurrent transfers.")
+    args = parser.parse_args()
+
     # Config
-    bucket = "gk-performance-tracker-data"
+    bucket = args.bucket
     public_dir = REPO_ROOT / "public"
-    history_dest = f"s3://{bucket}/history/{ts()}/"
-    latest_dest = f"s3://{bucket}/latest/"
+    latest_prefix = "latest/"
 
     # Duration tracking
     started_utc = ts()
     t0 = time.perf_counter()
 
-    run_cmd(["aws", "s3", "sync", str(public_dir) + "/", history_dest], REPO_ROOT) # for rollback
-    run_cmd(["aws", "s3", "sync", str(public_dir) + "/", latest_dest, "--delete"], REPO_ROOT)
+    s3 = make_s3_client(args.endpoint_url, max_pool_connections=args.workers * 2)
+
+    # Only artefacts whose content hash differs from the uploaded manifest
+    # are sent; unchanged bytes stay where they are
+    local = read_manifest(public_dir)
+    remote = read_json_object(s3, bucket, f"{latest_prefix}{MANIFEST_NAME}") or {"artefacts": {}}
+    changed, removed = diff_manifests(remote, local)
+    print(f"[{ts()}] {len(changed)} changed and {len(removed)} removed artefacts to upload")
+
+    upload_files(s3, bucket, {f"{latest_prefix}{rel}": public_dir / rel for rel in changed}, args.workers)
+
+    # Manifest goes up after the bytes it describes, deletions after it
+    upload_files(
+        s3, bucket,
+        {f"{latest_prefix}{name}": public_dir / name for name in (MANIFEST_NAME, "status.json")},
+        args.workers,
+    )
+    delete_objects(s3, bucket, [f"{latest_prefix}{rel}" for rel in removed])
+
+    # History run for rollback; new content is copied server-side from
+    # latest/ into content-addressed blobs, unchanged content is reused
+    history = snapshot_run(s3, bucket, local, latest_prefix, args.workers)
 
     duration_s = round(time.perf_counter() - t0, 3)
     finished_utc = ts()
@@ -30,7 +61,15 @@ def main():
         info = "Upload data to S3 (and history snapshot for rollback).",
         started_utc = started_utc,
         finished_utc = finished_utc,
-        duration_s = duration_s
+        duration_s = duration_s,
+        data_version = local["data_version"],
+        files = {
+            "uploaded": len(changed),
+            "removed": len(removed),
+            "unchanged": len(local["artefacts"]) - len(changed),
+            "bytes_uploaded": sum(local["artefacts"][rel]["bytes"] for rel in changed),
+        },
+        history = history,
     )
     update_status_json(public_dir / "status.json", status_patch)
 
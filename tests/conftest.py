@@ -0,0 +1,24 @@
+import pytest
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    """An S3 client against moto's in-memory stand-in, with bucket "bkt"."""
+    moto = pytest.importorskip("moto")
+    from utils.s3_io import make_s3_client
+
+    for name, value in [("AWS_ACCESS_KEY_ID", "testing"), ("AWS_SECRET_ACCESS_KEY", "testing"),
+                        ("AWS_SESSION_TOKEN", "testing"), ("AWS_DEFAULT_REGION", "us-east-1")]:
+        monkeypatch.setenv(name, value)
+
+    with moto.mock_aws():
+        client = make_s3_client()
+        client.create_bucket(Bucket="bkt")
+        yield client
+
+
+def bucket_contents(s3, bucket="bkt", prefix="") -> dict[str, bytes]:
+    """{key: body} of every object under `prefix`."""
+    from utils.s3_io import list_keys
+
+    return {key: s3.get_object(Bucket=bucket, Key=key)["Body"].read() for key in list_keys(s3, bucket, prefix)}
@@ -0,0 +1,133 @@
+import itertools
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from utils import history
+from utils.history import snapshot_run, rollback, garbage_collect, runs_to_keep, list_runs, blob_key
+from utils.manifest import MANIFEST_NAME, build_manifest, describe_artefact, diff_manifests
+from utils.s3_io import read_json_object, put_json_object, upload_files, delete_objects
+from tests.conftest import bucket_contents
+
+
+LATEST = "latest/"
+
+
+@pytest.fixture(autouse=True)
+def run_clock(monkeypatch):
+    """One second per ts() call from 2026-01-01, so every run gets its own id."""
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    ticks = itertools.count()
+    monkeypatch.setattr(history, "ts", lambda: (start + timedelta(seconds=next(ticks))).isoformat(timespec="seconds"))
+
+
+def publish(s3, tmp_path, contents: dict[str, bytes]) -> dict:
+    """Publish `contents` to latest/ the way upload_public_to_s3 does, then snapshot it."""
+    public_dir = tmp_path / "public"
+    for path in public_dir.rglob("*"):
+        if path.is_file():
+            path.unlink()
+    for rel, data in contents.items():
+        (public_dir / rel).parent.mkdir(parents=True, exist_ok=True)
+        (public_dir / rel).write_bytes(data)
+
+    previous = read_json_object(s3, "bkt", f"{LATEST}{MANIFEST_NAME}") or {"artefacts": {}}
+    manifest = build_manifest({rel: describe_artefact(public_dir / rel) for rel in contents}, previous)
+    changed, removed = diff_manifests(previous, manifest)
+
+    upload_files(s3, "bkt", {f"{LATEST}{rel}": public_dir / rel for rel in changed})
+    put_json_object(s3, "bkt", f"{LATEST}{MANIFEST_NAME}", manifest)
+    delete_objects(s3, "bkt", [f"{LATEST}{rel}" for rel in removed])
+
+    return {**manifest, **snapshot_run(s3, "bkt", manifest, LATEST)}
+
+
+def latest_artefacts(s3) -> dict[str, bytes]:
+    return {k: v for k, v in bucket_contents(s3, prefix=LATEST).items() if not k.endswith(MANIFEST_NAME)}
+
+
+def test_snapshot_stores_each_content_once(s3, tmp_path):
+    first = publish(s3, tmp_path, {"a.csv": b"a1", "b.csv": b"b1"})
+    second = publish(s3, tmp_path, {"a.csv": b"a1", "b.csv": b"b2"})
+
+    assert (first["blobs_copied"], first["blobs_reused"]) == (2, 0)
+    assert (second["blobs_copied"], second["blobs_reused"]) == (1, 1)
+    assert len(bucket_contents(s3, prefix=history.BLOBS_PREFIX)) == 3
+
+
+def test_rollback_restores_exact_object_set(s3, tmp_path):
+    first = publish(s3, tmp_path, {"a.csv": b"a1", "t/x.json": b"x1", "gone.csv": b"g"})
+    first_latest = bucket_contents(s3, prefix=LATEST)
+    publish(s3, tmp_path, {"a.csv": b"a2", "t/x.json": b"x1", "new.csv": b"n"})
+
+    result = rollback(s3, "bkt", first["run_id"], LATEST)
+
+    assert bucket_contents(s3, prefix=LATEST) == first_latest
+    assert result == {"copied": 2, "removed": 1}
+    # Rolling back to the current content changes nothing
+    assert rollback(s3, "bkt", first["run_id"], LATEST) == {"copied": 0, "removed": 0}
+
+
+def test_rollback_to_unknown_run_raises(s3):
+    with pytest.raises(ValueError):
+        rollback(s3, "bkt", "2020-01-01T00:00:00+00:00", LATEST)
+
+
+def test_gc_keeps_blobs_of_kept_runs_and_latest(s3, tmp_path):
+    publish(s3, tmp_path, {"a.csv": b"old", "shared.csv": b"shared"})
+    kept = publish(s3, tmp_path, {"a.csv": b"kept", "shared.csv": b"shared"})
+    publish(s3, tmp_path, {"a.csv": b"latest", "shared.csv": b"shared"})
+    runs = list_runs(s3, "bkt")
+
+    # Keep the newest two runs; the oldest one and its blob go
+    result = garbage_collect(s3, "bkt", LATEST, keep_last=2, keep_days=0)
+
+    assert result["runs_deleted"] == 1 and result["blobs_deleted"] == 1
+    assert list_runs(s3, "bkt") == runs[1:]
+    blobs = bucket_contents(s3, prefix=history.BLOBS_PREFIX)
+    assert sorted(blobs.values()) == [b"kept", b"latest", b"shared"]
+    for artefact in kept["artefacts"].values():
+        assert blob_key(artefact["sha256"]) in blobs
+    # latest/ is never touched
+    assert latest_artefacts(s3) == {"latest/a.csv": b"latest", "latest/shared.csv": b"shared"}
+
+
+def test_gc_keeps_blobs_referenced_only_by_latest(s3, tmp_path):
+    publish(s3, tmp_path, {"a.csv": b"a1"})
+    publish(s3, tmp_path, {"a.csv": b"a2"})
+
+    # Expire every run: the blob latest/ points at must survive
+    result = garbage_collect(s3, "bkt", LATEST, keep_last=0, keep_days=0)
+
+    assert result["runs_deleted"] == 2
+    assert list(bucket_contents(s3, prefix=history.BLOBS_PREFIX).values()) == [b"a2"]
+
+
+def test_gc_dry_run_deletes_nothing(s3, tmp_path):
+    publish(s3, tmp_path, {"a.csv": b"a1"})
+    publish(s3, tmp_path, {"a.csv": b"a2"})
+    before = bucket_contents(s3)
+
+    result = garbage_collect(s3, "bkt", LATEST, keep_last=1, keep_days=0, dry_run=True)
+
+    assert result["runs_deleted"] == 1 and result["blobs_deleted"] == 1
+    assert bucket_contents(s3) == before
+
+
+RUN_IDS = [f"2026-01-{day:02d}T00:00:00+00:00" for day in range(1, 11)]
+NOW = datetime(2026, 1, 10, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize("keep_last, keep_days, expected", [
+    (0, 0, RUN_IDS[9:]),    # only the run at exactly `now` is within 0 days
+    (3, 0, RUN_IDS[7:]),
+    (1, 2, RUN_IDS[7:]),    # the cutoff day itself is kept
+    (5, 2, RUN_IDS[5:]),
+    (20, 0, RUN_IDS),       # more than exist keeps everything
+])
+def test_runs_to_keep(keep_last, keep_days, expected):
+    assert runs_to_keep(RUN_IDS, keep_last, keep_days, now=NOW) == set(expected)
+
+
+def test_runs_to_keep_no_runs():
+    assert runs_to_keep([], 3, 7, now=NOW) == set()
@@ -0,0 +1,104 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from scraping.http_scraper import FBRefHTTPScraper, parse_matchlogs_records
+
+
+HEADER = (
+    '<tr><th data-stat="date">Date</th><th data-stat="comp">Comp</th>'
+    '<th data-stat="gk_saves">Saves</th><th data-stat="gk_goals_against">GA</th></tr>'
+)
+
+ROWS = (
+    '<tr><th data-stat="date">2025-08-16</th><td data-stat="comp">Premier League</td>'
+    '<td data-stat="gk_saves">3</td><td data-stat="gk_goals_against">1</td></tr>'
+    '<tr><th data-stat="date">2025-08-23</th><td data-stat="comp">Premier League</td>'
+    '<td data-stat="gk_saves">5</td><td data-stat="gk_goals_against">0</td></tr>'
+)
+
+
+def matchlogs_page(thead: str, tbody: str, commented: bool = False) -> str:
+    table = f'<table id="matchlogs_all"><thead>{thead}</thead><tbody>{tbody}</tbody></table>'
+    if commented:
+        table = f'<div id="all_matchlogs"><!--\n{table}\n--></div>'
+    return f"<html><body>{table}</body></html>"
+
+
+PAGES = {
+    # Stat-group labels spanning several columns above the real header row
+    "/two-row-thead": matchlogs_page(
+        '<tr class="over_header"><th colspan="2"></th>'
+        '<th colspan="2" data-stat="header_performance">Performance</th></tr>' + HEADER,
+        ROWS,
+    ),
+    # Repeated header and spacer rows inside the body
+    "/thead-spacer-rows": matchlogs_page(
+        HEADER,
+        ROWS[:len(ROWS) // 2]
+        + HEADER.replace("<tr>", '<tr class="thead">')
+        + '<tr class="spacer partial_table"><td colspan="4"></td></tr>'
+        + ROWS[len(ROWS) // 2:],
+    ),
+    "/commented-table": matchlogs_page(HEADER, ROWS, commented=True),
+    "/empty": "",
+}
+
+COLUMNS = ["date", "comp", "gk_saves", "gk_goals_against"]
+
+RECORDS = [
+    {"date": "2025-08-16", "comp": "Premier League", "gk_saves": "3", "gk_goals_against": "1"},
+    {"date": "2025-08-23", "comp": "Premier League", "gk_saves": "5", "gk_goals_against": "0"},
+]
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        body = PAGES[self.path].encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def base_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def scraper():
+    scraper = FBRefHTTPScraper(retries=2, success_delay_seconds=0)
+    yield scraper
+    scraper.close()
+
+
+@pytest.mark.parametrize("path", ["/two-row-thead", "/thead-spacer-rows", "/commented-table"])
+def test_parse_matchlogs_records(base_url, scraper, path):
+    columns, records = parse_matchlogs_records(scraper.get(base_url + path))
+
+    assert columns == COLUMNS
+    assert records == RECORDS
+
+
+def test_empty_body_is_retried_then_raises(base_url, scraper, monkeypatch):
+    sleeps = []
+    monkeypatch.setattr("scraping.http_scraper.time.sleep", sleeps.append)
+
+    with pytest.raises(RuntimeError, match="Unparseable HTML"):
+        parse_matchlogs_records(scraper.get(base_url + "/empty"))
+
+    with pytest.raises(RuntimeError, match="Unparseable HTML"):
+        scraper.scrape_player_matchlogs_data(base_url + "/empty")
+    assert sleeps == [1]
@@ -0,0 +1,139 @@
+import os
+
+import duckdb
+import pytest
+
+from scripts.load_duckdb import build_csv_manifest, load_csvs_to_duckdb
+from utils.matchlogs_schema import MATCHLOGS_COLUMNS
+
+
+SCHEMA = "raw_matchlogs"
+COLUMNS = [name for name, *_ in MATCHLOGS_COLUMNS]
+
+
+@pytest.fixture
+def raw_dir(tmp_path):
+    (tmp_path / "matchlogs").mkdir()
+    return tmp_path
+
+
+@pytest.fixture
+def con():
+    con = duckdb.connect()
+    yield con
+    con.close()
+
+
+def write_matchlogs(raw_dir, stem, n_rows, comp="Premier League"):
+    """A contract-conforming matchlogs CSV with `n_rows` rows; returns its path."""
+    lines = [",".join(COLUMNS)]
+    for i in range(n_rows):
+        values = dict.fromkeys(COLUMNS, "")
+        values.update({"date": f"2025-08-{10 + i}", "comp": comp, "minutes": "90"})
+        lines.append(",".join(values[c] for c in COLUMNS))
+    return write_file(raw_dir, stem, "\n".join(lines) + "\n")
+
+
+def write_file(raw_dir, stem, text):
+    path = raw_dir / "matchlogs" / f"{stem}.csv"
+    existed = path.exists()
+    path.write_text(text)
+    if existed:
+        # A rewrite within the filesystem's mtime resolution must still look changed
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    return path
+
+
+def load(con, raw_dir, quarantine_dir=None):
+    manifest = build_csv_manifest(raw_dir, ["matchlogs"])
+    _, counts = load_csvs_to_duckdb(con, SCHEMA, manifest, quarantine_dir=quarantine_dir)
+    return counts
+
+
+def rows_by_file(con):
+    return dict(con.execute(
+        f"SELECT source_file, COUNT(*) FROM {SCHEMA}.matchlogs GROUP BY source_file"
+    ).fetchall())
+
+
+def ledger(con):
+    return dict(con.execute(
+        f"SELECT path, sha256 FROM {SCHEMA}._load_ledger"
+    ).fetchall())
+
+
+def test_unchanged_files_are_skipped(con, raw_dir):
+    a = write_matchlogs(raw_dir, "keeper-one_2025_2026", 3)
+    b = write_matchlogs(raw_dir, "keeper-two_2025_2026", 2)
+    assert load(con, raw_dir)["loaded"] == 2
+    loaded_utc = con.execute(f"SELECT DISTINCT loaded_utc FROM {SCHEMA}.matchlogs").fetchall()
+
+    counts = load(con, raw_dir)
+
+    assert counts == {"loaded": 0, "skipped": 2, "removed": 0, "quarantined": 0, "rows_loaded": 0}
+    assert rows_by_file(con) == {str(a): 3, str(b): 2}
+    assert con.execute(f"SELECT DISTINCT loaded_utc FROM {SCHEMA}.matchlogs").fetchall() == loaded_utc
+
+
+def test_touched_file_with_same_content_is_skipped(con, raw_dir):
+    a = write_matchlogs(raw_dir, "keeper-one_2025_2026", 3)
+    load(con, raw_dir)
+
+    write_file(raw_dir, "keeper-one_2025_2026", a.read_text())
+    counts = load(con, raw_dir)
+
+    assert (counts["loaded"], counts["skipped"]) == (0, 1)
+    assert rows_by_file(con) == {str(a): 3}
+
+
+def test_changed_file_rows_are_replaced(con, raw_dir):
+    a = write_matchlogs(raw_dir, "keeper-one_2025_2026", 3)
+    b = write_matchlogs(raw_dir, "keeper-two_2025_2026", 2)
+    load(con, raw_dir)
+    old_sha = ledger(con)[str(a)]
+
+    write_matchlogs(raw_dir, "keeper-one_2025_2026", 5)
+    counts = load(con, raw_dir)
+
+    assert (counts["loaded"], counts["skipped"], counts["rows_loaded"]) == (1, 1, 5)
+    assert rows_by_file(con) == {str(a): 5, str(b): 2}
+    assert ledger(con)[str(a)] != old_sha
+
+
+def test_removed_file_rows_are_deleted_and_partition_recorded(con, raw_dir):
+    a = write_matchlogs(raw_dir, "keeper-one_2025_2026", 3)
+    b = write_matchlogs(raw_dir, "keeper-two_2025_2026", 2, comp="FA Cup")
+    load(con, raw_dir)
+
+    b.unlink()
+    counts = load(con, raw_dir)
+
+    assert counts["removed"] == 1
+    assert rows_by_file(con) == {str(a): 3}
+    assert set(ledger(con)) == {str(a)}
+    assert con.execute(
+        f"SELECT goalkeeper, season, competition FROM {SCHEMA}._deleted_partitions"
+    ).fetchall() == [("keeper_two", "2025_2026", "FA Cup")]
+
+
+def test_file_failing_contract_keeps_previous_rows(con, raw_dir, tmp_path):
+    a = write_matchlogs(raw_dir, "keeper-one_2025_2026", 3)
+    load(con, raw_dir)
+    sha = ledger(con)[str(a)]
+
+    write_file(raw_dir, "keeper-one_2025_2026", "date,oops\n2025-08-10,x\n")
+    counts = load(con, raw_dir, quarantine_dir=tmp_path / "quarantine")
+
+    assert (counts["loaded"], counts["quarantined"]) == (0, 1)
+    assert rows_by_file(con) == {str(a): 3}
+    assert ledger(con) == {str(a): sha}
+    assert (tmp_path / "quarantine" / a.name).exists()
+    assert con.execute(f"SELECT COUNT(*) FROM {SCHEMA}._deleted_partitions").fetchone()[0] == 0
+
+    # Retried, and loaded once a conforming version arrives
+    write_matchlogs(raw_dir, "keeper-one_2025_2026", 4)
+    counts = load(con, raw_dir)
+
+    assert (counts["loaded"], counts["quarantined"]) == (1, 0)
+    assert rows_by_file(con) == {str(a): 4}
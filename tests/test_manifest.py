@@ -0,0 +1,83 @@
+import duckdb
+import pandas as pd
+import pytest
+
+from scripts.stage_public_tables import EXPORTS, export_tables_to_public
+from utils.manifest import build_manifest, describe_public_dir, publish_staged, read_manifest, write_manifest
+
+
+OWNED = [name for table in EXPORTS for name in (table, f"{table}.parquet", f"{table}.arrow")]
+
+
+def export_frames() -> dict[str, pd.DataFrame]:
+    """A few keepers across two seasons and competitions for every exported table."""
+    keys = pd.DataFrame(
+        [
+            (f"keeper_{k}", season, competition)
+            for k in range(4)
+            for season in ["2024_2025", "2025_2026"]
+            for competition in ["Premier League", "FA Cup"]
+        ],
+        columns=["goalkeeper", "season", "competition"],
+    )
+    keys["score"] = [round(i * 0.37, 2) for i in range(len(keys))]
+
+    form = keys.merge(pd.DataFrame({"match_date": pd.date_range("2025-08-16", periods=3, freq="7D")}), how="cross")
+    form["team"] = "team_" + form["goalkeeper"].str[-1]
+    form["opponent"] = "opponent"
+    form["rolling_psxg_minus_ga"] = range(len(form))
+
+    return {table: form if table == "mart_goalkeeper_rolling_form" else keys for table in EXPORTS}
+
+
+def stage(public_dir, frames, shuffle_seed=None):
+    """One stage_public_tables run over `frames`; returns (manifest, file counts)."""
+    previous = read_manifest(public_dir)
+    staging_dir = public_dir / ".staging"
+
+    with duckdb.connect() as con:
+        for table, df in frames.items():
+            if shuffle_seed is not None:
+                df = df.sample(frac=1, random_state=shuffle_seed)
+            con.register("df", df)
+            con.execute(f"CREATE TABLE {table} AS SELECT * FROM df")
+            con.unregister("df")
+        export_tables_to_public(con, EXPORTS, staging_dir)
+
+    artefacts, files = publish_staged(staging_dir, public_dir, previous, OWNED)
+    manifest = build_manifest(describe_public_dir(public_dir, artefacts), previous)
+    write_manifest(public_dir, manifest)
+    return manifest, files
+
+
+def mtimes(public_dir):
+    return {p: p.stat().st_mtime_ns for p in public_dir.rglob("*") if p.is_file() and p.name != "manifest.json"}
+
+
+@pytest.mark.parametrize("shuffle_seed", [None, 1, 2])
+def test_restaging_same_data_writes_nothing(tmp_path, shuffle_seed):
+    frames = export_frames()
+    first, files = stage(tmp_path, frames)
+    assert files["written"] > 0
+    before = mtimes(tmp_path)
+
+    second, files = stage(tmp_path, frames, shuffle_seed)
+
+    assert files == {"written": 0, "unchanged": len(first["artefacts"]), "deleted": 0}
+    assert second["data_version"] == first["data_version"]
+    assert second["artefacts"] == first["artefacts"]
+    assert mtimes(tmp_path) == before
+
+
+def test_changed_partition_is_the_only_write(tmp_path):
+    frames = export_frames()
+    first, _ = stage(tmp_path, frames)
+
+    ratings = frames["mart_goalkeeper_league_ratings"].copy()
+    ratings.loc[(ratings["season"] == "2025_2026") & (ratings["competition"] == "FA Cup"), "score"] += 1
+    second, files = stage(tmp_path, {**frames, "mart_goalkeeper_league_ratings": ratings})
+
+    changed = sorted(rel for rel, a in second["artefacts"].items() if a["data_version"] == second["data_version"])
+    assert second["data_version"] != first["data_version"]
+    assert files["written"] == len(changed) == 2
+    assert all(rel.startswith("mart_goalkeeper_league_ratings") and "2025_2026" in rel for rel in changed)
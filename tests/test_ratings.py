@@ -0,0 +1,74 @@
+import re
+from pathlib import Path
+
+import duckdb
+import numpy as np
+import pandas as pd
+
+from app.data.ratings import METRICS, rate_goalkeepers, compare_ratings
+
+
+MART_SQL = Path(__file__).resolve().parents[1] / "dbt_project" / "models" / "marts" / "mart_goalkeeper_league_ratings.sql"
+
+
+def render_mart(fct_table: str) -> str:
+    """The ratings mart's SQL with dbt's config() dropped and ref() pointed at `fct_table`."""
+    sql = re.sub(r"\{\{\s*config\(.*?\)\s*\}\}", "", MART_SQL.read_text())
+    return re.sub(r"\{\{\s*ref\('fct_goalkeeper_performance'\)\s*\}\}", fct_table, sql)
+
+
+def fct_fixture() -> pd.DataFrame:
+    """
+    Two cohorts of keepers exercising the mart's edge cases: null metrics,
+    tied values (percent ranks and overall ranks), a metric with zero
+    spread (null z-scores) and a keeper below the matches threshold.
+    """
+    rng = np.random.default_rng(7)
+    rows = []
+    for season, competition in [("2024_2025", "Premier League"), ("2025_2026", "Premier League")]:
+        for i in range(8):
+            rows.append({
+                "goalkeeper": f"keeper_{i}",
+                "season": season,
+                "competition": competition,
+                "team": f"team_{i}",
+                "matches_played": 3 if i == 7 else 10 + i,
+                **{m: round(float(rng.normal(50, 10)), 1) for m in METRICS},
+            })
+    fct = pd.DataFrame(rows)
+
+    first = fct["season"] == "2024_2025"
+    fct.loc[first & fct["goalkeeper"].isin(["keeper_1", "keeper_2"]), "save_pct"] = np.nan
+    fct.loc[first & fct["goalkeeper"].isin(["keeper_3", "keeper_4"]), "psxg_minus_ga"] = 1.5
+    fct.loc[first, "pass_att_p90"] = 30.0
+    # Identical keepers tie on every metric and on overall rank
+    second = ~first
+    fct.loc[second & (fct["goalkeeper"] == "keeper_5"), METRICS] = (
+        fct.loc[second & (fct["goalkeeper"] == "keeper_6"), METRICS].to_numpy()
+    )
+    return fct
+
+
+def test_rating_engine_matches_mart():
+    fct = fct_fixture()
+
+    with duckdb.connect() as con:
+        con.register("fct", fct)
+        mart = con.execute(render_mart("fct")).df()
+
+    ratings = rate_goalkeepers(fct)
+
+    assert len(mart) == 14
+    assert mart["z_pass_att_p90"].isna().sum() == 7
+    assert compare_ratings(mart, ratings) == []
+
+
+def test_compare_ratings_reports_mismatches():
+    fct = fct_fixture()
+    ratings = rate_goalkeepers(fct)
+
+    changed = ratings.copy()
+    changed.loc[changed["overall_score"].notna().idxmax(), "overall_score"] += 0.1
+
+    assert len(compare_ratings(ratings, changed)) == 1
+    assert compare_ratings(ratings, ratings.iloc[1:]) != []
@@ -0,0 +1,69 @@
+import os
+
+from utils.s3_io import (
+    MULTIPART_CHUNK_BYTES, upload_files, copy_objects, delete_objects,
+    read_json_object, put_json_object, list_keys,
+)
+from tests.conftest import bucket_contents
+
+
+def write_files(tmp_path, contents: dict[str, bytes]) -> dict:
+    files = {}
+    for name, data in contents.items():
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+        files[name] = path
+    return files
+
+
+def test_upload_files(s3, tmp_path):
+    contents = {
+        "a.parquet": b"a" * 10,
+        "dir/b.arrow": b"b" * 10,
+        # Over the multipart threshold, so sent in parts
+        "big.parquet": os.urandom(MULTIPART_CHUNK_BYTES + 1024),
+    }
+    files = write_files(tmp_path, contents)
+
+    upload_files(s3, "bkt", {f"latest/{name}": path for name, path in files.items()}, workers=4)
+
+    assert bucket_contents(s3) == {f"latest/{name}": data for name, data in contents.items()}
+    assert "-" in s3.head_object(Bucket="bkt", Key="latest/big.parquet")["ETag"]
+
+
+def test_copy_objects(s3, tmp_path):
+    contents = {"a.parquet": b"first", "big.parquet": os.urandom(MULTIPART_CHUNK_BYTES + 1024)}
+    files = write_files(tmp_path, contents)
+    upload_files(s3, "bkt", {f"latest/{name}": path for name, path in files.items()})
+
+    copy_objects(s3, "bkt", {
+        "history/blobs/1": "latest/a.parquet",
+        "history/blobs/2": "latest/big.parquet",
+    })
+
+    stored = bucket_contents(s3)
+    assert stored["history/blobs/1"] == contents["a.parquet"]
+    assert stored["history/blobs/2"] == contents["big.parquet"]
+    # Sources are left in place
+    assert stored["latest/a.parquet"] == contents["a.parquet"]
+
+
+def test_delete_objects_in_batches(s3):
+    keys = [f"latest/{i:04d}" for i in range(1005)]
+    for key in keys:
+        s3.put_object(Bucket="bkt", Key=key, Body=b"x")
+    s3.put_object(Bucket="bkt", Key="latest/keep", Body=b"y")
+
+    delete_objects(s3, "bkt", keys)
+    delete_objects(s3, "bkt", [])
+
+    assert list_keys(s3, "bkt", "") == ["latest/keep"]
+
+
+def test_json_objects(s3):
+    assert read_json_object(s3, "bkt", "latest/manifest.json") is None
+
+    put_json_object(s3, "bkt", "latest/manifest.json", {"data_version": "abc"})
+
+    assert read_json_object(s3, "bkt", "latest/manifest.json") == {"data_version": "abc"}
@@ -0,0 +1,59 @@
+import pytest
+
+from scraping.state import ScrapeState
+
+
+@pytest.fixture
+def state(tmp_path):
+    state = ScrapeState(tmp_path / "state.sqlite")
+    state.upsert_players([
+        {"player_id": "p1", "player_slug": "keeper-one", "matchlogs_url": "https://x/{season}"},
+        {"player_id": "p2", "player_slug": "keeper-two", "matchlogs_url": "https://x/{season}"},
+    ])
+    yield state
+    state.close()
+
+
+def fail(state, job, times=1, max_failures=3):
+    for _ in range(times):
+        status = state.record_failure(*job, "boom", 0.1, max_failures)
+    return status
+
+
+def test_job_dead_letters_after_max_failures_in_a_run(state):
+    run_id, _ = state.start_or_resume_run()
+    state.enqueue_jobs(run_id, [("p1", "2025-2026")])
+
+    assert fail(state, ("p1", "2025-2026"), times=2) == "failed"
+    assert state.open_jobs(run_id) == [("p1", "2025-2026")]
+    assert fail(state, ("p1", "2025-2026")) == "dead"
+    assert state.open_jobs(run_id) == []
+    assert [d["player_id"] for d in state.dead_letter()] == ["p1"]
+
+
+def test_enqueue_resets_failures_from_earlier_runs(state):
+    run_id, _ = state.start_or_resume_run()
+    state.enqueue_jobs(run_id, [("p1", "2025-2026")])
+    fail(state, ("p1", "2025-2026"), times=2)
+    state.finish_run(run_id)
+
+    next_run, resumed = state.start_or_resume_run()
+    state.enqueue_jobs(next_run, [("p1", "2025-2026")])
+
+    assert not resumed
+    assert fail(state, ("p1", "2025-2026")) == "failed"
+
+
+def test_resume_adds_new_jobs_and_keeps_existing_ones(state):
+    run_id, _ = state.start_or_resume_run()
+    state.enqueue_jobs(run_id, [("p1", "2025-2026")])
+    fail(state, ("p1", "2025-2026"), times=2)
+    # Interrupted: the run is never finished
+
+    resumed_run, resumed = state.start_or_resume_run()
+    state.enqueue_jobs(resumed_run, [("p1", "2025-2026"), ("p2", "2025-2026")])
+
+    assert resumed and resumed_run == run_id
+    assert state.open_jobs(run_id) == [("p1", "2025-2026"), ("p2", "2025-2026")]
+    # The resumed job keeps its failures from earlier in the run
+    assert fail(state, ("p1", "2025-2026")) == "dead"
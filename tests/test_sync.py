@@ -0,0 +1,135 @@
+import hashlib
+import json
+
+import pytest
+
+from app.data import sync
+from app.data.sync import download_object, sync_latest, MANIFEST_NAME
+
+
+def put(s3, key, body, **extra):
+    s3.put_object(Bucket="bkt", Key=key, Body=body, **extra)
+    return next(o for o in s3.list_objects_v2(Bucket="bkt", Prefix=key)["Contents"] if o["Key"] == key)
+
+
+def leftovers(directory):
+    return [p.name for p in directory.rglob("*.part")]
+
+
+def test_download_replaces_file_atomically(s3, tmp_path):
+    obj = put(s3, "latest/a.parquet", b"new content")
+    local_path = tmp_path / "a.parquet"
+    local_path.write_bytes(b"old")
+
+    assert download_object(s3, "bkt", obj, local_path) == len(b"new content")
+    assert local_path.read_bytes() == b"new content"
+    assert leftovers(tmp_path) == []
+
+
+@pytest.mark.parametrize("bad", [
+    {"Size": 999},
+    {"ETag": '"0123456789abcdef0123456789abcdef"'},
+    {"sha256": "0" * 64},
+])
+def test_mismatch_keeps_previous_file(s3, tmp_path, bad):
+    obj = put(s3, "latest/a.parquet", b"new content")
+    local_path = tmp_path / "a.parquet"
+    local_path.write_bytes(b"old")
+
+    sha256 = bad.pop("sha256", None)
+    with pytest.raises(RuntimeError, match="mismatch|expected"):
+        download_object(s3, "bkt", {**obj, **bad}, local_path, sha256)
+
+    assert local_path.read_bytes() == b"old"
+    assert leftovers(tmp_path) == []
+
+
+def test_sse_kms_etag_is_not_checked_as_md5(s3, tmp_path):
+    obj = put(s3, "latest/a.parquet", b"content", ServerSideEncryption="aws:kms")
+    # S3 gives SSE-KMS objects an ETag that isn't the content MD5
+    obj = {**obj, "ETag": '"0123456789abcdef0123456789abcdef"'}
+
+    download_object(s3, "bkt", obj, tmp_path / "a.parquet")
+    assert (tmp_path / "a.parquet").read_bytes() == b"content"
+
+    # The manifest hash still catches corruption
+    with pytest.raises(RuntimeError, match="SHA-256"):
+        download_object(s3, "bkt", obj, tmp_path / "b.parquet", "0" * 64)
+    download_object(s3, "bkt", obj, tmp_path / "b.parquet", hashlib.sha256(b"content").hexdigest())
+
+
+def test_sse_c_etag_is_not_checked_as_md5(s3, tmp_path, monkeypatch):
+    obj = {**put(s3, "latest/a.parquet", b"content"), "ETag": '"0123456789abcdef0123456789abcdef"'}
+    head_object = s3.head_object
+    monkeypatch.setattr(s3, "head_object", lambda **kw: {**head_object(**kw), "SSECustomerAlgorithm": "AES256"})
+
+    download_object(s3, "bkt", obj, tmp_path / "a.parquet")
+    assert (tmp_path / "a.parquet").read_bytes() == b"content"
+
+
+def publish(s3, contents: dict[str, bytes], sha256_overrides: dict | None = None):
+    """Upload `contents` plus a manifest of their hashes under latest/."""
+    artefacts = {
+        rel: {"sha256": hashlib.sha256(data).hexdigest(), "bytes": len(data)}
+        for rel, data in contents.items()
+    }
+    for rel, sha256 in (sha256_overrides or {}).items():
+        artefacts[rel]["sha256"] = sha256
+    for rel, data in contents.items():
+        put(s3, f"latest/{rel}", data)
+    put(s3, f"latest/{MANIFEST_NAME}", json.dumps({"artefacts": artefacts}).encode())
+    return artefacts
+
+
+def local_files(local_dir):
+    return {
+        p.relative_to(local_dir).as_posix(): p.read_bytes()
+        for p in local_dir.rglob("*") if p.is_file() and not p.name.startswith(".")
+    }
+
+
+def test_sync_downloads_changes_and_swaps_manifest_last(s3, tmp_path):
+    local_dir = tmp_path / "raw"
+    state_path = local_dir / ".sync.json"
+
+    first = publish(s3, {"a.parquet": b"a1", "t/b.arrow": b"b1", "gone.parquet": b"g"})
+    sync_latest("bkt", "latest", local_dir, state_path, workers=2)
+    assert json.loads((local_dir / MANIFEST_NAME).read_text())["artefacts"] == first
+
+    s3.delete_object(Bucket="bkt", Key="latest/gone.parquet")
+    second = publish(s3, {"a.parquet": b"a2", "t/b.arrow": b"b1"})
+    sync_latest("bkt", "latest", local_dir, state_path, workers=2)
+
+    state = json.loads(state_path.read_text())
+    assert [d["key"] for d in state["downloaded"]] == ["latest/a.parquet"]
+    assert state["removed"] == ["gone.parquet"]
+    assert local_files(local_dir) == {
+        "a.parquet": b"a2",
+        "t/b.arrow": b"b1",
+        MANIFEST_NAME: (local_dir / MANIFEST_NAME).read_bytes(),
+    }
+    assert json.loads((local_dir / MANIFEST_NAME).read_text())["artefacts"] == second
+
+
+def test_failed_download_keeps_previous_manifest(s3, tmp_path):
+    local_dir = tmp_path / "raw"
+    state_path = local_dir / ".sync.json"
+    publish(s3, {"a.parquet": b"a1", "b.parquet": b"b1"})
+    sync_latest("bkt", "latest", local_dir, state_path, workers=2)
+    old_manifest = (local_dir / MANIFEST_NAME).read_bytes()
+
+    # b.parquet's bytes don't match the new manifest: the sync must fail
+    # without publishing that manifest or a corrupt b.parquet
+    publish(s3, {"a.parquet": b"a2", "b.parquet": b"b2"}, sha256_overrides={"b.parquet": "0" * 64})
+    with pytest.raises(RuntimeError, match="b.parquet"):
+        sync_latest("bkt", "latest", local_dir, state_path, workers=2)
+
+    assert (local_dir / MANIFEST_NAME).read_bytes() == old_manifest
+    assert (local_dir / "b.parquet").read_bytes() == b"b1"
+    assert leftovers(local_dir) == []
+
+    # Once the remote is fixed, the next sync completes
+    new = publish(s3, {"a.parquet": b"a2", "b.parquet": b"b2"})
+    sync_latest("bkt", "latest", local_dir, state_path, workers=2)
+    assert json.loads((local_dir / MANIFEST_NAME).read_text())["artefacts"] == new
+    assert local_files(local_dir)["b.parquet"] == b"b2"
@@ -33,3 +33,31 @@ def write_table_metadata(dbt_dir: Path, public_dir: Path) -> None:
     out_path = out_dir / "table_metadata.json"
     out_path.write_text(json.dumps(out, indent=2))
     return
+
+
+def summarise_run_results(dbt_dir: Path) -> dict:
+    """
+    Return {unique_id: {name, resource_type, status, execution_time_s,
+    rows_affected}} from the last run's `run_results.json`, slowest first.
+    Keyed by unique_id, as a model, test or seed can share a name.
+    """
+    run_results_path = dbt_dir / "target" / "run_results.json"
+    run_results = json.loads(run_results_path.read_text())
+
+    nodes = []
+    for result in run_results.get("results") or []:
+        # e.g. "model.<project>.<name>" or "test.<project>.<name>.<hash>"
+        unique_id = result.get("unique_id") or ""
+        resource_type, _, name = unique_id.split(".")[:3]
+        adapter_response = result.get("adapter_response") or {}
+
+        nodes.append((unique_id, {
+            "name": name,
+            "resource_type": resource_type,
+            "status": result.get("status"),
+            "execution_time_s": round(result.get("execution_time") or 0, 3),
+            "rows_affected": adapter_response.get("rows_affected"),
+        }))
+
+    nodes.sort(key=lambda item: item[1]["execution_time_s"], reverse=True)
+    return dict(nodes)
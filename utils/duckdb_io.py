@@ -1,12 +1,107 @@
+from urllib.parse import quote
+
 import duckdb
+import pyarrow as pa
 
 
 def connect(db_path):
     return duckdb.connect(str(db_path))
 
 
-def export_table_to_parquet(con, table: str, out_path):
-    con.execute(f"COPY (SELECT * FROM {table}) TO '{out_path}' (FORMAT PARQUET)")
+def table_query(table: str, order_by: list[str] | None = None) -> str:
+    query = f"SELECT * FROM {table}"
+    if order_by:
+        query += f" ORDER BY {', '.join(order_by)}"
+    return query
+
+
+def export_table_to_parquet(con, table: str, out_path,
+                            partition_by: list[str] | None = None,
+                            order_by: list[str] | None = None,
+                            row_group_size: int | None = None,
+                            compression: str | None = None,
+                            compression_level: int | None = None) -> int:
+    """
+    Write `table` to a Parquet file, or with `partition_by` to a
+    hive-partitioned directory (out_path/col=value/.../data_0.parquet)
+    replacing whatever was there. Returns the number of rows written.
+
+    `order_by` sorts rows before writing, and a small `row_group_size`
+    then lets readers filtering on the sort key skip most row groups by
+    their min/max statistics.
+    """
+    options = ["FORMAT PARQUET"]
+    if compression:
+        options.append(f"COMPRESSION {compression}")
+    if compression_level is not None:
+        options.append(f"COMPRESSION_LEVEL {int(compression_level)}")
+    if row_group_size:
+        options.append(f"ROW_GROUP_SIZE {int(row_group_size)}")
+    if partition_by:
+        options += [f"PARTITION_BY ({', '.join(partition_by)})", "OVERWRITE"]
+
+    query = table_query(table, order_by)
+    return con.execute(f"COPY ({query}) TO '{out_path}' ({', '.join(options)})").fetchone()[0]
+
+
+# Directory name DuckDB (and pyarrow) give a NULL hive partition value
+HIVE_NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+
+
+def hive_partition_dir(partition_by: list[str], values: tuple) -> str:
+    """Relative directory of one hive partition, e.g. season=2025_2026/competition=Premier%20League."""
+    return "/".join(
+        f"{col}={HIVE_NULL_PARTITION if value is None else quote(str(value), safe='')}"
+        for col, value in zip(partition_by, values)
+    )
+
+
+def write_arrow_file(reader, out_path) -> int:
+    """Stream record batches to an Arrow IPC file, swapped in atomically. Returns rows."""
+    tmp_path = out_path.with_name(f".{out_path.name}.tmp")
+
+    rows = 0
+    with pa.ipc.new_file(tmp_path, reader.schema) as writer:
+        for batch in reader:
+            writer.write_batch(batch)
+            rows += batch.num_rows
+
+    tmp_path.replace(out_path)
+    return rows
+
+
+def export_table_to_arrow(con, table: str, out_path,
+                          order_by: list[str] | None = None,
+                          partition_by: list[str] | None = None) -> int:
+    """
+    Write `table` to an uncompressed Arrow IPC (Feather v2) file, which
+    readers can memory-map without decoding. Batches are streamed from
+    DuckDB. Returns rows written.
+
+    With `partition_by`, `out_path` is a directory holding one file per
+    partition, laid out like the hive-partitioned Parquet export
+    (out_path/col=value/.../data_0.arrow), without the partition columns.
+    """
+    if not partition_by:
+        return write_arrow_file(con.execute(table_query(table, order_by)).fetch_record_batch(), out_path)
+
+    partitions = con.execute(
+        f"SELECT DISTINCT {', '.join(partition_by)} FROM {table} ORDER BY ALL"
+    ).fetchall()
+    where = " AND ".join(f"{col} IS NOT DISTINCT FROM ?" for col in partition_by)
+    order = f" ORDER BY {', '.join(order_by)}" if order_by else ""
+
+    rows = 0
+    for values in partitions:
+        part_dir = out_path / hive_partition_dir(partition_by, values)
+        part_dir.mkdir(parents=True, exist_ok=True)
+        reader = con.execute(
+            f"SELECT * EXCLUDE ({', '.join(partition_by)}) FROM {table} WHERE {where}{order}",
+            list(values),
+        ).fetch_record_batch()
+        rows += write_arrow_file(reader, part_dir / "data_0.arrow")
+
+    return rows
 
 
 def load_df_as_table(con, df_name: str, table_name: str):
@@ -15,3 +110,14 @@ def load_df_as_table(con, df_name: str, table_name: str):
 
 def get_rows_from_table(con, table: str):
     return con.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def duckdb_type(dtype: pa.DataType) -> str:
+    """Return the DuckDB type name for a matchlogs Arrow type."""
+    if pa.types.is_date(dtype):
+        return "DATE"
+    if pa.types.is_integer(dtype):
+        return "INTEGER"
+    if pa.types.is_floating(dtype):
+        return "DOUBLE"
+    return "VARCHAR"
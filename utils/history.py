@@ -0,0 +1,134 @@
+from datetime import datetime, timedelta, timezone
+
+from utils.logging import ts
+from utils.manifest import MANIFEST_NAME, diff_manifests
+from utils.s3_io import read_json_object, list_keys, copy_objects, delete_objects, put_json_object
+
+
+# Content-addressed history: each distinct artefact is stored once as
+# history/blobs/<sha256>, and each run as history/runs/<run_id>.json, a
+# copy of the manifest it published pointing at those blobs.
+HISTORY_PREFIX = "history/"
+BLOBS_PREFIX = f"{HISTORY_PREFIX}blobs/"
+RUNS_PREFIX = f"{HISTORY_PREFIX}runs/"
+
+
+def blob_key(sha256: str) -> str:
+    return f"{BLOBS_PREFIX}{sha256}"
+
+
+def run_key(run_id: str) -> str:
+    return f"{RUNS_PREFIX}{run_id}.json"
+
+
+def list_runs(s3, bucket: str) -> list[str]:
+    """Run ids in history, oldest first."""
+    return sorted(
+        key[len(RUNS_PREFIX):-len(".json")]
+        for key in list_keys(s3, bucket, RUNS_PREFIX)
+        if key.endswith(".json")
+    )
+
+
+def read_run(s3, bucket: str, run_id: str) -> dict:
+    manifest = read_json_object(s3, bucket, run_key(run_id))
+    if manifest is None:
+        raise ValueError(f"No history run {run_id!r}")
+    return manifest
+
+
+def snapshot_run(s3, bucket: str, manifest: dict, latest_prefix: str, workers: int = 8) -> dict:
+    """
+    Record `manifest` (just published to `latest_prefix`) as a history run.
+    Only blobs not already in history are copied, server-side from latest/.
+    Returns {"run_id", "blobs_copied", "blobs_reused"}.
+    """
+    existing = {key[len(BLOBS_PREFIX):] for key in list_keys(s3, bucket, BLOBS_PREFIX)}
+
+    copies = {}
+    for rel, artefact in manifest["artefacts"].items():
+        if artefact["sha256"] not in existing:
+            copies[blob_key(artefact["sha256"])] = f"{latest_prefix}{rel}"
+    copy_objects(s3, bucket, copies, workers)
+
+    run_id = ts()
+    put_json_object(s3, bucket, run_key(run_id), {**manifest, "run_id": run_id})
+    print(f"[{ts()}] History run {run_id}: {len(copies)} new blobs")
+
+    return {
+        "run_id": run_id,
+        "blobs_copied": len(copies),
+        "blobs_reused": len(manifest["artefacts"]) - len(copies),
+    }
+
+
+def rollback(s3, bucket: str, run_id: str, latest_prefix: str, workers: int = 8) -> dict:
+    """
+    Repoint `latest_prefix` to history run `run_id`: copy in only the
+    artefacts whose content differs, then the run's manifest, then delete
+    artefacts the run did not have. Returns {"copied", "removed"}.
+    """
+    target = read_run(s3, bucket, run_id)
+    current = read_json_object(s3, bucket, f"{latest_prefix}{MANIFEST_NAME}") or {"artefacts": {}}
+    changed, removed = diff_manifests(current, target)
+
+    copy_objects(
+        s3, bucket,
+        {f"{latest_prefix}{rel}": blob_key(target["artefacts"][rel]["sha256"]) for rel in changed},
+        workers,
+    )
+    manifest = {k: v for k, v in target.items() if k != "run_id"}
+    put_json_object(s3, bucket, f"{latest_prefix}{MANIFEST_NAME}", manifest)
+    delete_objects(s3, bucket, [f"{latest_prefix}{rel}" for rel in removed])
+
+    print(f"[{ts()}] Rolled back {latest_prefix} to {run_id}: {len(changed)} copied, {len(removed)} removed")
+    return {"copied": len(changed), "removed": len(removed)}
+
+
+def runs_to_keep(run_ids: list[str], keep_last: int, keep_days: int, now: datetime | None = None) -> set[str]:
+    """Retention policy: the newest `keep_last` runs plus all runs of the last `keep_days` days."""
+    now = now or datetime.now(timezone.utc)
+    cutoff = now - timedelta(days=keep_days)
+
+    keep = set(sorted(run_ids)[-keep_last:]) if keep_last > 0 else set()
+    keep |= {r for r in run_ids if datetime.fromisoformat(r) >= cutoff}
+    return keep
+
+
+def garbage_collect(s3, bucket: str, latest_prefix: str, keep_last: int, keep_days: int,
+                    dry_run: bool = False) -> dict:
+    """
+    Delete history runs outside the retention policy, then every blob no
+    retained run (or the current latest/ manifest) points to.
+    Returns {"runs_deleted", "blobs_deleted", "bytes_freed"}.
+    """
+    run_ids = list_runs(s3, bucket)
+    keep = runs_to_keep(run_ids, keep_last, keep_days)
+    expired = [r for r in run_ids if r not in keep]
+
+    live = set()
+    latest = read_json_object(s3, bucket, f"{latest_prefix}{MANIFEST_NAME}")
+    for manifest in [latest] + [read_run(s3, bucket, r) for r in sorted(keep)]:
+        if manifest:
+            live |= {a["sha256"] for a in manifest["artefacts"].values()}
+
+    blob_bytes = {}
+    for page in s3.get_paginator("list_objects_v2").paginate(Bucket=bucket, Prefix=BLOBS_PREFIX):
+        for obj in page.get("Contents", []) or []:
+            blob_bytes[obj["Key"]] = obj["Size"]
+    dead = [key for key in blob_bytes if key[len(BLOBS_PREFIX):] not in live]
+
+    print(
+        f"[{ts()}] GC {'(dry run) ' if dry_run else ''}keeping {len(keep)} runs: "
+        f"{len(expired)} runs and {len(dead)} blobs to delete"
+    )
+    if not dry_run:
+        # Runs first, so no kept manifest ever points at a deleted blob
+        delete_objects(s3, bucket, [run_key(r) for r in expired])
+        delete_objects(s3, bucket, dead)
+
+    return {
+        "runs_deleted": len(expired),
+        "blobs_deleted": len(dead),
+        "bytes_freed": sum(blob_bytes[k] for k in dead),
+    }
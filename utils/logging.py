@@ -7,10 +7,6 @@ def ts():
     return datetime.now(timezone.utc).isoformat(timespec="seconds")
 
 
-def write_manifest(path: Path, manifest: list[dict]) -> None:
-    path.write_text(json.dumps(manifest, indent=2))
-
-
 def sort_by_pipeline_order(data: dict) -> dict:
     ordered = {}
 
@@ -18,6 +14,8 @@ def sort_by_pipeline_order(data: dict) -> dict:
         "cli.py",
         "load_duckdb.py",
         "run_dbt_build.py",
+        "check_rating_parity.py",
+        "bootstrap_intervals.py",
         "stage_public_tables.py",
         "upload_public_to_s3.py"
     ]
@@ -53,9 +51,11 @@ def make_status_patch(step_name,
                       started_utc, 
                       finished_utc, 
                       duration_s, 
-                      tables=None):
+                      tables=None,
+                      **extra):
     """
     Small helper so status.json structure stays consistent across scripts.
+    Step-specific details (e.g. job counts) are passed as extra keywords.
     """
     return {
         step_name: {
@@ -64,5 +64,6 @@ def make_status_patch(step_name,
             "finished_utc": finished_utc,
             "duration_s": duration_s,
             "tables": tables,
+            **extra,
         }
     }
\ No newline at end of file
@@ -0,0 +1,166 @@
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from utils.logging import ts
+
+
+MANIFEST_NAME = "manifest.json"
+
+# Rewritten by every pipeline step, so never part of the manifest
+VOLATILE_FILES = {MANIFEST_NAME, "status.json"}
+
+
+def sha256_file(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def schema_fingerprint(schema: pa.Schema) -> str:
+    """Short hash of column names and types, ignoring writer metadata."""
+    return hashlib.sha256(str(schema.remove_metadata()).encode()).hexdigest()[:16]
+
+
+def describe_artefact(path: Path) -> dict:
+    """
+    Return {sha256, bytes, rows, schema} for one public file. Rows and
+    schema come from Parquet footers and Arrow IPC headers (no data is
+    read) and are None for other files.
+    """
+    entry = {"sha256": sha256_file(path), "bytes": path.stat().st_size, "rows": None, "schema": None}
+
+    if path.suffix == ".parquet":
+        metadata = pq.read_metadata(path)
+        entry["rows"] = metadata.num_rows
+        entry["schema"] = schema_fingerprint(metadata.schema.to_arrow_schema())
+    elif path.suffix == ".arrow":
+        with pa.memory_map(str(path)) as source:
+            table = pa.ipc.open_file(source).read_all()
+            entry["rows"] = table.num_rows
+            entry["schema"] = schema_fingerprint(table.schema)
+
+    return entry
+
+
+def read_manifest(public_dir: Path) -> dict:
+    """Return the manifest in `public_dir`, or an empty one."""
+    path = public_dir / MANIFEST_NAME
+    if not path.exists():
+        return {"data_version": None, "artefacts": {}}
+    return json.loads(path.read_text())
+
+
+def write_manifest(public_dir: Path, manifest: dict) -> None:
+    path = public_dir / MANIFEST_NAME
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    tmp_path.write_text(json.dumps(manifest, indent=2))
+    os.replace(tmp_path, path)
+
+
+def build_manifest(artefacts: dict, previous: dict) -> dict:
+    """
+    Build a manifest from {relative path: describe_artefact(...)}.
+
+    The manifest's `data_version` hashes every artefact's path and
+    content, so it only changes when some content does. Each artefact
+    records the data version in which its own content last changed.
+    """
+    data_version = hashlib.sha256(
+        "\n".join(f"{rel}:{a['sha256']}" for rel, a in sorted(artefacts.items())).encode()
+    ).hexdigest()[:16]
+
+    entries = {}
+    for rel, artefact in sorted(artefacts.items()):
+        old = previous["artefacts"].get(rel)
+        unchanged = old is not None and old["sha256"] == artefact["sha256"]
+        entries[rel] = {
+            **artefact,
+            "data_version": old["data_version"] if unchanged else data_version,
+        }
+
+    return {
+        "generated_utc": ts(),
+        "data_version": data_version,
+        "artefacts": entries,
+    }
+
+
+def diff_manifests(old: dict, new: dict) -> tuple[list[str], list[str]]:
+    """Return (changed or new paths, removed paths) from `old` to `new`."""
+    old_artefacts, new_artefacts = old["artefacts"], new["artefacts"]
+    changed = [
+        rel for rel, a in new_artefacts.items()
+        if rel not in old_artefacts or old_artefacts[rel]["sha256"] != a["sha256"]
+    ]
+    removed = [rel for rel in old_artefacts if rel not in new_artefacts]
+    return changed, removed
+
+
+def publish_staged(staging_dir: Path, public_dir: Path, previous: dict,
+                   owned: list[str]) -> tuple[dict, dict]:
+    """
+    Move freshly exported files from `staging_dir` into `public_dir`,
+    leaving files whose content is unchanged untouched (same bytes, same
+    mtime). Files under the `owned` top-level names that were not
+    re-exported are deleted.
+
+    Returns ({relative path: describe_artefact(...)} for the staged
+    files, {"written": n, "unchanged": n, "deleted": n}).
+    """
+    artefacts = {}
+    counts = {"written": 0, "unchanged": 0, "deleted": 0}
+
+    for path in sorted(p for p in staging_dir.rglob("*") if p.is_file()):
+        rel = path.relative_to(staging_dir).as_posix()
+        artefact = artefacts[rel] = describe_artefact(path)
+        target = public_dir / rel
+
+        old = previous["artefacts"].get(rel)
+        if old is not None and old["sha256"] == artefact["sha256"] and target.exists():
+            counts["unchanged"] += 1
+            continue
+
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(path, target)
+        counts["written"] += 1
+
+    for name in owned:
+        root = public_dir / name
+        stale = [root] if root.is_file() else [p for p in root.rglob("*") if p.is_file()]
+        for path in stale:
+            if path.relative_to(public_dir).as_posix() not in artefacts:
+                path.unlink()
+                counts["deleted"] += 1
+
+        # Drop partition directories left empty
+        if root.is_dir():
+            for d in sorted((p for p in root.rglob("*") if p.is_dir()), reverse=True):
+                if not any(d.iterdir()):
+                    d.rmdir()
+
+    shutil.rmtree(staging_dir)
+    return artefacts, counts
+
+
+def describe_public_dir(public_dir: Path, known: dict) -> dict:
+    """
+    Describe every artefact in `public_dir`: `known` descriptions plus the
+    remaining files (e.g. table_metadata.json). Hidden and volatile files
+    are skipped.
+    """
+    artefacts = dict(known)
+    for path in public_dir.rglob("*"):
+        rel = path.relative_to(public_dir).as_posix()
+        if (not path.is_file() or rel in artefacts or rel in VOLATILE_FILES
+                or any(part.startswith(".") for part in path.relative_to(public_dir).parts)):
+            continue
+        artefacts[rel] = describe_artefact(path)
+    return artefacts
@@ -0,0 +1,134 @@
+from datetime import date
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+
+# Declared FBRef matchlogs columns, in page order: (name, type, nullable)
+MATCHLOGS_COLUMNS = [
+    ("date", pa.date32(), False),
+    ("dayofweek", pa.string(), True),
+    ("comp", pa.string(), True),
+    ("round", pa.string(), True),
+    ("venue", pa.string(), True),
+    ("result", pa.string(), True),
+    ("team", pa.string(), True),
+    ("opponent", pa.string(), True),
+    ("game_started", pa.string(), True),
+    ("position", pa.string(), True),
+    ("minutes", pa.int32(), True),
+    ("gk_shots_on_target_against", pa.int32(), True),
+    ("gk_goals_against", pa.int32(), True),
+    ("gk_saves", pa.int32(), True),
+    ("gk_save_pct", pa.float64(), True),
+    ("gk_clean_sheets", pa.int32(), True),
+    ("gk_psxg", pa.float64(), True),
+    ("gk_pens_att", pa.int32(), True),
+    ("gk_pens_allowed", pa.int32(), True),
+    ("gk_pens_saved", pa.int32(), True),
+    ("gk_pens_missed", pa.int32(), True),
+    ("gk_passes_completed_launched", pa.int32(), True),
+    ("gk_passes_launched", pa.int32(), True),
+    ("gk_passes_pct_launched", pa.float64(), True),
+    ("gk_passes", pa.int32(), True),
+    ("gk_passes_throws", pa.int32(), True),
+    ("gk_pct_passes_launched", pa.float64(), True),
+    ("gk_passes_length_avg", pa.float64(), True),
+    ("gk_goal_kicks", pa.int32(), True),
+    ("gk_pct_goal_kicks_launched", pa.float64(), True),
+    ("gk_goal_kick_length_avg", pa.float64(), True),
+    ("gk_crosses", pa.int32(), True),
+    ("gk_crosses_stopped", pa.int32(), True),
+    ("gk_crosses_stopped_pct", pa.float64(), True),
+    ("gk_def_actions_outside_pen_area", pa.int32(), True),
+    ("gk_avg_distance_def_actions", pa.float64(), True),
+    ("match_report", pa.string(), True),
+]
+
+MATCHLOGS_SCHEMA = pa.schema(
+    [pa.field(name, dtype, nullable=nullable) for name, dtype, nullable in MATCHLOGS_COLUMNS]
+)
+
+
+def parse_value(text: str | None, dtype: pa.DataType):
+    """Convert one cell's text to a Python value of the declared type."""
+    if text is None:
+        return None
+
+    text = text.strip()
+    if text == "":
+        return None
+
+    if pa.types.is_integer(dtype):
+        return int(text.replace(",", ""))
+    if pa.types.is_floating(dtype):
+        return float(text.replace(",", ""))
+    if pa.types.is_date(dtype):
+        return date.fromisoformat(text)
+    return text
+
+
+def matchlogs_table_from_records(records: list[dict], columns: list[str]) -> pa.Table:
+    """
+    Build a typed, schema-checked matchlogs table from scraped cells.
+
+    `records` are dicts of {data-stat: cell text} and `columns` the stat
+    names found in the page header. Declared columns missing from the page
+    are filled with nulls if nullable; a missing non-nullable column, an
+    unparseable value or a null in a non-nullable column raises ValueError.
+    """
+    missing = [
+        name for name, _, nullable in MATCHLOGS_COLUMNS
+        if name not in columns and not nullable
+    ]
+    if missing:
+        raise ValueError(f"Matchlogs table missing required columns: {missing}")
+
+    arrays = []
+    for name, dtype, nullable in MATCHLOGS_COLUMNS:
+        try:
+            values = [parse_value(r.get(name), dtype) for r in records]
+        except ValueError as e:
+            raise ValueError(f"Bad value in matchlogs column {name!r}: {e}") from e
+
+        if not nullable and any(v is None for v in values):
+            raise ValueError(f"Null value in non-nullable matchlogs column {name!r}")
+
+        arrays.append(pa.array(values, type=dtype))
+
+    return pa.Table.from_arrays(arrays, schema=MATCHLOGS_SCHEMA)
+
+
+def conform_matchlogs_table(table: pa.Table) -> pa.Table:
+    """
+    Check a decoded matchlogs file against the declared schema and return
+    it cast to `MATCHLOGS_SCHEMA`.
+
+    Missing nullable columns are filled with nulls. Unknown columns, missing
+    required columns, values that don't cast losslessly and nulls in
+    non-nullable columns raise ValueError.
+    """
+    declared = {name for name, _, _ in MATCHLOGS_COLUMNS}
+    unknown = [name for name in table.column_names if name not in declared]
+    if unknown:
+        raise ValueError(f"Unknown matchlogs columns: {unknown}")
+
+    arrays = []
+    for name, dtype, nullable in MATCHLOGS_COLUMNS:
+        if name not in table.column_names:
+            if not nullable:
+                raise ValueError(f"Matchlogs file missing required column {name!r}")
+            arrays.append(pa.nulls(table.num_rows, type=dtype))
+            continue
+
+        try:
+            column = pc.cast(table[name], dtype, safe=True)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError) as e:
+            raise ValueError(f"Bad value in matchlogs column {name!r}: {e}") from e
+
+        if not nullable and column.null_count:
+            raise ValueError(f"Null value in non-nullable matchlogs column {name!r}")
+
+        arrays.append(column)
+
+    return pa.Table.from_arrays(arrays, schema=MATCHLOGS_SCHEMA)
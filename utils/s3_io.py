@@ -0,0 +1,98 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+from utils.logging import ts
+
+
+# Objects over 8 MB go up in 8 MB parts on several threads
+MULTIPART_CHUNK_BYTES = 8 * 1024 * 1024
+
+
+def make_s3_client(endpoint_url: str | None = None, max_pool_connections: int = 10):
+    """S3 client, optionally against an S3-compatible endpoint (e.g. MinIO)."""
+    return boto3.client(
+        "s3",
+        endpoint_url=endpoint_url or None,
+        config=Config(max_pool_connections=max_pool_connections),
+    )
+
+
+def transfer_config(workers: int) -> TransferConfig:
+    return TransferConfig(
+        multipart_threshold=MULTIPART_CHUNK_BYTES,
+        multipart_chunksize=MULTIPART_CHUNK_BYTES,
+        max_concurrency=workers,
+        use_threads=True,
+    )
+
+
+def read_json_object(s3, bucket: str, key: str) -> dict | None:
+    """Return a JSON object's content, or None if the key does not exist."""
+    try:
+        body = s3.get_object(Bucket=bucket, Key=key)["Body"].read()
+    except ClientError as e:
+        if e.response["Error"]["Code"] in ("NoSuchKey", "404"):
+            return None
+        raise
+    return json.loads(body)
+
+
+def put_json_object(s3, bucket: str, key: str, data: dict) -> None:
+    s3.put_object(
+        Bucket=bucket, Key=key,
+        Body=json.dumps(data, indent=2).encode(),
+        ContentType="application/json",
+    )
+
+
+def list_keys(s3, bucket: str, prefix: str) -> list[str]:
+    keys = []
+    for page in s3.get_paginator("list_objects_v2").paginate(Bucket=bucket, Prefix=prefix):
+        keys += [obj["Key"] for obj in page.get("Contents", []) or []]
+    return keys
+
+
+def upload_files(s3, bucket: str, files: dict[str, Path], workers: int = 8) -> None:
+    """
+    Upload {key: local path} with `workers` files in flight, each using
+    threaded multipart transfers when large.
+    """
+    config = transfer_config(workers)
+
+    def upload(item):
+        key, path = item
+        s3.upload_file(str(path), bucket, key, Config=config)
+        print(f"[{ts()}] Uploaded s3://{bucket}/{key}")
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(upload, files.items()))
+
+
+def copy_objects(s3, bucket: str, copies: dict[str, str], workers: int = 8) -> None:
+    """
+    Server-side copy {destination key: source key} within `bucket`; no
+    object bytes pass through this machine.
+    """
+    config = transfer_config(workers)
+
+    def copy(item):
+        dest_key, src_key = item
+        s3.copy({"Bucket": bucket, "Key": src_key}, bucket, dest_key, Config=config)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(copy, copies.items()))
+
+
+def delete_objects(s3, bucket: str, keys: list[str]) -> None:
+    """Delete keys in batches of 1000 (the DeleteObjects limit)."""
+    for i in range(0, len(keys), 1000):
+        batch = keys[i:i + 1000]
+        s3.delete_objects(Bucket=bucket, Delete={"Objects": [{"Key": k} for k in batch], "Quiet": True})
+        for key in batch:
+            print(f"[{ts()}] Deleted s3://{bucket}/{key}")
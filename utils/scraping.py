@@ -1,4 +1,9 @@
-from datetime import datetime, timezone, timedelta 
+import threading
+import time
+from datetime import date, datetime, timezone, timedelta 
+
+import pyarrow as pa
+import pyarrow.compute as pc
 
 
 def is_stale(scrape_item, now_dt = None, max_days = 6):
@@ -13,3 +18,93 @@ def is_stale(scrape_item, now_dt = None, max_days = 6):
 
     last_dt = datetime.fromisoformat(last_scraped)
     return (now_dt - last_dt) >= timedelta(days = max_days)
+
+
+def season_close_date(season: str) -> date:
+    """
+    Return the date after which no more matches are played in `season`.
+
+    Two-year seasons (e.g. "2024-2025") close at the end of June of the
+    second year; calendar-year seasons (e.g. "2025") at the end of December.
+    """
+    end_year = int(season.split("-")[-1])
+    if "-" in season:
+        return date(end_year, 7, 1)
+    return date(end_year + 1, 1, 1)
+
+
+def is_season_closed(season: str, now_dt = None) -> bool:
+    if now_dt is None:
+        now_dt = datetime.now(timezone.utc)
+    return now_dt.date() >= season_close_date(season)
+
+
+def is_season_stale(season_item, season, latest_fixture_date = None,
+                    now_dt = None, max_days = 6):
+    """
+    Return True if a (player, season) pair needs scraping.
+
+    - Never scraped: stale.
+    - Frozen (a closed season scraped after it closed): never stale.
+    - Closed but not yet frozen: stale, so it is scraped once more in full.
+    - Current season with a known latest league fixture: stale only if the
+      newest match we hold predates that fixture and we have not checked
+      since it was played.
+    - Otherwise fall back to the `max_days` age check.
+    """
+    if not season_item or not season_item.get("last_scraped_date"):
+        return True
+
+    if season_item.get("frozen"):
+        return False
+
+    if is_season_closed(season, now_dt):
+        return True
+
+    if latest_fixture_date:
+        latest_match = season_item.get("latest_match_date")
+        last_checked = season_item["last_scraped_date"][:10]
+        return (
+            (not latest_match or latest_match < latest_fixture_date)
+            and last_checked <= latest_fixture_date
+        )
+
+    return is_stale(season_item, now_dt, max_days)
+
+
+def latest_match_date(table: pa.Table) -> str | None:
+    """Return the newest match date (YYYY-MM-DD) in a matchlogs table."""
+    latest = pc.max(table["date"]).as_py()
+    return latest.isoformat() if latest else None
+
+
+class TokenBucket:
+    """
+    Thread-safe token-bucket rate limiter shared by all scraper workers.
+
+    Tokens refill continuously at `rate_per_minute`, up to `burst` tokens.
+    Each page request consumes one token; `acquire` blocks until one is free.
+    """
+
+    def __init__(self, rate_per_minute: float, burst: int = 1):
+        self.rate_per_s = rate_per_minute / 60
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                elapsed = now - self.updated
+                self.tokens = min(self.capacity, self.tokens + elapsed * self.rate_per_s)
+                self.updated = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                wait_s = (1 - self.tokens) / self.rate_per_s
+
+            time.sleep(wait_s)
@@ -1,10 +1,35 @@
-import subprocess
+import os
+from contextlib import contextmanager
 from pathlib import Path
 
 from utils.logging import ts
 
 
-def run_cmd(cmd: list[str], cwd: Path) -> None:
-    """Run a command from a given working directory."""
-    print(f"[{ts()}] Running: {' '.join(cmd)}  (cwd = {cwd})")
-    subprocess.run(cmd, cwd = str(cwd), check = True)
+@contextmanager
+def working_directory(path: Path):
+    """Temporarily change the working directory (contextlib.chdir before Python 3.11)."""
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def run_dbt(args: list[str], cwd: Path):
+    """
+    Run a dbt command in-process from `cwd` and return its result.
+
+    Uses dbt's programmatic runner, so the interpreter and adapter are
+    started once per pipeline step rather than once per command.
+    """
+    from dbt.cli.main import dbtRunner
+
+    print(f"[{ts()}] Running: dbt {' '.join(args)}  (cwd = {cwd}, in-process)")
+    with working_directory(cwd):
+        result = dbtRunner().invoke(args)
+
+    if not result.success:
+        raise RuntimeError(f"dbt {' '.join(args)} failed: {result.exception or 'see dbt output'}")
+
+    return result